@@ -1,18 +1,18 @@
 """Alternative lightweight server using standard library only."""
 from __future__ import annotations
 
-import json
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from urllib.parse import parse_qs, urlparse
 
 from app.services.planner import Planner
+from app.utils.serialization import dumps
 
 planner = Planner()
 
 
 class PlannerHandler(BaseHTTPRequestHandler):
     def _send_json(self, payload: dict, status: int = 200) -> None:
-        body = json.dumps(payload).encode("utf-8")
+        body = dumps(payload)
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
@@ -38,11 +38,8 @@ class PlannerHandler(BaseHTTPRequestHandler):
         result = planner.plan(date=date, budget_pp=budget, with_dining=with_dining)
         response = {
             "itineraries": [
-                {
-                    **{k: v for k, v in itinerary.items() if k != "price"},
-                    "price": itinerary["price"].__dict__,
-                    "total_pp": itinerary["price"].total,
-                }
+                # The encoder renders the PriceBreakdown itself.
+                {**itinerary, "total_pp": itinerary["price"].total}
                 for itinerary in result.itineraries
             ],
             "dining": result.dining,
@@ -50,7 +47,7 @@ class PlannerHandler(BaseHTTPRequestHandler):
         }
         if parsed.path == "/plan/debug":
             for itinerary in response["itineraries"]:
-                itinerary["breakdown"] = itinerary["price"]["components"]
+                itinerary["breakdown"] = itinerary["price"].components
             response["meta"] = {"cache": {"fx": "disk"}}
         self._send_json(response)
 
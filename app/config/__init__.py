@@ -19,6 +19,12 @@ class ConnectorSettings:
     page_size: int | None = None
     timeout_seconds: int = 5
     retries: int = 2
+    cache_ttl_seconds: int | None = None
+    prefetch_pages: int = 0
+    hedge_percentile: float | None = None
+    hedge_budget: float = 0.05
+    stream_pages: bool = False
+    max_response_bytes: int | None = None
 
 
 @dataclass
@@ -30,6 +36,12 @@ class AppSettings:
     price_drop_high_inventory_penalty: float = -0.1
     cache_dir: str = "~/.weekend-planner/cache"
     offline_mode: bool = False
+    plan_cache_max_events: int = 20000
+    event_catalogue: bool = True
+    catalogue_retention_days: int = 7
+    shared_health: bool = True
+    http_cache: str = "memory"
+    http_cache_max_mb: int = 32
 
 
 @dataclass
@@ -37,6 +49,22 @@ class FXSettings:
     base_url: str
     base_currency: str
     fallback_rates: Dict[str, float] = field(default_factory=dict)
+    hedge_percentile: float | None = None
+    hedge_budget: float = 0.05
+
+
+@dataclass
+class TransportSettings:
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    max_connections_per_host: int = 10
+    keepalive_expiry_seconds: float = 30.0
+    timeout_seconds: float = 10.0
+    http2: bool = False
+    limiter_initial: int = 4
+    limiter_min: int = 1
+    limiter_backoff: float = 0.5
+    limiter_latency_tolerance: float = 2.0
 
 
 @dataclass
@@ -44,6 +72,7 @@ class Settings:
     app: AppSettings
     connectors: Dict[str, ConnectorSettings]
     fx: FXSettings
+    transport: TransportSettings = field(default_factory=TransportSettings)
 
     def connector(self, name: str) -> ConnectorSettings:
         return self.connectors[name]
@@ -106,6 +135,7 @@ def load_settings(settings_path: str | Path | None = None) -> Settings:
     app_section = raw_settings.get("app", {})
     connectors_section = raw_settings.get("connectors", {})
     fx_section = raw_settings.get("fx", {})
+    transport_section = raw_settings.get("transport", {})
 
     app_settings = AppSettings(**app_section)
 
@@ -115,7 +145,12 @@ def load_settings(settings_path: str | Path | None = None) -> Settings:
 
     fx_settings = FXSettings(**fx_section)
 
-    settings = Settings(app=app_settings, connectors=connectors, fx=fx_settings)
+    settings = Settings(
+        app=app_settings,
+        connectors=connectors,
+        fx=fx_settings,
+        transport=TransportSettings(**transport_section),
+    )
 
     vendor_a = os.getenv("VENDOR_A_TOKEN")
     vendor_b = os.getenv("VENDOR_B_TOKEN")
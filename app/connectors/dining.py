@@ -1,14 +1,17 @@
 """Dining provider integration with local fallback."""
 from __future__ import annotations
 
-import json
 import logging
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Mapping, Optional
 
 from app.config import ConnectorSettings
+from app.utils.datasets import get_dataset_store
+from app.utils.deadline import Deadline, DeadlineExceeded
+from app.utils.health import HealthRegistry
+from app.utils.hedging import hedge_policy
 from app.utils.http import CircuitBreaker, HttpClient
+from app.utils.http_cache import HttpCache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -18,16 +21,23 @@ class DiningConnector:
     settings: ConnectorSettings
     token: str | None = None
     offline_mode: bool = False
+    health: HealthRegistry | None = None
+    http_cache: HttpCache | None = None
 
     def __post_init__(self) -> None:
-        self._circuit_breaker = CircuitBreaker()
+        self._circuit_breaker = CircuitBreaker(name="dining", registry=self.health)
         self._client = HttpClient(
             timeout=self.settings.timeout_seconds,
             retries=self.settings.retries,
             circuit_breaker=self._circuit_breaker,
+            hedge=hedge_policy(self.settings.hedge_percentile, self.settings.hedge_budget),
+            bulkhead="dining",
+            cache=self.http_cache,
         )
 
-    async def fetch(self, *, date: str, location: str | None = None) -> List[Dict]:
+    async def fetch(
+        self, *, date: str, location: str | None = None, deadline: Optional[Deadline] = None
+    ) -> List[Dict]:
         # In offline mode, use fallback data directly
         if self.offline_mode:
             LOGGER.debug("OFFLINE MODE: Using bundled dining dataset")
@@ -38,21 +48,26 @@ class DiningConnector:
             params["location"] = location
         headers = {"Authorization": f"Bearer {self.token}"} if self.token else None
         try:
-            payload = await self._client.get_json(self.settings.base_url, params=params, headers=headers)
+            payload = await self._client.get_json(
+                self.settings.base_url, params=params, headers=headers, deadline=deadline
+            )
             options = payload.get("restaurants", [])
             LOGGER.debug("Dining provider returned %s restaurants", len(options))
             return [self._normalise(item) for item in options]
+        except DeadlineExceeded:
+            LOGGER.warning("Dining fetch cut off by request deadline")
+            if deadline is not None:
+                deadline.mark_cut_off("dining")
+            return []
         except Exception as exc:  # noqa: BLE001 - fallback path
             LOGGER.warning("Dining API unavailable (%s); using bundled dataset", exc)
             return self._fallback()
 
     def _fallback(self) -> List[Dict]:
-        data_path = Path(__file__).resolve().parent.parent / "data" / "dining.json"
-        payload = json.loads(data_path.read_text(encoding="utf-8"))
-        options = payload.get("restaurants", [])
+        options = get_dataset_store().get("dining", "restaurants").records
         return [self._normalise(item) for item in options]
 
-    def _normalise(self, item: Dict) -> Dict:
+    def _normalise(self, item: Mapping) -> Dict:
         return {
             "name": item.get("name"),
             "est_pp": item.get("price_per_person"),
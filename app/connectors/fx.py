@@ -7,10 +7,16 @@ import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
 
 from app.config import FXSettings
+from app.utils.deadline import Deadline, DeadlineExceeded
+from app.utils.hedging import hedge_policy
 from app.utils.http import HttpClient
+from app.utils.http_cache import HttpCache
 from app.utils.metrics import record_cache_hit, record_cache_miss, record_latency
 
 LOGGER = logging.getLogger(__name__)
@@ -18,20 +24,91 @@ CACHE_FILENAME = "fx_rates.json"
 CACHE_MAX_AGE = timedelta(hours=24)
 
 
+@dataclass(frozen=True, eq=False)
+class FXSnapshot:
+    """
+    Immutable, versioned view of one FX rate table.
+
+    Conversions are synchronous lookups in a precomputed cross-rate table, so
+    everything priced from one snapshot provably uses the same rates.
+    Currencies without a usable rate convert as identity, like the connector
+    always has.
+    """
+
+    version: int
+    base_currency: str
+    rates: Mapping[str, float]
+    source: str = "live"
+    currencies: Tuple[str, ...] = field(init=False)
+    _index: Mapping[str, int] = field(init=False, repr=False)
+    _cross: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        rates = MappingProxyType(dict(self.rates))
+        currencies = tuple(currency for currency, rate in rates.items() if rate and rate > 0)
+        # One extra row/column stands for unknown currencies and converts as identity.
+        values = np.array([rates[currency] for currency in currencies] + [1.0], dtype=float)
+        cross = values[np.newaxis, :] / values[:, np.newaxis]
+        cross[-1, :] = 1.0
+        cross[:, -1] = 1.0
+        cross.setflags(write=False)
+        object.__setattr__(self, "rates", rates)
+        object.__setattr__(self, "currencies", currencies)
+        object.__setattr__(self, "_index", MappingProxyType({c: i for i, c in enumerate(currencies)}))
+        object.__setattr__(self, "_cross", cross)
+
+    @classmethod
+    def from_rates(
+        cls, rates: Mapping[str, float], *, base_currency: str = "EUR", source: str = "live", version: int = 0
+    ) -> "FXSnapshot":
+        return cls(version=version, base_currency=base_currency, rates=rates, source=source)
+
+    def index(self, currency: str) -> int:
+        """Row/column of ``currency`` in the cross-rate table."""
+        return self._index.get(currency, len(self.currencies))
+
+    def indices(self, currencies: Iterable[str]) -> np.ndarray:
+        unknown = len(self.currencies)
+        return np.fromiter((self._index.get(currency, unknown) for currency in currencies), dtype=np.int64)
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Multiplier converting ``from_currency`` amounts into ``to_currency``."""
+        return float(self._cross[self.index(from_currency), self.index(to_currency)])
+
+    def convert(self, amount: float, from_currency: str, to_currency: str) -> float:
+        if from_currency == to_currency:
+            return amount
+        return amount * self.rate(from_currency, to_currency)
+
+    def convert_many(self, amounts, from_currencies, to_currency: str) -> np.ndarray:
+        """Convert an array of amounts; currencies may be codes or :meth:`indices`."""
+        if not isinstance(from_currencies, np.ndarray) or from_currencies.dtype.kind not in "iu":
+            from_currencies = self.indices(from_currencies)
+        return np.asarray(amounts, dtype=float) * self._cross[from_currencies, self.index(to_currency)]
+
+
 @dataclass
 class FXConnector:
     settings: FXSettings
     offline_mode: bool = False
+    http_cache: Optional[HttpCache] = None
     _memory_cache: Dict[str, float] = field(default_factory=dict, init=False)
     _fx_source: str = field(default="live", init=False)
+    _snapshot: Optional[FXSnapshot] = field(default=None, init=False)
 
     def __post_init__(self) -> None:
-        self._client = HttpClient(timeout=6, retries=1)
+        self._client = HttpClient(
+            timeout=6,
+            retries=1,
+            hedge=hedge_policy(self.settings.hedge_percentile, self.settings.hedge_budget),
+            bulkhead="fx",
+            cache=self.http_cache,
+        )
         cache_dir = Path("~/.weekend-planner/cache").expanduser()
         cache_dir.mkdir(parents=True, exist_ok=True)
         self._cache_path = cache_dir / CACHE_FILENAME
 
-    async def get_rates(self) -> Dict[str, float]:
+    async def get_rates(self, deadline: Optional[Deadline] = None) -> Dict[str, float]:
         if self._memory_cache:
             record_cache_hit()
             return self._memory_cache
@@ -61,7 +138,7 @@ class FXConnector:
         params = {"base": self.settings.base_currency}
         try:
             start_time = time.time()
-            payload = await self._client.get_json(self.settings.base_url, params=params)
+            payload = await self._client.get_json(self.settings.base_url, params=params, deadline=deadline)
             latency_ms = (time.time() - start_time) * 1000
             record_latency("fx_live_latency_ms", latency_ms)
             rates = payload.get("rates", {})
@@ -70,6 +147,15 @@ class FXConnector:
             self._memory_cache = rates
             self._fx_source = "live"
             return rates
+        except DeadlineExceeded:
+            # Answer this request with fallback rates but keep trying live next time.
+            LOGGER.warning("FX fetch cut off by request deadline; using fallback rates")
+            if deadline is not None:
+                deadline.mark_cut_off("fx")
+            self._fx_source = "last_good"
+            if self._cache_path.exists():
+                return self._load_cache()
+            return dict(self.settings.fallback_rates)
         except Exception as exc:  # noqa: BLE001 - fallback to cached/built-in
             LOGGER.warning("FX provider unavailable (%s); using fallback rates", exc)
             if self._cache_path.exists():
@@ -80,12 +166,21 @@ class FXConnector:
             self._fx_source = "last_good"
             return self._memory_cache
 
+    async def snapshot(self, deadline: Optional[Deadline] = None) -> FXSnapshot:
+        """Current rates as an immutable snapshot; the version changes with the rates."""
+        rates = await self.get_rates(deadline=deadline)
+        current = self._snapshot
+        if current is not None and current.source == self._fx_source and dict(current.rates) == rates:
+            return current
+        version = current.version + 1 if current is not None else 1
+        snapshot = FXSnapshot(
+            version=version, base_currency=self.settings.base_currency, rates=rates, source=self._fx_source
+        )
+        self._snapshot = snapshot
+        return snapshot
+
     async def convert(self, amount: float, from_currency: str, to_currency: str) -> float:
-        rates = await self.get_rates()
-        if from_currency not in rates or to_currency not in rates:
-            return amount
-        base_amount = amount / rates[from_currency]
-        return base_amount * rates[to_currency]
+        return (await self.snapshot()).convert(amount, from_currency, to_currency)
 
     def _is_cache_valid(self) -> bool:
         if not self._cache_path.exists():
@@ -1,15 +1,22 @@
 """Connector implementation for ticket vendor A."""
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import sqlite3
 import time
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List, Mapping, Optional
 
 from app.config import ConnectorSettings
-from app.utils.http import CircuitBreaker, HttpClient, aggregate_paginated
+from app.normalizers.event import Event
+from app.utils.catalogue import EventCatalogue
+from app.utils.datasets import get_dataset_store
+from app.utils.deadline import Deadline, DeadlineExceeded
+from app.utils.health import HealthRegistry
+from app.utils.hedging import hedge_policy
+from app.utils.http import CircuitBreaker, HttpClient, Page, iterate_paginated
+from app.utils.http_cache import HttpCache
 from app.utils.metrics import record_latency
 
 LOGGER = logging.getLogger(__name__)
@@ -20,61 +27,111 @@ class TicketVendorAConnector:
     settings: ConnectorSettings
     token: str | None = None
     offline_mode: bool = False
+    catalogue: EventCatalogue | None = None
+    health: HealthRegistry | None = None
+    http_cache: HttpCache | None = None
 
     def __post_init__(self) -> None:
-        self._circuit_breaker = CircuitBreaker()
+        self._circuit_breaker = CircuitBreaker(name="vendor_a", registry=self.health)
         self._client = HttpClient(
             timeout=self.settings.timeout_seconds,
             retries=self.settings.retries,
             circuit_breaker=self._circuit_breaker,
+            hedge=hedge_policy(self.settings.hedge_percentile, self.settings.hedge_budget),
+            bulkhead="vendor_a",
+            cache=self.http_cache,
         )
 
-    async def fetch(self, *, date: str) -> List[Dict]:
+    async def fetch(self, *, date: str, deadline: Optional[Deadline] = None) -> List[Event]:
+        events: List[Event] = []
+        async for page in self.fetch_pages(date=date, deadline=deadline):
+            events.extend(page)
+        return events
+
+    async def fetch_pages(self, *, date: str, deadline: Optional[Deadline] = None) -> AsyncIterator[List[Event]]:
+        """Yield normalised events one vendor page at a time.
+
+        When ``deadline`` runs out the remaining pages are skipped and the
+        vendor is recorded in ``deadline.cut_off``.
+        """
         page_size = self.settings.page_size or 50
 
-        async def _page_loader(page: int, page_size: int) -> List[Dict]:
+        async def _page_loader(page: int, page_size: int) -> Page | List[Dict]:
             # In offline mode, use fallback data directly
             if self.offline_mode:
                 LOGGER.debug("OFFLINE MODE: Using bundled vendor A dataset")
-                return self._load_fallback(page=page, page_size=page_size)
+                return await self._load_fallback(date=date, page=page, page_size=page_size)
             
             params = {"date": date, "page": page, "page_size": page_size}
             headers = {"Authorization": f"Bearer {self.token}"} if self.token else None
             try:
                 start_time = time.time()
-                payload = await self._client.get_json(self.settings.base_url, params=params, headers=headers)
+                events, payload, response_headers = await self._client.get_json_items(
+                    self.settings.base_url,
+                    key="events",
+                    params=params,
+                    headers=headers,
+                    deadline=deadline,
+                    stream=self.settings.stream_pages,
+                    max_bytes=self.settings.max_response_bytes,
+                )
                 latency_ms = (time.time() - start_time) * 1000
                 record_latency("vendor_a_latency_ms", latency_ms)
-                events = payload.get("events", [])
                 LOGGER.debug("Vendor A page %s returned %s events", page, len(events))
-                return events
+                await self._remember(events, date=date, page=page)
+                return Page.from_response(events, payload=payload, headers=response_headers, page_size=page_size)
+            except DeadlineExceeded:
+                raise
             except Exception as exc:  # noqa: BLE001 - we want fallback behaviour
                 LOGGER.warning("Vendor A API unavailable (%s); using bundled dataset", exc)
-                return self._load_fallback(page=page, page_size=page_size)
+                return await self._load_fallback(date=date, page=page, page_size=page_size)
 
-        raw_events = await aggregate_paginated(_page_loader, page_size)
-        return [self._normalise(event) for event in raw_events]
+        try:
+            async for raw_events in iterate_paginated(
+                _page_loader, page_size, deadline=deadline, prefetch=self.settings.prefetch_pages
+            ):
+                yield [self._normalise(event) for event in raw_events]
+        except DeadlineExceeded:
+            LOGGER.warning("Vendor A fetch cut off by request deadline")
+            if deadline is not None:
+                deadline.mark_cut_off("vendor_a")
 
-    def _load_fallback(self, *, page: int, page_size: int) -> List[Dict]:
-        data_path = Path(__file__).resolve().parent.parent / "data" / "vendor_a.json"
-        payload = json.loads(data_path.read_text(encoding="utf-8"))
-        events = payload.get("events", [])
-        start = (page - 1) * page_size
-        end = start + page_size
-        return events[start:end]
+    async def _remember(self, events: List[Dict], *, date: str, page: int) -> None:
+        """Store a live page in the catalogue off the event loop."""
+        if self.catalogue is None or not events:
+            return
+        try:
+            await asyncio.to_thread(self.catalogue.upsert_page, "vendor_a", events, date=date, page=page)
+        except sqlite3.Error as exc:
+            LOGGER.warning("Could not store vendor A events in the catalogue (%s)", exc)
 
-    def _normalise(self, event: Dict) -> Dict:
-        promos = event.get("promos", [])
-        return {
-            "provider": "vendor_a",
-            "title": event.get("title"),
-            "start_ts": event.get("start"),
-            "venue": event.get("venue"),
-            "city": event.get("city"),
-            "price": event.get("price", {}),
-            "fees": event.get("fees", []),
-            "vat_rate": event.get("vat_rate"),
-            "promos": promos,
-            "inventory_hint": event.get("inventory_hint", "unknown"),
-            "url": event.get("url"),
-        }
+    async def _load_fallback(self, *, date: str, page: int, page_size: int) -> Page:
+        """Serve a page from the local catalogue, or the bundled dataset when it has nothing for ``date``."""
+        if self.catalogue is not None:
+            try:
+                items, total_pages = await asyncio.to_thread(
+                    self.catalogue.page, "vendor_a", date=date, page=page, page_size=page_size
+                )
+            except sqlite3.Error as exc:
+                LOGGER.warning("Event catalogue unavailable (%s); using bundled dataset", exc)
+            else:
+                if total_pages:
+                    return Page(items=items, total_pages=total_pages)
+        pages = get_dataset_store().get("vendor_a", "events").pages(page_size, date=date)
+        items = pages[page - 1] if page <= len(pages) else ()
+        return Page(items=items, total_pages=len(pages))
+
+    def _normalise(self, event: Mapping) -> Event:
+        return Event.build(
+            provider="vendor_a",
+            title=event.get("title"),
+            start_ts=event.get("start"),
+            venue=event.get("venue"),
+            city=event.get("city"),
+            price=event.get("price", {}),
+            fees=event.get("fees", []),
+            vat_rate=event.get("vat_rate"),
+            promos=event.get("promos", []),
+            inventory_hint=event.get("inventory_hint", "unknown"),
+            url=event.get("url"),
+        )
@@ -7,9 +7,13 @@ Open-Meteo is a free weather API that doesn't require an API key.
 import httpx
 from typing import Optional
 from ..utils.cache import get_cache
+from ..utils.http import HttpClient
 
 WEATHER_CACHE_TTL = 7200  # 2 hours
 
+# Shared so concurrent lookups of the same coordinates make one request.
+_client = HttpClient(timeout=10, retries=0, bulkhead="weather")
+
 # City coordinates lookup (stub - in production would use geocoding API)
 CITY_COORDS = {
     "lisbon": {"lat": 38.709, "lng": -9.133},
@@ -59,29 +63,28 @@ async def get_weather(lat: float, lng: float, offline_mode: bool = False) -> Opt
             "forecast_days": 1
         }
         
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract current weather
-            current = data.get("current", {})
-            daily = data.get("daily", {})
-            
-            # Map weather codes to descriptions (simplified)
-            weather_code = current.get("weather_code", 0)
-            desc = _weather_code_to_desc(weather_code)
-            
-            result = {
-                "desc": desc,
-                "temp_c": round(current.get("temperature_2m", 15.0), 1),
-                "temp_min": round(daily.get("temperature_2m_min", [15])[0], 1) if daily.get("temperature_2m_min") else None,
-                "temp_max": round(daily.get("temperature_2m_max", [20])[0], 1) if daily.get("temperature_2m_max") else None,
-            }
-            
-            # Cache the result
-            cache.set(cache_key, result)
-            return result
+        response = await _client.request("GET", url, params=params)
+        response.raise_for_status()
+        data = response.json()
+        
+        # Extract current weather
+        current = data.get("current", {})
+        daily = data.get("daily", {})
+        
+        # Map weather codes to descriptions (simplified)
+        weather_code = current.get("weather_code", 0)
+        desc = _weather_code_to_desc(weather_code)
+        
+        result = {
+            "desc": desc,
+            "temp_c": round(current.get("temperature_2m", 15.0), 1),
+            "temp_min": round(daily.get("temperature_2m_min", [15])[0], 1) if daily.get("temperature_2m_min") else None,
+            "temp_max": round(daily.get("temperature_2m_max", [20])[0], 1) if daily.get("temperature_2m_max") else None,
+        }
+        
+        # Cache the result
+        cache.set(cache_key, result)
+        return result
     
     except (httpx.HTTPError, KeyError, ValueError):
         # Return None on error (weather is optional)
@@ -11,63 +11,118 @@ ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app.services.planner import Planner  # noqa: E402
+from app.services.planner import Planner, PlannerResult, PlanQuery  # noqa: E402
+from app.utils.transport import close_transport_pool  # noqa: E402
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Weekend Planner")
-    parser.add_argument("--date", required=True, help="Target date (YYYY-MM-DD)")
-    parser.add_argument("--budget-pp", type=float, required=True, help="Budget per person")
+    parser.add_argument(
+        "--date", nargs="+", required=True, help="Target date(s) (YYYY-MM-DD); several dates are planned as a batch"
+    )
+    parser.add_argument(
+        "--budget-pp", type=float, nargs="+", required=True, help="Budget(s) per person, planned for every date"
+    )
     parser.add_argument("--with-dining", action="store_true", help="Include dining suggestions")
+    parser.add_argument("--limit", type=int, help="Only return the best N itineraries")
+    parser.add_argument(
+        "--deadline-ms", type=int, help="Answer within this many milliseconds, returning partial results if needed"
+    )
     parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
     parser.add_argument("--offline", action="store_true", help="Run in offline mode using cached data")
     return parser
 
 
+def _serialise(result: PlannerResult) -> dict:
+    return {
+        "itineraries": [
+            {
+                **{k: v for k, v in itinerary.items() if k != "price"},
+                "price": itinerary["price"].to_dict(),
+            }
+            for itinerary in result.itineraries
+        ],
+        "dining": result.dining,
+        "fx_used": result.fx_used,
+        "partial": result.partial,
+        "cut_off": result.cut_off,
+    }
+
+
+def _print_result(result: PlannerResult, *, with_dining: bool, currency: str) -> None:
+    if result.partial:
+        print(f"Partial results: deadline cut off {', '.join(result.cut_off)}")
+        print("")
+    for itinerary in result.itineraries:
+        price = itinerary["price"]
+        print(f"{itinerary['title']} ({itinerary['provider']})")
+        print(f"  When: {itinerary['start_ts']} @ {itinerary['venue']}")
+        print(f"  Total (pp): {price.total:.2f} {price.currency}")
+        print(f"  Score: {itinerary['score']}")
+        print(f"  Buy now: {itinerary['buy_now']} ({itinerary['buy_reason']})")
+        print(f"  URL: {itinerary['url']}")
+        print("")
+    if with_dining and result.dining:
+        print("Dining suggestions:")
+        for option in result.dining:
+            print(
+                f"- {option['name']} · {option['est_pp']} {currency} pp · "
+                f"{option['distance_m']}m away"
+            )
+            print(f"  Book: {option['booking_url']}")
+
+
 async def async_main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
 
     # Create planner with offline mode if specified
     planner = Planner(offline_mode=args.offline)
-    result = await planner.plan(date=args.date, budget_pp=args.budget_pp, with_dining=args.with_dining)
+    currency = planner.settings.app.currency
+    queries = [
+        PlanQuery(date=date, budget_pp=budget_pp, with_dining=args.with_dining, limit=args.limit)
+        for date in args.date
+        for budget_pp in args.budget_pp
+    ]
 
+    if len(queries) == 1:
+        query = queries[0]
+        result = await planner.plan(
+            date=query.date,
+            budget_pp=query.budget_pp,
+            with_dining=query.with_dining,
+            limit=query.limit,
+            deadline_ms=args.deadline_ms,
+        )
+        if args.json:
+            print(json.dumps(_serialise(result), indent=2, sort_keys=True))
+        else:
+            _print_result(result, with_dining=args.with_dining, currency=currency)
+        return 0
+
+    results = await planner.plan_many(queries, deadline_ms=args.deadline_ms)
     if args.json:
-        serialisable = {
-            "itineraries": [
-                {
-                    **{k: v for k, v in itinerary.items() if k != "price"},
-                    "price": itinerary["price"].__dict__,
-                }
-                for itinerary in result.itineraries
-            ],
-            "dining": result.dining,
-            "fx_used": result.fx_used,
-        }
+        serialisable = [
+            {"date": query.date, "budget_pp": query.budget_pp, **_serialise(result)}
+            for query, result in zip(queries, results)
+        ]
         print(json.dumps(serialisable, indent=2, sort_keys=True))
     else:
-        for itinerary in result.itineraries:
-            price = itinerary["price"]
-            print(f"{itinerary['title']} ({itinerary['provider']})")
-            print(f"  When: {itinerary['start_ts']} @ {itinerary['venue']}")
-            print(f"  Total (pp): {price.total:.2f} {price.currency}")
-            print(f"  Score: {itinerary['score']}")
-            print(f"  Buy now: {itinerary['buy_now']} ({itinerary['buy_reason']})")
-            print(f"  URL: {itinerary['url']}")
-            print("")
-        if args.with_dining and result.dining:
-            print("Dining suggestions:")
-            for option in result.dining:
-                print(
-                    f"- {option['name']} · {option['est_pp']} {price.currency} pp · "
-                    f"{option['distance_m']}m away"
-                )
-                print(f"  Book: {option['booking_url']}")
+        for query, result in zip(queries, results):
+            print(f"=== {query.date} · budget {query.budget_pp:.2f} {currency} pp ===")
+            _print_result(result, with_dining=args.with_dining, currency=currency)
     return 0
 
 
+async def _run(argv: list[str] | None) -> int:
+    try:
+        return await async_main(argv)
+    finally:
+        await close_transport_pool()
+
+
 def main(argv: list[str] | None = None) -> int:
-    return asyncio.run(async_main(argv))
+    return asyncio.run(_run(argv))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+"""Compact records for normalised events."""
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, ClassVar, Dict, Iterator, Tuple
+
+from app.utils.timestamps import try_parse_epoch
+
+
+class Inventory(IntEnum):
+    """Vendor inventory hints, stored as small integers instead of strings."""
+
+    UNKNOWN = 0
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+
+    @property
+    def hint(self) -> str:
+        return self.name.lower()
+
+
+# Accepted spellings of each hint; anything else is treated as unknown.
+INVENTORY_CODES: Dict[str, int] = {
+    **{member.hint: member.value for member in Inventory},
+    "med": Inventory.MEDIUM.value,
+}
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class RecordMapping(Mapping):
+    """
+    Read-only mapping view over a slotted record.
+
+    Lets code written against the old per-event dicts keep using
+    ``record["key"]`` and ``record.get("key")`` while the data lives in slots.
+    Records become real dicts only via :meth:`to_dict` at the serialisation edge.
+    """
+
+    __slots__ = ()
+    _keys: ClassVar[Tuple[str, ...]] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self._keys}
+
+
+@dataclass(slots=True, eq=False)
+class Event(RecordMapping):
+    """
+    A normalised vendor event.
+
+    The price is stored as flat fields, the inventory hint as an
+    :class:`Inventory` code, ``start_ts`` is parsed once into ``start_epoch``
+    (None when missing or malformed), and repeated strings (provider, city,
+    venue, currency) are interned. The mapping view still exposes the
+    original keys, including the nested ``price`` dict.
+    """
+
+    provider: str
+    title: str | None
+    start_ts: str | None
+    venue: str | None
+    city: str | None
+    url: str | None
+    amount: float = 0.0
+    currency: str | None = None
+    includes_vat: bool = True
+    vat_rate: float | None = None
+    fees: Tuple[Dict, ...] = ()
+    promos: Tuple[Dict, ...] = ()
+    inventory: int = Inventory.UNKNOWN.value
+    start_epoch: int | None = None
+
+    _keys: ClassVar[Tuple[str, ...]] = (
+        "provider",
+        "title",
+        "start_ts",
+        "venue",
+        "city",
+        "price",
+        "fees",
+        "vat_rate",
+        "promos",
+        "inventory_hint",
+        "url",
+    )
+
+    @classmethod
+    def build(
+        cls,
+        *,
+        provider: str,
+        title: str | None = None,
+        start_ts: str | None = None,
+        venue: str | None = None,
+        city: str | None = None,
+        url: str | None = None,
+        price: Dict | None = None,
+        fees=None,
+        vat_rate: float | None = None,
+        promos=None,
+        inventory_hint: str | None = None,
+    ) -> "Event":
+        price = price or {}
+        return cls(
+            provider=_intern(provider),
+            title=title,
+            start_ts=start_ts,
+            venue=_intern(venue),
+            city=_intern(city),
+            url=url,
+            amount=float(price.get("amount", 0.0) or 0.0),
+            currency=_intern(price.get("currency")),
+            includes_vat=bool(price.get("includes_vat", True)),
+            vat_rate=vat_rate,
+            fees=tuple(fees or ()),
+            promos=tuple(promos or ()),
+            inventory=INVENTORY_CODES.get(inventory_hint or "unknown", Inventory.UNKNOWN.value),
+            start_epoch=try_parse_epoch(start_ts),
+        )
+
+    @classmethod
+    def coerce(cls, event: Mapping) -> "Event":
+        """Return ``event`` as a record, converting a plain event dict if needed."""
+        if isinstance(event, cls):
+            return event
+        return cls.build(**{key: event.get(key) for key in cls._keys})
+
+    @property
+    def price(self) -> Dict[str, Any]:
+        price: Dict[str, Any] = {"amount": self.amount, "includes_vat": self.includes_vat}
+        if self.currency is not None:
+            price["currency"] = self.currency
+        return price
+
+    @property
+    def inventory_hint(self) -> str:
+        return Inventory(self.inventory).hint
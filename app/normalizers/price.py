@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Sequence, Tuple
 
-from app.connectors.fx import FXConnector
+import numpy as np
 
+from app.connectors.fx import FXConnector, FXSnapshot
+from app.normalizers.event import Event
 
-@dataclass
+
+@dataclass(slots=True, init=False)
 class PriceBreakdown:
     base: float
     vat: float
@@ -15,28 +18,103 @@ class PriceBreakdown:
     promos: float
     total: float
     currency: str
-    components: Dict[str, float]
     promo_applied: Dict | None
 
+    def __init__(
+        self,
+        base: float,
+        vat: float,
+        fees: float,
+        promos: float,
+        total: float,
+        currency: str,
+        components: Dict[str, float] | None = None,
+        promo_applied: Dict | None = None,
+    ) -> None:
+        # ``components`` is derived from the fields; the argument is accepted
+        # so existing call sites keep working.
+        self.base = base
+        self.vat = vat
+        self.fees = fees
+        self.promos = promos
+        self.total = total
+        self.currency = currency
+        self.promo_applied = promo_applied
+
+    @property
+    def components(self) -> Dict[str, float]:
+        return {"base": self.base, "vat": self.vat, "fees": self.fees, "promo": self.promos}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "base": self.base,
+            "vat": self.vat,
+            "fees": self.fees,
+            "promos": self.promos,
+            "total": self.total,
+            "currency": self.currency,
+            "components": self.components,
+            "promo_applied": self.promo_applied,
+        }
+
+
+@dataclass(frozen=True, eq=False)
+class PriceTable:
+    """Landed costs for a batch of events, one column per component.
+
+    Amounts are integer minor units (cents) in ``currency``; row ``i``
+    belongs to the ``i``-th priced event. :meth:`breakdown` gives the
+    familiar ``PriceBreakdown`` view of a single row.
+    """
+
+    currency: str
+    base: np.ndarray
+    vat: np.ndarray
+    fees: np.ndarray
+    promos: np.ndarray
+    total: np.ndarray
+    promo_applied: List[Dict | None]
+
+    def __len__(self) -> int:
+        return len(self.total)
+
+    def totals(self) -> np.ndarray:
+        """Landed totals in major units, as ``PriceBreakdown.total`` reports them."""
+        return self.total / 100.0
+
+    def breakdown(self, index: int) -> PriceBreakdown:
+        base = int(self.base[index]) / 100.0
+        vat = int(self.vat[index]) / 100.0
+        fees = int(self.fees[index]) / 100.0
+        promos = int(self.promos[index]) / 100.0
+        return PriceBreakdown(
+            base=base,
+            vat=vat,
+            fees=fees,
+            promos=promos,
+            total=int(self.total[index]) / 100.0,
+            currency=self.currency,
+            promo_applied=self.promo_applied[index],
+        )
+
 
 def _parse_amount(entry: Dict, key: str) -> float:
     value = entry.get(key)
     return float(value) if value is not None else 0.0
 
 
-async def _convert_amount(fx: FXConnector, amount: float, from_currency: str, target: str) -> float:
-    if from_currency == target:
-        return amount
-    return await fx.convert(amount, from_currency, target)
+async def calculate_price(event: Dict, *, fx: FXConnector, target_currency: str) -> PriceBreakdown:
+    return price_event(event, fx=await fx.snapshot(), target_currency=target_currency)
 
 
-async def calculate_price(event: Dict, *, fx: FXConnector, target_currency: str) -> PriceBreakdown:
+def price_event(event: Dict, *, fx: FXSnapshot, target_currency: str) -> PriceBreakdown:
+    """Price one event against an FX snapshot without awaiting anything."""
     price_info = event.get("price", {})
     currency = price_info.get("currency", target_currency)
     includes_vat = price_info.get("includes_vat", True)
     base_amount = float(price_info.get("amount", 0.0))
 
-    converted_base = await _convert_amount(fx, base_amount, currency, target_currency)
+    converted_base = fx.convert(base_amount, currency, target_currency)
 
     vat_rate = float(event.get("vat_rate", 0.0) or 0.0)
     vat_amount = 0.0 if includes_vat else converted_base * vat_rate
@@ -44,27 +122,14 @@ async def calculate_price(event: Dict, *, fx: FXConnector, target_currency: str)
 
     fees_amount = 0.0
     for fee in event.get("fees", []):
-        fee_amount = await _convert_amount(
-            fx,
-            _parse_amount(fee, "amount"),
-            fee.get("currency", currency),
-            target_currency,
-        )
-        fees_amount += fee_amount
+        fees_amount += fx.convert(_parse_amount(fee, "amount"), fee.get("currency", currency), target_currency)
 
-    promo_discount, applied_promo = await _best_promo(
+    promo_discount, applied_promo = _best_promo(
         event.get("promos", []), gross_base + fees_amount, currency, fx, target_currency
     )
 
     total = max(gross_base + fees_amount - promo_discount, 0.0)
 
-    components = {
-        "base": round(converted_base, 2),
-        "vat": round(vat_amount, 2),
-        "fees": round(fees_amount, 2),
-        "promo": round(promo_discount, 2),
-    }
-
     return PriceBreakdown(
         base=round(converted_base, 2),
         vat=round(vat_amount, 2),
@@ -72,12 +137,11 @@ async def calculate_price(event: Dict, *, fx: FXConnector, target_currency: str)
         promos=round(promo_discount, 2),
         total=round(total, 2),
         currency=target_currency,
-        components=components,
         promo_applied=applied_promo,
     )
 
 
-async def _best_promo(promos: List[Dict], subtotal: float, price_currency: str, fx: FXConnector, target_currency: str) -> Tuple[float, Dict | None]:
+def _best_promo(promos: List[Dict], subtotal: float, price_currency: str, fx: FXSnapshot, target_currency: str) -> Tuple[float, Dict | None]:
     best_discount = 0.0
     best = None
     for promo in promos or []:
@@ -86,15 +150,111 @@ async def _best_promo(promos: List[Dict], subtotal: float, price_currency: str,
             discount = subtotal * percent
         elif promo.get("type") == "fixed":
             currency = promo.get("currency", price_currency)
-            discount = await _convert_amount(
-                fx,
-                float(promo.get("value", 0.0)),
-                currency,
-                target_currency,
-            )
+            discount = fx.convert(float(promo.get("value", 0.0)), currency, target_currency)
         else:
             continue
         if discount > best_discount:
             best_discount = discount
             best = promo
     return best_discount, best
+
+
+def price_events(events: Sequence[Dict], *, fx: FXSnapshot, target_currency: str) -> PriceTable:
+    """Price a whole batch of events against one FX snapshot.
+
+    Performs the same float operations as ``price_event`` (which stays
+    the per-event reference) in one array pass per component, then rounds
+    each reported figure once, as ``price_event`` does. Every row therefore
+    equals ``price_event`` to the cent. Like there, the rounded total may
+    differ by a cent from the sum of the rounded components. Ties between
+    promos keep the first promo, as before.
+    """
+    code = fx.index
+    events = [Event.coerce(event) for event in events]
+
+    count = len(events)
+    base_amounts = np.empty(count, dtype=float)
+    base_codes = np.empty(count, dtype=np.int64)
+    vat_rates = np.zeros(count, dtype=float)
+    fee_rows: List[int] = []
+    fee_amounts: List[float] = []
+    fee_codes: List[int] = []
+    promo_rows: List[int] = []
+    promo_values: List[float] = []
+    promo_codes: List[int] = []
+    promo_percent: List[bool] = []
+    promo_entries: List[Dict] = []
+
+    for row, event in enumerate(events):
+        currency = event.currency or target_currency
+        base_amounts[row] = event.amount
+        base_codes[row] = code(currency)
+        if not event.includes_vat:
+            vat_rates[row] = float(event.vat_rate or 0.0)
+        for fee in event.fees:
+            fee_rows.append(row)
+            fee_amounts.append(_parse_amount(fee, "amount"))
+            fee_codes.append(code(fee.get("currency", currency)))
+        for promo in event.promos:
+            kind = promo.get("type")
+            if kind not in ("percent", "fixed"):
+                continue
+            promo_rows.append(row)
+            promo_percent.append(kind == "percent")
+            if kind == "percent":
+                promo_values.append(float(promo.get("value", 0.0)) / 100.0)
+                promo_codes.append(code(target_currency))
+            else:
+                promo_values.append(float(promo.get("value", 0.0)))
+                promo_codes.append(code(promo.get("currency", currency)))
+            promo_entries.append(promo)
+
+    def convert(amounts: List[float] | np.ndarray, codes: List[int] | np.ndarray) -> np.ndarray:
+        return fx.convert_many(np.asarray(amounts, dtype=float), np.asarray(codes, dtype=np.int64), target_currency)
+
+    # Same float operations, in the same order, as price_event; np.add.at
+    # sums each row's fees in list order like the scalar loop does.
+    converted_base = convert(base_amounts, base_codes)
+    vat_amount = converted_base * vat_rates
+    gross_base = converted_base + vat_amount
+
+    fee_index = np.asarray(fee_rows, dtype=np.int64)
+    fees_amount = np.zeros(count, dtype=float)
+    np.add.at(fees_amount, fee_index, convert(fee_amounts, fee_codes))
+    subtotal = gross_base + fees_amount
+
+    promo_index = np.asarray(promo_rows, dtype=np.int64)
+    percent = np.asarray(promo_percent, dtype=bool)
+    values = np.asarray(promo_values, dtype=float)
+    discounts = np.where(percent, subtotal[promo_index] * values, convert(values, promo_codes))
+    promo_discount = np.zeros(count, dtype=float)
+    np.maximum.at(promo_discount, promo_index, discounts)
+
+    promo_applied: List[Dict | None] = [None] * count
+    winners = np.flatnonzero((discounts > 0) & (discounts == promo_discount[promo_index]))
+    if winners.size:
+        rows, first = np.unique(promo_index[winners], return_index=True)
+        for row, position in zip(rows.tolist(), winners[first].tolist()):
+            promo_applied[row] = promo_entries[position]
+
+    total = np.maximum(subtotal - promo_discount, 0.0)
+    return PriceTable(
+        currency=target_currency,
+        base=_to_cents(converted_base),
+        vat=_to_cents(vat_amount),
+        fees=_to_cents(fees_amount),
+        promos=_to_cents(promo_discount),
+        total=_to_cents(total),
+        promo_applied=promo_applied,
+    )
+
+
+def _to_cents(amounts: np.ndarray) -> np.ndarray:
+    """Integer cents of ``round(amount, 2)``, matching price_event's rounding exactly.
+
+    Python's ``round`` works on the exact binary value (0.005 -> 0.01),
+    which ``np.rint(amount * 100)`` does not reproduce (it gives 0 cents).
+    """
+    return np.fromiter(
+        (round(round(amount, 2) * 100) for amount in amounts.tolist()), dtype=np.int64, count=len(amounts)
+    )
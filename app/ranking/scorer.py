@@ -1,23 +1,46 @@
 """Scoring utilities for itineraries."""
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Dict
+import time
+from datetime import datetime
+from typing import Dict, Iterable
 
+import numpy as np
+
+from app.normalizers.event import INVENTORY_CODES, Inventory
 from app.normalizers.price import PriceBreakdown
+from app.utils.timestamps import SECONDS_PER_DAY, parse_epoch
+
+# Reason codes returned by buy_now_batch; buy_now_reason turns them into text.
+REASON_SOON = 0
+REASON_LOW_INVENTORY = 1
+REASON_HIGH_INVENTORY = 2
+REASON_VOLATILITY = 3
+REASON_NO_URGENCY = 4
+
+
+def _epoch(reference: datetime | float | None) -> float:
+    if reference is None:
+        return time.time()
+    if isinstance(reference, datetime):
+        return reference.timestamp()
+    return float(reference)
 
 
-def _parse_iso8601(value: str) -> datetime:
-    if value.endswith("Z"):
-        value = value[:-1] + "+00:00"
-    return datetime.fromisoformat(value).astimezone(timezone.utc)
+def days_until(event_ts: str | int, reference: datetime | float | None = None) -> int:
+    """Whole days from ``reference`` (default: now) until the event, never negative.
 
+    ``event_ts`` may be an ISO-8601 string or epoch seconds as stored on
+    :class:`~app.normalizers.event.Event`; ``reference`` a datetime or epoch.
+    """
+    event_epoch = event_ts if isinstance(event_ts, int) else parse_epoch(event_ts)
+    return max(int((event_epoch - _epoch(reference)) // SECONDS_PER_DAY), 0)
 
-def days_until(event_ts: str, reference: datetime | None = None) -> int:
-    ref = reference or datetime.now(timezone.utc)
-    event_dt = _parse_iso8601(event_ts)
-    delta = event_dt - ref
-    return max(int(delta.total_seconds() // 86400), 0)
+
+def days_until_batch(event_epochs: np.ndarray, reference: datetime | float | None = None) -> np.ndarray:
+    """Vectorised :func:`days_until` over epoch seconds."""
+    days = (np.asarray(event_epochs, dtype=np.int64) - _epoch(reference)) // SECONDS_PER_DAY
+    return np.maximum(days, 0).astype(np.int64)
 
 
 def buy_now_heuristic(
@@ -42,6 +65,50 @@ def buy_now_heuristic(
     return False, "No urgency detected"
 
 
+def inventory_codes(hints: Iterable[str]) -> np.ndarray:
+    """Encode inventory hints as INVENTORY_CODES; unrecognised hints map to "unknown"."""
+    return np.fromiter((INVENTORY_CODES.get(hint, 0) for hint in hints), dtype=np.int8)
+
+
+def buy_now_batch(
+    *,
+    inventory_codes: np.ndarray,
+    days_to_event: np.ndarray,
+    price_variance: np.ndarray | float,
+    settings: Dict,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorised buy_now_heuristic returning (buy_now, reason_code) arrays."""
+    threshold = settings.get("price_drop_days_threshold", 5)
+    codes = np.asarray(inventory_codes)
+    days = np.asarray(days_to_event)
+    variance = np.broadcast_to(np.asarray(price_variance, dtype=float), codes.shape)
+
+    soon = days <= threshold
+    low = codes == Inventory.LOW
+    high = (codes == Inventory.HIGH) & (variance <= 0)
+    volatile = variance > 0.15
+    reasons = np.select(
+        [soon, low, high, volatile],
+        [REASON_SOON, REASON_LOW_INVENTORY, REASON_HIGH_INVENTORY, REASON_VOLATILITY],
+        default=REASON_NO_URGENCY,
+    ).astype(np.int8)
+    buy_now = (reasons == REASON_SOON) | (reasons == REASON_LOW_INVENTORY) | (reasons == REASON_VOLATILITY)
+    return buy_now, reasons
+
+
+def buy_now_reason(code: int, settings: Dict) -> str:
+    """The reason text buy_now_heuristic gives for a buy_now_batch reason code."""
+    if code == REASON_SOON:
+        return f"Event happening soon (<= {settings.get('price_drop_days_threshold', 5)} days)"
+    if code == REASON_LOW_INVENTORY:
+        return f"Low inventory (bonus {settings.get('price_drop_low_inventory_bonus', 0.2):+.0%})"
+    if code == REASON_HIGH_INVENTORY:
+        return f"High inventory (penalty {settings.get('price_drop_high_inventory_penalty', -0.1):+.0%})"
+    if code == REASON_VOLATILITY:
+        return "Recent price volatility"
+    return "No urgency detected"
+
+
 def score_itinerary(
     *,
     price: PriceBreakdown,
@@ -50,16 +117,27 @@ def score_itinerary(
     days_to_event: int,
     distance_km: float = 0.0,
     co2_kg_pp: float = 0.0,
+) -> float:
+    return _score_total(price.total, budget_pp, buy_now, days_to_event, distance_km, co2_kg_pp)
+
+
+def _score_total(
+    total: float,
+    budget_pp: float,
+    buy_now: bool,
+    days_to_event: int,
+    distance_km: float,
+    co2_kg_pp: float,
 ) -> float:
     if budget_pp <= 0:
         affordability_score = 0.2
     else:
-        budget_gap = budget_pp - price.total
+        budget_gap = budget_pp - total
         if budget_gap >= 0:
-            affordability_score = min(1.0, 0.6 + 0.4 * min(budget_pp / max(price.total, 1.0), 1.0))
+            affordability_score = min(1.0, 0.6 + 0.4 * min(budget_pp / max(total, 1.0), 1.0))
         else:
             overshoot = abs(budget_gap)
-            affordability_score = max(0.2, 0.6 - min(overshoot / max(price.total, 1.0), 0.5))
+            affordability_score = max(0.2, 0.6 - min(overshoot / max(total, 1.0), 0.5))
 
     urgency_bonus = 0.15 if buy_now else 0.0
     timeline_bonus = max(0.0, 0.15 - min(days_to_event / 40.0, 0.15))
@@ -72,3 +150,38 @@ def score_itinerary(
 
     score = max(0.0, min(1.0, affordability_score + urgency_bonus + timeline_bonus - distance_penalty - co2_penalty))
     return round(score, 4)
+
+
+def score_batch(
+    *,
+    totals: np.ndarray,
+    budget_pp: np.ndarray | float,
+    buy_now: np.ndarray,
+    days_to_event: np.ndarray,
+    distance_km: np.ndarray | float = 0.0,
+    co2_kg_pp: np.ndarray | float = 0.0,
+) -> np.ndarray:
+    """Score many itineraries at once.
+
+    Performs the same float operations in the same order as ``_score_total``,
+    which stays the reference, so every score is bit-for-bit identical to the
+    scalar path.
+    """
+    total = np.asarray(totals, dtype=float)
+    budget = np.asarray(budget_pp, dtype=float)
+    budget_gap = budget - total
+    floor_total = np.maximum(total, 1.0)
+    within = np.minimum(1.0, 0.6 + 0.4 * np.minimum(budget / floor_total, 1.0))
+    over = np.maximum(0.2, 0.6 - np.minimum(np.abs(budget_gap) / floor_total, 0.5))
+    affordability_score = np.where(budget <= 0, 0.2, np.where(budget_gap >= 0, within, over))
+
+    urgency_bonus = np.where(np.asarray(buy_now, dtype=bool), 0.15, 0.0)
+    timeline_bonus = np.maximum(0.0, 0.15 - np.minimum(np.asarray(days_to_event, dtype=float) / 40.0, 0.15))
+    distance_penalty = np.minimum(0.10, (np.asarray(distance_km, dtype=float) / 500.0) * 0.01)
+    co2_penalty = np.minimum(0.10, (np.asarray(co2_kg_pp, dtype=float) / 10.0) * 0.01)
+
+    score = np.clip(affordability_score + urgency_bonus + timeline_bonus - distance_penalty - co2_penalty, 0.0, 1.0)
+    # np.round scales by 10**4 and can disagree with round() in the last bit.
+    return np.fromiter((round(value, 4) for value in score.tolist()), dtype=float, count=score.size).reshape(
+        score.shape
+    )
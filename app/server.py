@@ -2,18 +2,29 @@
 from __future__ import annotations
 
 import os
+from contextlib import asynccontextmanager
 
 try:  # pragma: no cover - optional dependency
     from fastapi import FastAPI, HTTPException, Query
-    from fastapi.responses import HTMLResponse, PlainTextResponse
+    from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
 except ImportError as exc:  # pragma: no cover - allow optional install
     raise SystemExit("fastapi must be installed to run app.server") from exc
 
-from app.services.planner import Planner
+from app.services.planner import Planner, PlannerResult, PlanQuery
 from app.utils.share import get_share_manager, generate_html_view
 from app.utils.metrics import export_prometheus
+from app.utils.serialization import dumps
+from app.utils.transport import close_transport_pool
 
-app = FastAPI(title="Weekend Planner")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Drop pooled keep-alive connections cleanly on shutdown.
+    await close_transport_pool()
+
+
+app = FastAPI(title="Weekend Planner", lifespan=lifespan)
 
 def _get_offline_mode() -> bool:
     """Check if offline mode is enabled via environment variable."""
@@ -22,46 +33,158 @@ def _get_offline_mode() -> bool:
 
 planner = Planner(offline_mode=_get_offline_mode())
 
+MAX_BATCH_QUERIES = 500
+
+
+class JSONBytesResponse(Response):
+    """JSON response encoded by app.utils.serialization instead of FastAPI's generic encoder."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def _serialise_itinerary(itinerary: dict) -> dict:
+    # The PriceBreakdown stays as is; the encoder renders it without a dict copy.
+    return {**itinerary, "total_pp": itinerary["price"].total}
+
+
+def _serialise_result(result: PlannerResult) -> dict:
+    return {
+        "itineraries": [_serialise_itinerary(itinerary) for itinerary in result.itineraries],
+        "dining": result.dining,
+        "fx_used": result.fx_used,
+        "partial": result.partial,
+        "cut_off": result.cut_off,
+    }
+
 
 @app.get("/healthz")
 def healthz() -> dict[str, str]:
     return {"status": "ok"}
 
 
-@app.get("/plan")
-async def plan(date: str = Query(...), budget: float = Query(...), with_dining: bool = Query(False)) -> dict:
+@app.get("/plan", response_class=JSONBytesResponse)
+async def plan(
+    date: str = Query(...),
+    budget: float = Query(...),
+    with_dining: bool = Query(False),
+    limit: int | None = Query(None, ge=1),
+    deadline_ms: int | None = Query(None, ge=1),
+) -> JSONBytesResponse:
     if budget <= 0:
         raise HTTPException(status_code=400, detail="budget must be positive")
-    result = await planner.plan(date=date, budget_pp=budget, with_dining=with_dining)
-    return {
-        "itineraries": [
-            {
-                **{k: v for k, v in itinerary.items() if k != "price"},
-                "price": itinerary["price"].__dict__,
-                "total_pp": itinerary["price"].total,
+    result = await planner.plan(
+        date=date, budget_pp=budget, with_dining=with_dining, limit=limit, deadline_ms=deadline_ms
+    )
+    return JSONBytesResponse(_serialise_result(result))
+
+
+@app.get("/plan/stream")
+async def plan_stream(
+    date: str = Query(...),
+    budget: float = Query(...),
+    with_dining: bool = Query(False),
+    top_n: int = Query(3, ge=1, le=50),
+) -> StreamingResponse:
+    """
+    Stream ranked itineraries as Server-Sent Events.
+
+    Emits a ``snapshot`` event with the current top ``top_n`` after every
+    vendor page is priced, then a single ``complete`` event with dining.
+    """
+    if budget <= 0:
+        raise HTTPException(status_code=400, detail="budget must be positive")
+
+    async def events():
+        async for snapshot in planner.plan_stream(
+            date=date, budget_pp=budget, with_dining=with_dining, top_n=top_n
+        ):
+            payload = {
+                "itineraries": [_serialise_itinerary(itinerary) for itinerary in snapshot.itineraries],
+                "pending_sources": snapshot.pending_sources,
+                "events_seen": snapshot.events_seen,
+                "dining": snapshot.dining,
+                "fx_used": snapshot.fx_used,
             }
-            for itinerary in result.itineraries
-        ],
-        "dining": result.dining,
-        "fx_used": result.fx_used,
-    }
+            event_name = "complete" if snapshot.complete else "snapshot"
+            yield b"event: %s\ndata: %s\n\n" % (event_name.encode(), dumps(payload))
 
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
-@app.get("/plan/debug")
-async def plan_debug(date: str = Query(...), budget: float = Query(...), with_dining: bool = Query(False)) -> dict:
-    base_response = await plan(date=date, budget=budget, with_dining=with_dining)
+
+@app.post("/plan/batch", response_class=JSONBytesResponse)
+async def plan_batch(batch: dict) -> JSONBytesResponse:
+    """
+    Plan several (date, budget, with_dining) queries in one call.
+
+    Request body: ``{"queries": [{"date": "...", "budget": 30, "with_dining": false, "limit": 3}, ...]}``
+    where ``with_dining`` and ``limit`` are optional.
+    Each distinct date is fetched and priced once; results keep the query order.
+    """
+    raw_queries = batch.get("queries")
+    if not isinstance(raw_queries, list) or not raw_queries:
+        raise HTTPException(status_code=400, detail="queries must be a non-empty list")
+    if len(raw_queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(status_code=400, detail=f"at most {MAX_BATCH_QUERIES} queries per batch")
+
+    queries = []
+    for raw in raw_queries:
+        try:
+            query = PlanQuery(
+                date=str(raw["date"]),
+                budget_pp=float(raw["budget"]),
+                with_dining=bool(raw.get("with_dining", False)),
+                limit=int(raw["limit"]) if raw.get("limit") is not None else None,
+            )
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise HTTPException(status_code=400, detail="each query needs a date and a numeric budget")
+        if query.budget_pp <= 0:
+            raise HTTPException(status_code=400, detail="budget must be positive")
+        if query.limit is not None and query.limit < 1:
+            raise HTTPException(status_code=400, detail="limit must be at least 1")
+        queries.append(query)
+
+    results = await planner.plan_many(queries)
+    return JSONBytesResponse({
+        "results": [
+            {
+                "date": query.date,
+                "budget": query.budget_pp,
+                "with_dining": query.with_dining,
+                **_serialise_result(result),
+            }
+            for query, result in zip(queries, results)
+        ]
+    })
+
+
+@app.get("/plan/debug", response_class=JSONBytesResponse)
+async def plan_debug(
+    date: str = Query(...),
+    budget: float = Query(...),
+    with_dining: bool = Query(False),
+    limit: int | None = Query(None, ge=1),
+    deadline_ms: int | None = Query(None, ge=1),
+) -> JSONBytesResponse:
+    if budget <= 0:
+        raise HTTPException(status_code=400, detail="budget must be positive")
+    result = await planner.plan(
+        date=date, budget_pp=budget, with_dining=with_dining, limit=limit, deadline_ms=deadline_ms
+    )
+    base_response = _serialise_result(result)
     for itinerary in base_response["itineraries"]:
-        itinerary["breakdown"] = itinerary["price"]["components"]
-    
-    # Get fresh planner result to access metadata
-    result = await planner.plan(date=date, budget_pp=budget, with_dining=with_dining)
+        itinerary["breakdown"] = itinerary["price"].components
     
     base_response["debug"] = {
         "offline": result.offline_mode,
         "fx_source": result.fx_source,
+        "fx_version": result.fx_version,
+        "stage_timings_ms": result.stage_timings_ms,
     }
     base_response["meta"] = {"cache": {"fx": "disk"}}
-    return base_response
+    return JSONBytesResponse(base_response)
 
 
 @app.post("/share")
@@ -102,8 +225,11 @@ def metrics() -> str:
     
     Exposes operational metrics including:
     - fx_live_latency_ms: FX API call latency
-    - cache_hit_ratio: Cache hit ratio
+    - cache_hit_ratio: Cache hit ratio (FX), plus one labelled series per
+      in-process cache, e.g. cache_hit_ratio{cache="plan"}
     - vendor_a_latency_ms: Vendor A API call latency
     - planning_duration_ms: Planning operation duration
+    - plan_singleflight_leaders_total / plan_singleflight_coalesced_total:
+      /plan computations started vs. requests that joined an in-flight one
     """
     return export_prometheus()
@@ -0,0 +1,67 @@
+"""Minimal dependency-graph executor for planner stages."""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+
+from app.utils.metrics import record_latency
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    fn: Callable[..., Any]
+    depends_on: Tuple[str, ...] = ()
+
+
+class StageGraph:
+    """
+    Run async or sync stages as soon as the stages they depend on have finished.
+
+    Each stage receives its dependencies' results as keyword arguments named
+    after those stages. Dependencies must be added before their dependants, so
+    the graph is acyclic by construction. Stage durations are recorded as
+    ``<graph>_stage_<name>_ms`` latencies and kept in :attr:`timings_ms`.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._stages: Dict[str, Stage] = {}
+        self.timings_ms: Dict[str, float] = {}
+
+    def add(self, name: str, fn: Callable[..., Any], *, depends_on: Tuple[str, ...] = ()) -> None:
+        if name in self._stages:
+            raise ValueError(f"Stage {name!r} already defined")
+        missing = [dependency for dependency in depends_on if dependency not in self._stages]
+        if missing:
+            raise ValueError(f"Stage {name!r} depends on unknown stages {missing}")
+        self._stages[name] = Stage(name=name, fn=fn, depends_on=tuple(depends_on))
+
+    async def run(self) -> Dict[str, Any]:
+        """Execute every stage and return their results keyed by stage name."""
+        tasks: Dict[str, asyncio.Task] = {}
+        for stage in self._stages.values():
+            dependencies = [tasks[dependency] for dependency in stage.depends_on]
+            tasks[stage.name] = asyncio.ensure_future(self._run_stage(stage, dependencies))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def _run_stage(self, stage: Stage, dependencies: list) -> Any:
+        results = await asyncio.gather(*dependencies) if dependencies else []
+        start_time = time.time()
+        result = stage.fn(**dict(zip(stage.depends_on, results)))
+        if inspect.isawaitable(result):
+            result = await result
+        duration_ms = (time.time() - start_time) * 1000
+        self.timings_ms[stage.name] = duration_ms
+        record_latency(f"{self.name}_stage_{stage.name}_ms", duration_ms)
+        return result
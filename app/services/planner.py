@@ -2,139 +2,633 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import logging
 import os
+import sqlite3
 import time
-from dataclasses import dataclass
-from typing import Dict, List
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Callable, ClassVar, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
 
 from app.config import Settings, load_settings
 from app.connectors.dining import DiningConnector
-from app.connectors.fx import FXConnector
+from app.connectors.fx import FXConnector, FXSnapshot
 from app.connectors.ticket_vendor_a import TicketVendorAConnector
 from app.connectors.ticket_vendor_b import TicketVendorBConnector
 from app.connectors.travel import get_travel_info
-from app.normalizers.price import calculate_price
-from app.ranking.scorer import buy_now_heuristic, days_until, score_itinerary
+from app.normalizers.event import Event, RecordMapping
+from app.normalizers.price import PriceBreakdown, PriceTable, price_events
+from app.ranking.scorer import buy_now_batch, buy_now_reason, days_until_batch, score_batch
+from app.services.pipeline import StageGraph
+from app.utils.cache import LRUCache
+from app.utils.catalogue import CATALOGUE_FILENAME, EventCatalogue
+from app.utils.deadline import Deadline
+from app.utils.health import HEALTH_FILENAME, HealthRegistry
+from app.utils.http_cache import HTTP_CACHE_DIRNAME, HttpCache, build_http_cache
 from app.utils.profile import get_profile_manager
 from app.utils.metrics import record_latency
+from app.utils.singleflight import SingleFlight
+from app.utils.timestamps import parse_epoch
+from app.utils.transport import get_transport_pool
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, eq=False)
+class Itinerary(RecordMapping):
+    """A ranked event; reads like the itinerary dicts it replaces."""
+
+    provider: str
+    title: str | None
+    start_ts: str | None
+    venue: str | None
+    city: str | None
+    url: str | None
+    price: PriceBreakdown
+    score: float
+    buy_now: bool
+    buy_reason: str
+    distance_km: float
+    co2_kg_pp: float
+
+    _keys: ClassVar[Tuple[str, ...]] = (
+        "provider",
+        "title",
+        "start_ts",
+        "venue",
+        "city",
+        "url",
+        "price",
+        "score",
+        "buy_now",
+        "buy_reason",
+        "distance_km",
+        "co2_kg_pp",
+    )
 
 
 @dataclass
 class PlannerResult:
-    itineraries: List[Dict]
+    itineraries: List[Itinerary]
     dining: List[Dict]
     fx_used: Dict[str, float]
     fx_source: str = "live"
     offline_mode: bool = False
+    fx_version: int = 0
+    stage_timings_ms: Dict[str, float] = field(default_factory=dict)
+    partial: bool = False
+    cut_off: List[str] = field(default_factory=list)
+
+
+@dataclass
+class PlanSnapshot:
+    """Incremental top-N view emitted by :meth:`Planner.plan_stream`."""
+
+    itineraries: List[Itinerary]
+    pending_sources: List[str]
+    events_seen: int
+    dining: List[Dict] = field(default_factory=list)
+    fx_used: Dict[str, float] = field(default_factory=dict)
+    complete: bool = False
+
+
+@dataclass(frozen=True)
+class PlanQuery:
+    date: str
+    budget_pp: float
+    with_dining: bool = False
+    limit: int | None = None
+
+
+@dataclass(slots=True)
+class _Candidate:
+    """Budget-independent planning data for a single event.
+
+    ``total`` is row ``row`` of the batch-priced ``prices`` table; the
+    ``price`` breakdown view is only built for events that reach a result.
+    """
+
+    event: Event
+    total: float
+    days_to_event: int
+    buy_now: bool
+    buy_reason: str
+    distance_km: float
+    co2_kg_pp: float
+    prices: PriceTable
+    row: int
+    price: PriceBreakdown | None = None
+
+
+@dataclass
+class _Prepared:
+    """Everything fetched and derived for one date, reusable across budgets."""
+
+    candidates: List[_Candidate]
+    fx: FXSnapshot
+    dining: List[Dict]
+    stage_timings_ms: Dict[str, float] = field(default_factory=dict)
 
 
 class Planner:
-    def __init__(self, settings: Settings | None = None, offline_mode: bool = False) -> None:
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        offline_mode: bool = False,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
         self.settings = settings or load_settings()
+        # Wall clock in epoch seconds; read once per plan for days-to-event.
+        self.clock = clock
         # Override with explicit offline_mode if provided
         if offline_mode:
             self.settings.app.offline_mode = True
-        self.fx = FXConnector(self.settings.fx, offline_mode=self.settings.app.offline_mode)
+        get_transport_pool().configure(self.settings.transport)
+        self.http_cache = self._open_http_cache()
+        self.fx = FXConnector(
+            self.settings.fx, offline_mode=self.settings.app.offline_mode, http_cache=self.http_cache
+        )
+        self.catalogue = self._open_catalogue()
+        self.health = self._open_health_registry()
         vendor_a_token = os.getenv("VENDOR_A_TOKEN")
         vendor_b_token = os.getenv("VENDOR_B_TOKEN")
         dining_token = os.getenv("DINING_TOKEN")
         self.vendor_a = TicketVendorAConnector(
-            self.settings.connector("ticket_vendor_a"), vendor_a_token, offline_mode=self.settings.app.offline_mode
+            self.settings.connector("ticket_vendor_a"),
+            vendor_a_token,
+            offline_mode=self.settings.app.offline_mode,
+            catalogue=self.catalogue,
+            health=self.health,
+            http_cache=self.http_cache,
         )
         self.vendor_b = TicketVendorBConnector(
-            self.settings.connector("ticket_vendor_b"), vendor_b_token, offline_mode=self.settings.app.offline_mode
+            self.settings.connector("ticket_vendor_b"),
+            vendor_b_token,
+            offline_mode=self.settings.app.offline_mode,
+            catalogue=self.catalogue,
+            health=self.health,
+            http_cache=self.http_cache,
         )
         self.dining = DiningConnector(
-            self.settings.connector("dining"), dining_token, offline_mode=self.settings.app.offline_mode
+            self.settings.connector("dining"),
+            dining_token,
+            offline_mode=self.settings.app.offline_mode,
+            health=self.health,
+            http_cache=self.http_cache,
+        )
+        self._plan_flight = SingleFlight("plan")
+        # Ranked results per exact budget, and the priced events behind them so
+        # a new budget for a known date only needs a re-score.
+        self._plan_cache = LRUCache("plan", max_weight=self.settings.app.plan_cache_max_events)
+        self._priced_cache = LRUCache("priced_events", max_weight=self.settings.app.plan_cache_max_events)
+
+    def _open_catalogue(self) -> EventCatalogue | None:
+        """Open the local event catalogue and drop dates past retention; None if disabled or unusable."""
+        app = self.settings.app
+        if not app.event_catalogue:
+            return None
+        try:
+            catalogue = EventCatalogue(Path(app.cache_dir).expanduser() / CATALOGUE_FILENAME)
+            catalogue.compact(keep_days=app.catalogue_retention_days)
+        except (OSError, sqlite3.Error) as exc:
+            LOGGER.warning("Event catalogue unavailable (%s); falling back to bundled datasets", exc)
+            return None
+        return catalogue
+
+    def _open_health_registry(self) -> HealthRegistry | None:
+        """Open the upstream health state shared with other workers; None if disabled or unusable."""
+        app = self.settings.app
+        if not app.shared_health:
+            return None
+        try:
+            return HealthRegistry(Path(app.cache_dir).expanduser() / HEALTH_FILENAME)
+        except (OSError, sqlite3.Error) as exc:
+            LOGGER.warning("Shared health registry unavailable (%s); breakers stay per-process", exc)
+            return None
+
+    def _open_http_cache(self) -> HttpCache | None:
+        """Build the HTTP response cache shared by the connectors; None if disabled or unusable."""
+        app = self.settings.app
+        try:
+            return build_http_cache(
+                app.http_cache,
+                directory=Path(app.cache_dir).expanduser() / HTTP_CACHE_DIRNAME,
+                max_bytes=app.http_cache_max_mb * 1024 * 1024,
+            )
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("HTTP cache unavailable (%s); every request goes to the network", exc)
+            return None
+
+    async def plan(
+        self,
+        *,
+        date: str,
+        budget_pp: float,
+        with_dining: bool = False,
+        limit: int | None = None,
+        deadline_ms: float | None = None,
+    ) -> PlannerResult:
+        """Plan a single query.
+
+        Concurrent calls with the same normalised query share one computation
+        and receive the same ``PlannerResult``, which callers must not mutate.
+        With ``deadline_ms`` the plan answers in time with whatever it has
+        ranked, flagging ``partial`` and listing the sources that were cut off.
+        """
+        key = (date.strip(), round(float(budget_pp), 2), bool(with_dining), limit, deadline_ms)
+        return await self._plan_flight.do(
+            key,
+            lambda: self._plan(
+                date=date, budget_pp=budget_pp, with_dining=with_dining, limit=limit, deadline_ms=deadline_ms
+            ),
+        )
+
+    async def _plan(
+        self, *, date: str, budget_pp: float, with_dining: bool, limit: int | None, deadline_ms: float | None
+    ) -> PlannerResult:
+        start_time = time.time()
+        deadline = Deadline.from_ms(deadline_ms)
+
+        home_city = self._home_city()
+        ttl = self._cache_ttl(with_dining)
+        # Scores and ranking depend on the exact budget; other budgets re-score
+        # the cached priced events instead.
+        plan_key = (*self._date_key(date, with_dining, home_city), round(float(budget_pp), 2), limit)
+        result = self._plan_cache.get(plan_key) if ttl else None
+
+        if result is None:
+            prepared = await self._prepared(date, with_dining=with_dining, home_city=home_city, deadline=deadline)
+            rank_start = time.time()
+            itineraries = self._rank(prepared.candidates, budget_pp, limit=limit)
+            rank_ms = (time.time() - rank_start) * 1000
+            record_latency("plan_stage_rank_ms", rank_ms)
+            result = self._result(itineraries, prepared, deadline=deadline)
+            result.stage_timings_ms["rank"] = rank_ms
+            if not result.partial:
+                self._plan_cache.set(plan_key, result, ttl_seconds=ttl, weight=max(len(itineraries), 1))
+
+        planning_duration_ms = (time.time() - start_time) * 1000
+        record_latency("planning_duration_ms", planning_duration_ms)
+
+        return result
+
+    async def plan_many(
+        self, queries: Iterable[PlanQuery], *, deadline_ms: float | None = None
+    ) -> List[PlannerResult]:
+        """Plan several queries, fetching and pricing each distinct date once.
+
+        Results are returned in the same order as ``queries``. Vendor, FX and
+        dining traffic scales with the number of distinct dates; each extra
+        budget only costs a re-score of the already priced events. A
+        ``deadline_ms`` applies to the whole batch.
+        """
+        start_time = time.time()
+        deadline = Deadline.from_ms(deadline_ms)
+        queries = list(queries)
+
+        indexes_by_date: Dict[str, List[int]] = {}
+        for index, query in enumerate(queries):
+            indexes_by_date.setdefault(query.date, []).append(index)
+
+        home_city = self._home_city()
+        prepared_by_date = await asyncio.gather(
+            *(
+                self._prepared(
+                    date,
+                    with_dining=any(queries[i].with_dining for i in indexes),
+                    home_city=home_city,
+                    deadline=deadline,
+                )
+                for date, indexes in indexes_by_date.items()
+            )
         )
 
-    async def plan(self, *, date: str, budget_pp: float, with_dining: bool = False) -> PlannerResult:
+        results: List[PlannerResult | None] = [None] * len(queries)
+        for indexes, prepared in zip(indexes_by_date.values(), prepared_by_date):
+            for index in indexes:
+                query = queries[index]
+                results[index] = self._result(
+                    self._rank(prepared.candidates, query.budget_pp, limit=query.limit),
+                    prepared,
+                    with_dining=query.with_dining,
+                    deadline=deadline,
+                )
+
+        batch_duration_ms = (time.time() - start_time) * 1000
+        record_latency("batch_planning_duration_ms", batch_duration_ms)
+
+        return results  # type: ignore[return-value]
+
+    async def plan_stream(
+        self, *, date: str, budget_pp: float, with_dining: bool = False, top_n: int = 3
+    ) -> AsyncIterator[PlanSnapshot]:
+        """Yield the current top ``top_n`` itineraries as each vendor page is priced.
+
+        Vendor pages are consumed in arrival order, so the first snapshot only
+        waits for the fastest page. The last snapshot has ``complete=True`` and
+        carries the dining options.
+        """
         start_time = time.time()
-        
-        # Fetch all data concurrently
-        vendor_a_task = self.vendor_a.fetch(date=date)
-        vendor_b_task = self.vendor_b.fetch(date=date)
-        fx_rates_task = self.fx.get_rates()
-        
-        # Gather the vendor results and FX rates
-        vendor_a_events, vendor_b_events, rates = await asyncio.gather(
-            vendor_a_task, vendor_b_task, fx_rates_task
+        sources = {"vendor_a": self.vendor_a, "vendor_b": self.vendor_b}
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def _produce(source: str, connector) -> None:
+            try:
+                async for page in connector.fetch_pages(date=date):
+                    await queue.put((source, page, None))
+            except Exception as exc:  # noqa: BLE001 - re-raised by the consumer
+                await queue.put((source, None, exc))
+            else:
+                await queue.put((source, None, None))
+
+        fx_task = asyncio.ensure_future(self.fx.snapshot())
+        dining_task = asyncio.ensure_future(self.dining.fetch(date=date)) if with_dining else None
+        producers = [asyncio.ensure_future(_produce(name, connector)) for name, connector in sources.items()]
+
+        try:
+            home_city = self._home_city()
+            now = self.clock()
+            travel_cache: Dict[str, Tuple[float, float]] = {}
+            pending = set(sources)
+            top: List[Tuple[float, int, _Candidate]] = []
+            events_seen = 0
+            first_snapshot = True
+            while pending:
+                # Drain everything that has already arrived so one snapshot
+                # covers simultaneous pages and end-of-source markers.
+                arrived = [await queue.get()]
+                while not queue.empty():
+                    arrived.append(queue.get_nowait())
+
+                pages = []
+                for source, page, error in arrived:
+                    if error is not None:
+                        raise error
+                    if page is None:
+                        pending.discard(source)
+                    else:
+                        pages.append(page)
+                if not pages:
+                    continue
+
+                fx = await fx_task
+                for page in pages:
+                    candidates = self._candidates(page, fx, home_city, travel_cache, now)
+                    for candidate, score in zip(candidates, self._batch_scores(candidates, budget_pp)):
+                        # Negated sequence keeps the earliest arrival on score ties.
+                        entry = (score, -events_seen, candidate)
+                        events_seen += 1
+                        if len(top) < top_n:
+                            heapq.heappush(top, entry)
+                        elif entry[:2] > top[0][:2]:
+                            heapq.heapreplace(top, entry)
+
+                if first_snapshot:
+                    record_latency("plan_stream_first_snapshot_ms", (time.time() - start_time) * 1000)
+                    first_snapshot = False
+                yield PlanSnapshot(
+                    itineraries=self._ranked(top),
+                    pending_sources=sorted(pending),
+                    events_seen=events_seen,
+                    fx_used=dict(fx.rates),
+                )
+
+            fx = await fx_task
+            dining_options = await dining_task if dining_task is not None else []
+            record_latency("planning_duration_ms", (time.time() - start_time) * 1000)
+            yield PlanSnapshot(
+                itineraries=self._ranked(top),
+                pending_sources=[],
+                events_seen=events_seen,
+                dining=dining_options,
+                fx_used=dict(fx.rates),
+                complete=True,
+            )
+        finally:
+            for task in (*producers, fx_task, dining_task):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def _prepared(
+        self, date: str, *, with_dining: bool, home_city: str, deadline: Optional[Deadline] = None
+    ) -> _Prepared:
+        """Return the cached preparation for ``date`` or fetch it afresh."""
+        ttl = self._cache_ttl(with_dining)
+        key = self._date_key(date, with_dining, home_city)
+        prepared = self._priced_cache.get(key) if ttl else None
+        if prepared is None:
+            prepared = await self._prepare_date(date, with_dining=with_dining, home_city=home_city, deadline=deadline)
+            if deadline is None or not deadline.cut_off:
+                self._priced_cache.set(key, prepared, ttl_seconds=ttl, weight=max(len(prepared.candidates), 1))
+        return prepared
+
+    async def _prepare_date(
+        self, date: str, *, with_dining: bool, home_city: str, deadline: Optional[Deadline] = None
+    ) -> _Prepared:
+        """Fetch every event for ``date`` and derive its budget-independent data.
+
+        Stages run as a dependency graph: both vendors, FX and dining start at
+        once, and each later stage starts as soon as its own inputs are ready,
+        so dining no longer adds its latency after the vendors.
+        """
+        now = self.clock()
+        graph = StageGraph("plan")
+        graph.add("vendor_a", lambda: self.vendor_a.fetch(date=date, deadline=deadline))
+        graph.add("vendor_b", lambda: self.vendor_b.fetch(date=date, deadline=deadline))
+        graph.add("fx", lambda: self.fx.snapshot(deadline=deadline))
+        if with_dining:
+            graph.add("dining", lambda: self.dining.fetch(date=date, deadline=deadline))
+        graph.add("normalize", lambda vendor_a, vendor_b: [*vendor_a, *vendor_b], depends_on=("vendor_a", "vendor_b"))
+        graph.add(
+            "travel",
+            lambda normalize: self._travel_table(home_city, {event.get("city") for event in normalize}),
+            depends_on=("normalize",),
+        )
+        graph.add(
+            "enrich",
+            lambda normalize, fx, travel: self._candidates(normalize, fx, home_city, travel, now),
+            depends_on=("normalize", "fx", "travel"),
+        )
+        results = await graph.run()
+
+        return _Prepared(
+            candidates=results["enrich"],
+            fx=results["fx"],
+            dining=results.get("dining", []),
+            stage_timings_ms=dict(graph.timings_ms),
         )
-        
-        raw_events = []
-        raw_events.extend(vendor_a_events)
-        raw_events.extend(vendor_b_events)
 
-        target_currency = self.settings.app.currency
-        
+    def _date_key(self, date: str, with_dining: bool, home_city: str) -> Tuple:
+        return (date.strip(), bool(with_dining), home_city, self.settings.app.currency, self.settings.app.offline_mode)
+
+    def _cache_ttl(self, with_dining: bool) -> float:
+        """Shortest upstream TTL behind a plan; 0 disables caching."""
+        names = ["ticket_vendor_a", "ticket_vendor_b"] + (["dining"] if with_dining else [])
+        ttls = [self.settings.connector(name).cache_ttl_seconds for name in names]
+        if any(not ttl or ttl <= 0 for ttl in ttls):
+            return 0
+        return min(ttls)
+
+    def _home_city(self) -> str:
         # Get user's home city from profile
         profile_mgr = get_profile_manager()
         profile = profile_mgr.load()
-        home_city = profile.home_city
-
-        itineraries: List[Dict] = []
-        for event in raw_events:
-            price_breakdown = await calculate_price(event, fx=self.fx, target_currency=target_currency)
-            event_days_to = days_until(event["start_ts"])
-            buy_now, reason = buy_now_heuristic(
-                inventory_hint=event.get("inventory_hint", "unknown"),
-                days_to_event=event_days_to,
-                price_variance=0.0,
-                settings={
-                    "price_drop_days_threshold": self.settings.app.price_drop_days_threshold,
-                    "price_drop_low_inventory_bonus": self.settings.app.price_drop_low_inventory_bonus,
-                    "price_drop_high_inventory_penalty": self.settings.app.price_drop_high_inventory_penalty,
-                },
-            )
-            
-            # Calculate travel info
-            event_city = event.get("city")
+        return profile.home_city
+
+    def _candidates(
+        self,
+        events: List[Event],
+        fx: FXSnapshot,
+        home_city: str,
+        travel_cache: Dict[str, Tuple[float, float]],
+        now: float,
+    ) -> List[_Candidate]:
+        """Price and enrich a batch of events, deciding buy-now for all of them in one pass.
+
+        Days to each event are counted from ``now``, read once per plan from
+        the planner's clock.
+        """
+        events = [Event.coerce(event) for event in events]
+        prices = price_events(events, fx=fx, target_currency=self.settings.app.currency)
+        settings = self._buy_now_settings()
+        days = days_until_batch(
+            np.fromiter(
+                (event.start_epoch if event.start_epoch is not None else parse_epoch(event.start_ts) for event in events),
+                dtype=np.int64,
+                count=len(events),
+            ),
+            now,
+        ).tolist()
+        buy_now, reasons = buy_now_batch(
+            inventory_codes=np.fromiter((event.inventory for event in events), dtype=np.int8, count=len(events)),
+            days_to_event=np.array(days, dtype=np.int64),
+            price_variance=0.0,
+            settings=settings,
+        )
+        reason_text = {code: buy_now_reason(code, settings) for code in set(reasons.tolist())}
+
+        candidates = []
+        for row, (event, total, event_days_to, buy, code) in enumerate(
+            zip(events, prices.totals().tolist(), days, buy_now.tolist(), reasons.tolist())
+        ):
+            # Calculate travel info, once per city
+            event_city = event.city
             distance_km = 0.0
             co2_kg_pp = 0.0
             if event_city and home_city:
-                travel_info = get_travel_info(home_city, event_city)
-                if travel_info:
-                    distance_km = travel_info["distance_km"]
-                    co2_kg_pp = travel_info["co2_kg_pp"]
-            
-            score = score_itinerary(
-                price=price_breakdown,
-                budget_pp=budget_pp,
-                buy_now=buy_now,
-                days_to_event=event_days_to,
-                distance_km=distance_km,
-                co2_kg_pp=co2_kg_pp,
-            )
-            itineraries.append(
-                {
-                    "provider": event["provider"],
-                    "title": event["title"],
-                    "start_ts": event["start_ts"],
-                    "venue": event["venue"],
-                    "city": event_city,
-                    "url": event["url"],
-                    "price": price_breakdown,
-                    "score": score,
-                    "buy_now": buy_now,
-                    "buy_reason": reason,
-                    "distance_km": distance_km,
-                    "co2_kg_pp": co2_kg_pp,
-                }
+                if event_city not in travel_cache:
+                    travel_cache.update(self._travel_table(home_city, {event_city}))
+                distance_km, co2_kg_pp = travel_cache[event_city]
+
+            candidates.append(
+                _Candidate(
+                    event=event,
+                    total=total,
+                    days_to_event=event_days_to,
+                    buy_now=buy,
+                    buy_reason=reason_text[code],
+                    distance_km=distance_km,
+                    co2_kg_pp=co2_kg_pp,
+                    prices=prices,
+                    row=row,
+                )
             )
+        return candidates
 
-        itineraries.sort(key=lambda item: item["score"], reverse=True)
+    def _buy_now_settings(self) -> Dict:
+        return {
+            "price_drop_days_threshold": self.settings.app.price_drop_days_threshold,
+            "price_drop_low_inventory_bonus": self.settings.app.price_drop_low_inventory_bonus,
+            "price_drop_high_inventory_penalty": self.settings.app.price_drop_high_inventory_penalty,
+        }
 
-        dining_options: List[Dict] = []
-        if with_dining:
-            dining_options = await self.dining.fetch(date=date)
+    @staticmethod
+    def _travel_table(home_city: str, cities) -> Dict[str, Tuple[float, float]]:
+        """Distance and CO2 per person from ``home_city`` to each city."""
+        table: Dict[str, Tuple[float, float]] = {}
+        for city in cities:
+            if not city or not home_city:
+                continue
+            travel_info = get_travel_info(home_city, city)
+            table[city] = (travel_info["distance_km"], travel_info["co2_kg_pp"]) if travel_info else (0.0, 0.0)
+        return table
 
-        planning_duration_ms = (time.time() - start_time) * 1000
-        record_latency("planning_duration_ms", planning_duration_ms)
+    @staticmethod
+    def _breakdown(candidate: _Candidate) -> PriceBreakdown:
+        if candidate.price is None:
+            candidate.price = candidate.prices.breakdown(candidate.row)
+        return candidate.price
+
+    @staticmethod
+    def _batch_scores(candidates: List[_Candidate], budget_pp: float) -> List[float]:
+        return score_batch(
+            totals=np.array([candidate.total for candidate in candidates], dtype=float),
+            budget_pp=budget_pp,
+            buy_now=np.array([candidate.buy_now for candidate in candidates], dtype=bool),
+            days_to_event=np.array([candidate.days_to_event for candidate in candidates], dtype=np.int64),
+            distance_km=np.array([candidate.distance_km for candidate in candidates], dtype=float),
+            co2_kg_pp=np.array([candidate.co2_kg_pp for candidate in candidates], dtype=float),
+        ).tolist()
+
+    @staticmethod
+    def _itinerary(candidate: _Candidate, score: float) -> Itinerary:
+        event = candidate.event
+        return Itinerary(
+            provider=event.provider,
+            title=event.title,
+            start_ts=event.start_ts,
+            venue=event.venue,
+            city=event.city,
+            url=event.url,
+            price=Planner._breakdown(candidate),
+            score=score,
+            buy_now=candidate.buy_now,
+            buy_reason=candidate.buy_reason,
+            distance_km=candidate.distance_km,
+            co2_kg_pp=candidate.co2_kg_pp,
+        )
+
+    def _rank(self, candidates: List[_Candidate], budget_pp: float, *, limit: int | None = None) -> List[Itinerary]:
+        """Rank candidates by score, keeping only the best ``limit`` when given.
+
+        Scores come from one vectorised pass over the priced totals of every
+        candidate, so ``limit`` trims the result rather than the work: it only
+        saves the ``PriceBreakdown`` views and itineraries of the events it
+        drops. Pricing and buy-now are done once per date and shared by every
+        budget and limit. Ties keep the fetch order.
+        """
+        scores = self._batch_scores(candidates, budget_pp)
+        if limit is None:
+            order = sorted(range(len(candidates)), key=lambda index: scores[index], reverse=True)
+        elif limit <= 0:
+            return []
+        else:
+            order = heapq.nlargest(limit, range(len(candidates)), key=lambda index: (scores[index], -index))
+        return [self._itinerary(candidates[index], scores[index]) for index in order]
+
+    def _ranked(self, top: List[Tuple[float, int, _Candidate]]) -> List[Itinerary]:
+        return [self._itinerary(entry[2], entry[0]) for entry in sorted(top, reverse=True, key=lambda e: e[:2])]
 
+    def _result(
+        self,
+        itineraries: List[Itinerary],
+        prepared: _Prepared,
+        *,
+        with_dining: bool = True,
+        deadline: Optional[Deadline] = None,
+    ) -> PlannerResult:
+        cut_off = list(deadline.cut_off) if deadline is not None else []
         return PlannerResult(
             itineraries=itineraries,
-            dining=dining_options,
-            fx_used=rates,
-            fx_source=self.fx.get_fx_source(),
+            dining=prepared.dining if with_dining else [],
+            fx_used=dict(prepared.fx.rates),
+            fx_source=prepared.fx.source,
+            fx_version=prepared.fx.version,
             offline_mode=self.settings.app.offline_mode,
+            stage_timings_ms=dict(prepared.stage_timings_ms),
+            partial=bool(cut_off),
+            cut_off=cut_off,
         )
@@ -0,0 +1,50 @@
+"""Fixtures shared by the test modules in this directory."""
+from __future__ import annotations
+
+from typing import Callable
+
+import pytest
+
+from app.services.planner import Planner
+from app.utils.metrics import get_metrics_collector
+
+
+class FakeClock:
+    """Injectable clock that only moves when a test advances ``now``."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start and end every test with an empty metrics collector."""
+    collector = get_metrics_collector()
+    collector.reset()
+    yield
+    collector.reset()
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def make_clock() -> Callable[..., FakeClock]:
+    """Build further independent clocks, e.g. ``make_clock(now=0.0)`` or one per worker."""
+    return FakeClock
+
+
+@pytest.fixture
+def planner(tmp_path, monkeypatch) -> Planner:
+    """Offline planner backed by the bundled datasets, with its home under ``tmp_path``.
+
+    Modules that need a customised planner override this fixture and request
+    ``planner`` to start from this one.
+    """
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return Planner(offline_mode=True)
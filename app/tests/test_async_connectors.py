@@ -8,7 +8,7 @@ import pytest
 
 from app.config import ConnectorSettings, FXSettings
 from app.connectors.dining import DiningConnector
-from app.connectors.fx import FXConnector
+from app.connectors.fx import FXConnector, FXSnapshot
 from app.connectors.ticket_vendor_a import TicketVendorAConnector
 from app.connectors.ticket_vendor_b import TicketVendorBConnector
 
@@ -31,6 +31,38 @@ def test_fx_connector_async_get_rates(tmp_path, monkeypatch):
     assert rates["EUR"] == 1.0
 
 
+def test_fx_snapshot_is_versioned_and_immutable(tmp_path, monkeypatch):
+    """Snapshots are reused until the rates change, and cannot be mutated"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    settings = FXSettings(base_url="https://example.com/rates", base_currency="EUR", fallback_rates={})
+    connector = FXConnector(settings)
+    connector._write_cache({"EUR": 1.0, "USD": 1.1, "GBP": 0.86})
+
+    first = asyncio.run(connector.snapshot())
+    again = asyncio.run(connector.snapshot())
+    connector._memory_cache = {"EUR": 1.0, "USD": 1.2}
+    changed = asyncio.run(connector.snapshot())
+
+    assert again is first
+    assert (first.version, changed.version) == (1, 2)
+    assert first.rates["USD"] == 1.1
+    with pytest.raises(TypeError):
+        first.rates["USD"] = 2.0
+
+
+def test_fx_snapshot_converts_synchronously():
+    """Cross rates match the pivot through the base currency"""
+    snapshot = FXSnapshot.from_rates({"EUR": 1.0, "USD": 1.2, "GBP": 0.9})
+
+    assert snapshot.convert(12.0, "USD", "EUR") == pytest.approx(10.0)
+    assert snapshot.convert(10.0, "USD", "GBP") == pytest.approx(10.0 / 1.2 * 0.9)
+    assert snapshot.convert(5.0, "XYZ", "EUR") == 5.0
+    assert snapshot.convert(5.0, "EUR", "EUR") == 5.0
+    assert snapshot.convert_many([12.0, 9.0, 3.0], ["USD", "GBP", "XYZ"], "EUR").tolist() == pytest.approx(
+        [10.0, 10.0, 3.0]
+    )
+
+
 def test_dining_connector_async_fetch():
     """Test that DiningConnector.fetch is async and returns correct format."""
     settings = ConnectorSettings(
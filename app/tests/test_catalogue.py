@@ -0,0 +1,152 @@
+"""Tests for the SQLite event catalogue and its use by the vendor connectors."""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+from datetime import date
+
+import httpx
+
+from app.config import ConnectorSettings
+from app.connectors.ticket_vendor_a import TicketVendorAConnector
+from app.utils.catalogue import EventCatalogue
+
+EVENTS = [
+    {"id": "a-1", "title": "Late Show", "start": "2030-01-01T22:00:00Z", "city": "Paris"},
+    {"id": "a-2", "title": "Matinee", "start": "2030-01-01T14:00:00Z", "city": "Lisbon"},
+    {"id": "a-3", "title": "Next Day", "start": "2030-01-02T20:00:00Z", "city": "Paris"},
+]
+
+
+def test_catalogue_uses_wal_and_date_index(tmp_path):
+    catalogue = EventCatalogue(tmp_path / "events.sqlite3")
+    conn = sqlite3.connect(tmp_path / "events.sqlite3")
+
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "events_date_city_provider" in indexes
+    catalogue.close()
+
+
+def test_upsert_refreshes_and_queries_by_range(tmp_path):
+    catalogue = EventCatalogue(tmp_path / "events.sqlite3")
+    catalogue.upsert("vendor_a", EVENTS, date="2030-01-01")
+    catalogue.upsert("vendor_a", [{**EVENTS[0], "title": "Late Show (moved)"}], date="2030-01-01")
+
+    day = catalogue.query("vendor_a", date_from="2030-01-01")
+    both = catalogue.query("vendor_a", date_from="2030-01-01", date_to="2030-01-02", city="Paris")
+
+    assert [event["title"] for event in day] == ["Matinee", "Late Show (moved)"]
+    assert [event["id"] for event in both] == ["a-1", "a-3"]
+    assert catalogue.query("vendor_b", date_from="2030-01-01") == []
+    assert catalogue.page("vendor_a", date="2030-01-01", page=2, page_size=1) == ([day[1]], 2)
+
+
+def test_compact_drops_past_dates(tmp_path):
+    catalogue = EventCatalogue(tmp_path / "events.sqlite3")
+    catalogue.upsert("vendor_a", EVENTS, date="2030-01-01")
+
+    removed = catalogue.compact(keep_days=0, today=date(2030, 1, 2))
+
+    assert removed == 2
+    assert [event["id"] for event in catalogue.query("vendor_a", date_from="2030-01-01", date_to="2030-01-02")] == [
+        "a-3"
+    ]
+
+
+def test_live_fetch_feeds_offline_mode(tmp_path, monkeypatch):
+    """Events seen live are served back once the vendor is unreachable"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    catalogue = EventCatalogue(tmp_path / "events.sqlite3")
+    settings = ConnectorSettings(base_url="https://vendor-a.test/events", page_size=10)
+    live = TicketVendorAConnector(settings, catalogue=catalogue)
+
+    async def fetch_live():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"events": EVENTS[:2]}))
+        live._client._client = httpx.AsyncClient(transport=transport)
+        try:
+            return await live.fetch(date="2030-01-01")
+        finally:
+            await live._client._client.aclose()
+
+    asyncio.run(fetch_live())
+    offline = TicketVendorAConnector(settings, offline_mode=True, catalogue=catalogue)
+    events = asyncio.run(offline.fetch(date="2030-01-01"))
+
+    assert [event.title for event in events] == ["Matinee", "Late Show"]
+
+
+def test_unchanged_pages_are_not_rewritten_and_writes_leave_the_loop(tmp_path, monkeypatch):
+    """Refetching an identical page skips the write; changed pages are stored from a worker thread"""
+    catalogue = EventCatalogue(tmp_path / "events.sqlite3")
+    writes = []
+    write = catalogue._write
+    monkeypatch.setattr(
+        catalogue, "_write", lambda provider, rows: writes.append(threading.current_thread()) or write(provider, rows)
+    )
+    bodies = iter([EVENTS[:2], EVENTS[:2], [{**EVENTS[0], "title": "Late Show (moved)"}, EVENTS[1]]])
+    live = TicketVendorAConnector(
+        ConnectorSettings(base_url="https://vendor-a.test/events", page_size=10), catalogue=catalogue
+    )
+
+    async def fetch_three_times():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"events": next(bodies)}))
+        live._client._client = httpx.AsyncClient(transport=transport)
+        try:
+            for _ in range(3):
+                await live.fetch(date="2030-01-01")
+        finally:
+            await live._client._client.aclose()
+
+    asyncio.run(fetch_three_times())
+
+    assert len(writes) == 2
+    assert threading.main_thread() not in writes
+    assert catalogue.query("vendor_a", date_from="2030-01-01")[1]["title"] == "Late Show (moved)"
+
+
+def test_offline_without_catalogued_date_uses_bundled_data(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    catalogue = EventCatalogue(tmp_path / "events.sqlite3")
+    catalogue.upsert("vendor_a", EVENTS, date="2030-01-01")
+    connector = TicketVendorAConnector(
+        ConnectorSettings(base_url="https://vendor-a.test/events"), offline_mode=True, catalogue=catalogue
+    )
+
+    events = asyncio.run(connector.fetch(date="2025-11-09"))
+
+    assert {event.title for event in events} == {"Jazz Night", "Comedy Showcase"}
+
+
+def test_degraded_vendor_reads_the_catalogue_off_the_loop(tmp_path, monkeypatch):
+    """The fallback page query runs in a worker thread, not on the event loop"""
+    catalogue = EventCatalogue(tmp_path / "events.sqlite3")
+    catalogue.upsert("vendor_a", EVENTS, date="2030-01-01")
+    reads = []
+    page = catalogue.page
+    monkeypatch.setattr(
+        catalogue, "page", lambda *args, **kwargs: reads.append(threading.current_thread()) or page(*args, **kwargs)
+    )
+    connector = TicketVendorAConnector(
+        ConnectorSettings(base_url="https://vendor-a.test/events", retries=0), catalogue=catalogue
+    )
+
+    async def fetch_degraded():
+        transport = httpx.MockTransport(lambda request: httpx.Response(503))
+        connector._client._client = httpx.AsyncClient(transport=transport)
+        try:
+            return await connector.fetch(date="2030-01-01")
+        finally:
+            await connector._client._client.aclose()
+
+    events = asyncio.run(fetch_degraded())
+
+    assert [event.title for event in events] == ["Matinee", "Late Show"]
+    assert reads and threading.main_thread() not in reads
+
+
+def test_planner_opens_catalogue_in_cache_dir(tmp_path, planner):
+    assert planner.catalogue is not None
+    assert planner.vendor_a.catalogue is planner.catalogue is planner.vendor_b.catalogue
+    assert planner.catalogue.path == tmp_path / ".weekend-planner" / "cache" / "events.sqlite3"
@@ -0,0 +1,135 @@
+"""Tests for the sliding-window circuit breaker."""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.utils.http import CircuitBreaker, HttpClient
+from app.utils.metrics import get_metrics_collector
+
+
+def make_breaker(clock, **kwargs) -> CircuitBreaker:
+    options = dict(name="vendor", minimum_calls=4, window_size=10, reset_timeout=30, half_open_probes=2)
+    options.update(kwargs)
+    return CircuitBreaker(clock=clock, **options)
+
+
+def record(breaker: CircuitBreaker, outcomes: str) -> None:
+    for outcome in outcomes:
+        assert breaker.allow_request()
+        breaker.on_success() if outcome == "." else breaker.on_failure()
+
+
+def test_a_single_failure_does_not_open(clock):
+    breaker = make_breaker(clock)
+
+    record(breaker, "x...")
+
+    assert breaker.state == "closed"
+
+
+def test_opens_on_error_rate_once_minimum_volume_is_reached(clock):
+    breaker = make_breaker(clock)
+
+    record(breaker, "xx")
+    assert breaker.state == "closed"
+    record(breaker, ".x")
+
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+
+def test_old_outcomes_age_out_of_the_window(clock):
+    breaker = make_breaker(clock, window_seconds=10)
+    record(breaker, "xx.")
+
+    clock.now += 11
+    record(breaker, "x...")
+
+    assert breaker.state == "closed"
+
+
+def test_window_is_bounded_by_call_count(clock):
+    breaker = make_breaker(clock, window_size=4)
+
+    record(breaker, "xxx" + "." * 4)
+    record(breaker, "x")
+
+    assert breaker.state == "closed"
+
+
+def test_half_open_admits_limited_probes_then_closes(clock):
+    breaker = make_breaker(clock)
+    record(breaker, "xxxx")
+    clock.now += 30
+
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.on_success()
+    breaker.on_success()
+
+    assert breaker.state == "closed"
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = make_breaker(clock)
+    record(breaker, "xxxx")
+    clock.now += 30
+
+    assert breaker.allow_request()
+    breaker.on_failure()
+
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+
+def test_released_probe_frees_its_slot(clock):
+    breaker = make_breaker(clock, half_open_probes=1)
+    record(breaker, "xxxx")
+    clock.now += 30
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.release()
+
+    assert breaker.allow_request()
+
+
+def test_transitions_and_rejections_are_counted(clock):
+    breaker = make_breaker(clock)
+    record(breaker, "xxxx")
+    breaker.allow_request()
+    clock.now += 30
+    record(breaker, "..")
+
+    counters = get_metrics_collector().get_counters()
+    assert counters[("circuit_breaker_transitions_total", (("breaker", "vendor"), ("state", "open")))] == 1
+    assert counters[("circuit_breaker_transitions_total", (("breaker", "vendor"), ("state", "half-open")))] == 1
+    assert counters[("circuit_breaker_transitions_total", (("breaker", "vendor"), ("state", "closed")))] == 1
+    assert counters[("circuit_breaker_rejected_total", (("breaker", "vendor"),))] == 1
+
+
+def test_http_client_stops_retrying_once_breaker_opens():
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        return httpx.Response(503)
+
+    breaker = CircuitBreaker(minimum_calls=2)
+    client = HttpClient(retries=5, backoff_factor=0, circuit_breaker=breaker)
+
+    async def run():
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with pytest.raises(RuntimeError, match="Circuit breaker open"):
+            await client.request("GET", "https://vendor.test/events")
+        await client._client.aclose()
+
+    asyncio.run(run())
+
+    assert len(calls) == 2
+    assert breaker.state == "open"
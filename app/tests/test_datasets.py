@@ -0,0 +1,83 @@
+"""Tests for the load-once bundled dataset store."""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+
+from app.config import ConnectorSettings
+from app.connectors.ticket_vendor_a import TicketVendorAConnector
+from app.utils import datasets
+from app.utils.datasets import DatasetStore
+
+EVENTS = [
+    {"title": "A", "start": "2025-11-09T19:00:00Z", "city": "Paris"},
+    {"title": "B", "start": "2025-11-09T21:00:00Z", "city": "Lisbon"},
+    {"title": "C", "start": "2025-11-10T20:00:00Z", "city": "Paris"},
+]
+
+
+def write(path, events, mtime_ns=None):
+    path.write_text(json.dumps({"events": events}), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_dataset_is_parsed_once(tmp_path, monkeypatch):
+    write(tmp_path / "vendor.json", EVENTS)
+    store = DatasetStore(tmp_path)
+    loads = []
+    real_loads = json.loads
+    monkeypatch.setattr(datasets.json, "loads", lambda text: loads.append(1) or real_loads(text))
+
+    first = store.get("vendor", "events")
+    second = store.get("vendor", "events")
+
+    assert first is second
+    assert len(loads) == 1
+    assert first.pages(2) is second.pages(2)
+
+
+def test_dataset_reloads_when_mtime_changes(tmp_path):
+    path = tmp_path / "vendor.json"
+    write(path, EVENTS, mtime_ns=1_000_000_000)
+    store = DatasetStore(tmp_path)
+    assert len(store.get("vendor", "events").records) == 3
+
+    write(path, EVENTS[:1], mtime_ns=2_000_000_000)
+
+    assert [record["title"] for record in store.get("vendor", "events").records] == ["A"]
+
+
+def test_select_by_date_and_city(tmp_path):
+    write(tmp_path / "vendor.json", EVENTS)
+    dataset = DatasetStore(tmp_path).get("vendor", "events")
+
+    assert [r["title"] for r in dataset.select(date="2025-11-09")] == ["A", "B"]
+    assert [r["title"] for r in dataset.select(city="paris")] == ["A", "C"]
+    assert [r["title"] for r in dataset.select(date="2025-11-09", city="Paris")] == ["A"]
+
+
+def test_unmatched_filters_fall_back_to_everything(tmp_path):
+    """Bundled data stands in for the vendor, so unknown dates still get events"""
+    write(tmp_path / "vendor.json", EVENTS)
+    dataset = DatasetStore(tmp_path).get("vendor", "events")
+
+    assert dataset.select(date="2031-01-01") is dataset.records
+    assert dataset.pages(2, date="2031-01-01") == (tuple(EVENTS[:2]), tuple(EVENTS[2:]))
+
+
+def test_offline_vendor_pages_come_from_the_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    write(tmp_path / "vendor_a.json", EVENTS)
+    store = DatasetStore(tmp_path)
+    monkeypatch.setattr(datasets, "_store", store)
+    settings = ConnectorSettings(base_url="https://vendor-a.test", page_size=1, prefetch_pages=2)
+    connector = TicketVendorAConnector(settings, offline_mode=True)
+
+    events = asyncio.run(connector.fetch(date="2025-11-09"))
+    again = asyncio.run(connector.fetch(date="2025-11-10"))
+
+    assert [event.title for event in events] == ["A", "B"]
+    assert [event.title for event in again] == ["C"]
+    assert len(store._datasets) == 1
@@ -0,0 +1,105 @@
+"""Tests for request deadlines and partial plans."""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.planner import Planner
+from app.utils.deadline import Deadline, DeadlineExceeded
+from app.utils.http import CircuitBreaker, HttpClient
+
+
+@pytest.fixture
+def planner(planner, monkeypatch):
+    """Offline planner whose vendor B only answers after the deadline."""
+    planner.fetches = []
+
+    async def slow_fetch(*, date, deadline=None):
+        planner.fetches.append(date)
+        await asyncio.sleep(deadline.remaining() + 0.01)
+        deadline.mark_cut_off("vendor_b")
+        return []
+
+    monkeypatch.setattr(planner.vendor_b, "fetch", slow_fetch)
+    return planner
+
+
+def test_deadline_budget_and_timeout(clock):
+    """The deadline bounds per-component timeouts and raises once passed"""
+    deadline = Deadline(2.0, clock=clock)
+
+    assert deadline.timeout(10.0) == 2.0
+    clock.now += 1.5
+    assert deadline.timeout(10.0) == pytest.approx(0.5)
+    assert deadline.timeout(0.1) == 0.1
+    deadline.check()
+
+    clock.now += 1.0
+    assert deadline.expired
+    assert deadline.remaining() == 0.0
+    with pytest.raises(DeadlineExceeded):
+        deadline.check()
+
+
+def test_no_deadline_without_budget():
+    assert Deadline.from_ms(None) is None
+    assert Deadline.from_ms(250).remaining() <= 0.25
+
+
+def test_expired_deadline_does_not_trip_circuit_breaker():
+    """Running out of our own time is not counted as an upstream failure"""
+    breaker = CircuitBreaker(minimum_calls=1)
+    client = HttpClient(timeout=5, retries=2, backoff_factor=0, circuit_breaker=breaker)
+
+    async def hang_then_fail(request):
+        await asyncio.sleep(0.05)
+        raise httpx.ConnectError("too slow", request=request)
+
+    async def run():
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(hang_then_fail))
+        with pytest.raises(DeadlineExceeded):
+            await client.get_json("http://vendor.test/events", deadline=Deadline(0.02))
+        await client._client.aclose()
+
+    asyncio.run(run())
+    assert breaker.allow_request()
+
+
+def test_vendor_pages_stop_at_deadline(tmp_path, monkeypatch):
+    """A vendor stops paginating and reports itself cut off"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    planner = Planner(offline_mode=True)
+    deadline = Deadline(0)
+
+    events = asyncio.run(planner.vendor_a.fetch(date="2025-11-09", deadline=deadline))
+
+    assert events == []
+    assert deadline.cut_off == ["vendor_a"]
+
+
+def test_slow_vendor_yields_partial_plan(planner):
+    """The plan answers within the deadline with what the fast vendor returned"""
+    result = asyncio.run(planner.plan(date="2025-11-09", budget_pp=30, deadline_ms=50))
+
+    assert result.partial
+    assert result.cut_off == ["vendor_b"]
+    assert result.itineraries
+    assert {itinerary["provider"] for itinerary in result.itineraries} == {"vendor_a"}
+
+
+def test_partial_plans_are_not_cached(planner):
+    """A cut-off answer must not be served to later callers"""
+    asyncio.run(planner.plan(date="2025-11-09", budget_pp=30, deadline_ms=50))
+    asyncio.run(planner.plan(date="2025-11-09", budget_pp=30, deadline_ms=50))
+
+    assert planner.fetches == ["2025-11-09", "2025-11-09"]
+
+
+def test_plan_without_deadline_is_complete(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    result = asyncio.run(Planner(offline_mode=True).plan(date="2025-11-09", budget_pp=30))
+
+    assert not result.partial
+    assert result.cut_off == []
@@ -0,0 +1,72 @@
+"""Tests for the slotted event and itinerary records."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from app.normalizers.event import Event, Inventory
+from app.normalizers.price import PriceBreakdown
+
+RAW = {
+    "provider": "vendor_a",
+    "title": "Jazz Night",
+    "start_ts": "2025-11-09T19:00:00Z",
+    "venue": "Blue Note",
+    "city": "Paris",
+    "price": {"amount": 42.0, "currency": "EUR", "includes_vat": True},
+    "fees": [{"label": "Service", "amount": 2.5, "currency": "EUR"}],
+    "vat_rate": 0.2,
+    "promos": [],
+    "inventory_hint": "low",
+    "url": "https://vendor-a.example/jazz-night",
+}
+
+
+def test_event_reads_like_the_old_dict():
+    """The mapping view exposes the original keys and nested price"""
+    event = Event.coerce(RAW)
+
+    assert not hasattr(event, "__dict__")
+    assert event["price"] == RAW["price"]
+    assert event.get("inventory_hint") == "low"
+    assert event.inventory == Inventory.LOW
+    assert event.get("missing", "default") == "default"
+    assert dict(event) == {**RAW, "fees": tuple(RAW["fees"]), "promos": ()}
+    assert Event.coerce(event) is event
+
+
+def test_event_interns_repeated_strings():
+    first = Event.coerce({**RAW, "city": "".join(["Pa", "ris"])})
+    second = Event.coerce({**RAW, "city": "".join(["Par", "is"])})
+
+    assert first.city is second.city
+
+
+def test_unknown_inventory_hints_are_unknown():
+    assert Event.build(provider="vendor_b", inventory_hint="plenty").inventory_hint == "unknown"
+    assert Event.build(provider="vendor_b", inventory_hint="med").inventory_hint == "medium"
+
+
+def test_price_breakdown_derives_components():
+    price = PriceBreakdown(base=10.0, vat=2.0, fees=1.0, promos=0.5, total=12.5, currency="EUR")
+
+    assert not hasattr(price, "__dict__")
+    assert price.components == {"base": 10.0, "vat": 2.0, "fees": 1.0, "promo": 0.5}
+    assert price.to_dict()["components"] == price.components
+
+
+def test_planner_works_on_records_end_to_end(planner):
+    """Connectors emit records and itineraries stay records until serialised"""
+    events = asyncio.run(planner.vendor_a.fetch(date="2025-11-09"))
+    result = asyncio.run(planner.plan(date="2025-11-09", budget_pp=30))
+
+    assert all(isinstance(event, Event) for event in events)
+    itinerary = result.itineraries[0]
+    assert not hasattr(itinerary, "__dict__")
+    assert itinerary["provider"] in {"vendor_a", "vendor_b"}
+    with pytest.raises(KeyError):
+        itinerary["inventory_hint"]
+    serialised = {**itinerary.to_dict(), "price": itinerary["price"].to_dict()}
+    assert json.loads(json.dumps(serialised))["title"] == itinerary.title
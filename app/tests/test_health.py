@@ -0,0 +1,137 @@
+"""Tests for circuit-breaker state shared between workers."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Callable
+
+import pytest
+
+from app.utils.health import HealthRegistry
+from app.utils.http import CircuitBreaker
+
+
+@pytest.fixture
+def worker(tmp_path, make_clock) -> Callable[..., CircuitBreaker]:
+    """Builds a breaker as one worker process would, with its own registry connection."""
+
+    def build(clock=None, **kwargs) -> CircuitBreaker:
+        options = dict(name="vendor_a", minimum_calls=2, reset_timeout=30, half_open_probes=1, sync_interval=1.0)
+        options.update(kwargs)
+        registry = HealthRegistry(tmp_path / "health.sqlite3")
+        return CircuitBreaker(registry=registry, clock=clock or make_clock(), **options)
+
+    return build
+
+
+def trip(breaker: CircuitBreaker) -> None:
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.on_failure()
+    assert breaker.state == "open"
+
+
+def test_new_worker_inherits_an_open_circuit(worker):
+    trip(worker())
+
+    fresh = worker()
+
+    assert fresh.state == "open"
+    assert not fresh.allow_request()
+
+
+def test_running_worker_picks_up_an_open_circuit_on_next_sync(clock, worker):
+    other = worker(clock=clock)
+    assert other.allow_request()
+
+    trip(worker())
+    assert other.allow_request()
+    clock.now += 1.0
+
+    assert not other.allow_request()
+    assert other.state == "open"
+
+
+def test_sync_inside_the_event_loop_reads_the_registry_off_the_loop(clock, worker):
+    other = worker(clock=clock)
+    reads = []
+    get = other.registry.get
+    other.registry.get = lambda name: reads.append(threading.current_thread()) or get(name)
+    trip(worker())
+    clock.now += 1.0
+
+    async def run():
+        admitted = other.allow_request()
+        await other._sync_task
+        return admitted
+
+    assert asyncio.run(run())
+    assert reads and threading.main_thread() not in reads
+    assert other.state == "open"
+    assert not other.allow_request()
+
+
+def test_trip_inside_the_event_loop_publishes_off_the_loop(worker):
+    breaker = worker()
+    writes = []
+    publish_state = breaker.registry.publish_state
+    breaker.registry.publish_state = lambda *args, **kwargs: (
+        writes.append(threading.current_thread()) or publish_state(*args, **kwargs)
+    )
+
+    async def run():
+        trip(breaker)
+        assert writes == []
+        await breaker._publish_task
+
+    asyncio.run(run())
+
+    assert len(writes) == 1 and writes[0] is not threading.main_thread()
+    assert worker().state == "open"
+
+
+def test_recovery_is_shared_too(make_clock, worker):
+    first_clock, second_clock = make_clock(), make_clock()
+    first = worker(clock=first_clock)
+    trip(first)
+    second = worker(clock=second_clock)
+    assert second.state == "open"
+
+    second_clock.now += 30
+    assert second.allow_request()
+    second.on_success()
+    assert second.state == "closed"
+    first_clock.now += 1.0
+
+    assert first.allow_request()
+    assert first.state == "closed"
+
+
+def test_stale_open_state_is_not_adopted(tmp_path, worker):
+    registry = HealthRegistry(tmp_path / "health.sqlite3")
+    registry.publish_state("vendor_a", "open", opened_at=time.time() - 60)
+
+    assert worker().state == "closed"
+
+
+def test_latency_average_is_published(tmp_path, clock, worker):
+    breaker = worker(clock=clock)
+    breaker.allow_request()
+    breaker.on_success(0.100)
+    breaker.allow_request()
+    breaker.on_success(0.200)
+    clock.now += 1.0
+    breaker.allow_request()
+
+    shared = HealthRegistry(tmp_path / "health.sqlite3").get("vendor_a")
+
+    assert shared.latency_ms == breaker.latency_ms == 120.0
+    assert shared.state == "closed"
+
+
+def test_planner_shares_one_registry_across_connectors(tmp_path, planner):
+    assert planner.health is not None
+    assert planner.health.path == tmp_path / ".weekend-planner" / "cache" / "health.sqlite3"
+    for connector in (planner.vendor_a, planner.vendor_b, planner.dining):
+        assert connector._circuit_breaker.registry is planner.health
@@ -0,0 +1,157 @@
+"""Tests for hedged GET requests."""
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+
+import httpx
+import pytest
+
+from app.utils.hedging import HedgePolicy, hedge_policy
+from app.utils.http import HttpClient
+from app.utils.metrics import get_metrics_collector
+from app.utils.transport import get_transport_pool
+
+HOST = "vendor.test"
+URL = f"https://{HOST}/events"
+
+
+def warmed_policy(latency: float = 0.01, samples: int = 40, **kwargs) -> HedgePolicy:
+    policy = HedgePolicy(**kwargs)
+    for _ in range(samples):
+        policy.observe(HOST, latency)
+    return policy
+
+
+def counter(name: str) -> float:
+    return get_metrics_collector().get_counters().get((name, (("host", HOST),)), 0)
+
+
+def run_with_handler(client: HttpClient, handler, method: str = "GET"):
+    async def run():
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await client.request(method, URL)
+        finally:
+            await client._client.aclose()
+
+    return asyncio.run(run())
+
+
+def slow_then_fast():
+    calls = []
+
+    async def handler(request):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            await asyncio.sleep(0.3)
+            return httpx.Response(200, json={"from": "primary"})
+        return httpx.Response(200, json={"from": "hedge"})
+
+    return handler, calls
+
+
+def test_policy_waits_for_samples_then_uses_percentile():
+    policy = HedgePolicy(percentile=0.9, min_samples=10)
+    assert policy.delay(HOST) is None
+
+    for ms in range(1, 11):
+        policy.observe(HOST, ms / 1000)
+
+    assert policy.delay(HOST) == pytest.approx(0.010)
+
+
+def test_budget_limits_hedges_to_a_share_of_traffic():
+    policy = HedgePolicy(budget=0.05, burst=1.0)
+    granted = 0
+    for _ in range(200):
+        policy.delay(HOST)
+        granted += policy.try_acquire(HOST)
+
+    assert granted == 10
+
+
+def test_slow_get_is_hedged_and_hedge_wins():
+    handler, calls = slow_then_fast()
+    policy = warmed_policy()
+    policy._hosts[HOST].tokens = 1.0
+    client = HttpClient(hedge=policy)
+
+    start = time.monotonic()
+    response = run_with_handler(client, handler)
+
+    assert response.json() == {"from": "hedge"}
+    assert time.monotonic() - start < 0.2
+    assert len(calls) == 2
+    assert counter("http_hedges_fired_total") == 1
+    assert counter("http_hedges_won_total") == 1
+
+
+def test_no_hedge_without_budget():
+    handler, calls = slow_then_fast()
+    client = HttpClient(hedge=warmed_policy())
+
+    response = run_with_handler(client, handler)
+
+    assert response.json() == {"from": "primary"}
+    assert len(calls) == 1
+    assert counter("http_hedges_fired_total") == 0
+
+
+def test_non_get_requests_are_never_hedged():
+    handler, calls = slow_then_fast()
+    policy = warmed_policy()
+    policy._hosts[HOST].tokens = 1.0
+
+    run_with_handler(HttpClient(hedge=policy), handler, method="POST")
+
+    assert len(calls) == 1
+
+
+def test_failed_primary_falls_back_to_hedge():
+    """A primary that errors after the hedge fired doesn't fail the request"""
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(0.05)
+            return httpx.Response(503)
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json={"from": "hedge"})
+
+    policy = warmed_policy()
+    policy._hosts[HOST].tokens = 1.0
+
+    response = run_with_handler(HttpClient(hedge=policy, retries=0), handler)
+
+    assert response.json() == {"from": "hedge"}
+    assert counter("http_hedges_won_total") == 1
+
+
+def test_hedging_is_off_without_percentile():
+    assert hedge_policy(None, 0.05) is None
+    assert hedge_policy(0.95, 0.05).percentile == 0.95
+
+
+def test_observed_latency_excludes_the_limiter_queue_wait():
+    policy = HedgePolicy()
+    client = HttpClient(hedge=policy, bulkhead="hedged", coalesce=False)
+
+    async def run():
+        pool = get_transport_pool()
+        limiter = pool.limiter(HOST, "hedged")
+        limiter.limit = 1.0
+        await limiter.acquire()
+        asyncio.get_running_loop().call_later(0.2, functools.partial(limiter.release, None, ok=True))
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        try:
+            await client.request("GET", URL)
+        finally:
+            await client._client.aclose()
+            await pool.aclose()
+
+    asyncio.run(run())
+
+    assert list(policy._hosts[HOST].latencies) == [pytest.approx(0.0, abs=0.1)]
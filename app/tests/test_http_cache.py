@@ -0,0 +1,228 @@
+"""Tests for the private HTTP cache in HttpClient."""
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Callable
+
+import httpx
+import pytest
+
+from app.utils.http import HttpClient
+from app.utils.http_cache import CachedResponse, DiskCacheStore, HttpCache, MemoryCacheStore
+from app.utils.metrics import get_metrics_collector
+from app.utils.retry import RetryBudget
+
+URL = "https://vendor.test/events"
+
+
+@pytest.fixture
+def clock(make_clock):
+    """A wall-clock reading, as HttpCache defaults to ``time.time``."""
+    return make_clock(now=1_700_000_000.0)
+
+
+def make_client(clock: Callable[[], float], store=None) -> HttpClient:
+    return HttpClient(retries=0, retry_budget=RetryBudget(), cache=HttpCache(store or MemoryCacheStore(), clock=clock))
+
+
+def run(client: HttpClient, handler, *requests):
+    """Issue GETs in order; ``requests`` are (params, headers) pairs or None."""
+    seen = []
+
+    def recording(request):
+        seen.append(request)
+        return handler(request)
+
+    async def go():
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(recording))
+        try:
+            responses = []
+            for options in requests:
+                params, headers = options or (None, None)
+                responses.append(await client.request("GET", URL, params=params, headers=headers))
+            return responses
+        finally:
+            await client._client.aclose()
+
+    return asyncio.run(go()), seen
+
+
+def entry(content: bytes = b"x", **headers) -> CachedResponse:
+    return CachedResponse(URL, 200, tuple(headers.items()), content, stored_at=0.0)
+
+
+def test_fresh_response_is_served_without_a_request(clock):
+    client = make_client(clock)
+
+    responses, seen = run(
+        client,
+        lambda request: httpx.Response(200, headers={"Cache-Control": "max-age=60"}, json={"page": 1}),
+        None,
+        None,
+    )
+
+    assert len(seen) == 1
+    assert [response.json() for response in responses] == [{"page": 1}, {"page": 1}]
+    assert get_metrics_collector().get_metrics()['cache_hit_ratio{cache="http"}'] == 0.5
+
+
+def test_stale_response_is_revalidated_and_304_serves_stored_body(clock):
+    client = make_client(clock)
+
+    def handler(request):
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"Cache-Control": "max-age=60", "ETag": '"v1"'})
+        return httpx.Response(200, headers={"Cache-Control": "max-age=60", "ETag": '"v1"'}, json={"page": 1})
+
+    async def go():
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(recording))
+        try:
+            first = await client.request("GET", URL)
+            clock.now += 61
+            second = await client.request("GET", URL)
+            third = await client.request("GET", URL)
+            return first, second, third
+        finally:
+            await client._client.aclose()
+
+    seen = []
+
+    def recording(request):
+        seen.append(request)
+        return handler(request)
+
+    first, second, third = asyncio.run(go())
+
+    assert len(seen) == 2
+    assert seen[1].headers["if-none-match"] == '"v1"'
+    assert second.status_code == 200 and second.json() == first.json()
+    assert third.json() == {"page": 1}
+    counters = get_metrics_collector().get_counters()
+    assert counters[("http_cache_revalidated_total", (("host", "vendor.test"),))] == 1
+
+
+def test_changed_resource_replaces_the_entry(clock):
+    client = make_client(clock)
+    versions = iter([b'{"v": 1}', b'{"v": 2}'])
+
+    def handler(request):
+        headers = {"Cache-Control": "no-cache", "Last-Modified": "Tue, 14 Nov 2023 22:00:00 GMT"}
+        return httpx.Response(200, headers=headers, content=next(versions))
+
+    responses, seen = run(client, handler, None, None)
+
+    assert len(seen) == 2
+    assert seen[1].headers["if-modified-since"] == "Tue, 14 Nov 2023 22:00:00 GMT"
+    assert [response.json() for response in responses] == [{"v": 1}, {"v": 2}]
+
+
+def test_no_store_and_uncacheable_responses_are_not_kept(clock):
+    client = make_client(clock)
+
+    run(client, lambda request: httpx.Response(200, headers={"Cache-Control": "no-store, max-age=60"}), None)
+    run(client, lambda request: httpx.Response(200), None)
+    run(client, lambda request: httpx.Response(403, headers={"Cache-Control": "max-age=60"}), None)
+    with pytest.raises(httpx.HTTPStatusError):
+        run(client, lambda request: httpx.Response(500, headers={"Cache-Control": "max-age=60"}), None)
+
+    assert len(client.cache.store) == 0
+
+
+def test_params_and_vary_headers_select_the_variant(clock):
+    client = make_client(clock)
+
+    def handler(request):
+        return httpx.Response(
+            200, headers={"Cache-Control": "max-age=60", "Vary": "Accept-Language"}, text=str(request.url)
+        )
+
+    _, seen = run(
+        client,
+        handler,
+        ({"page": 1}, {"Accept-Language": "en"}),
+        ({"page": 2}, {"Accept-Language": "en"}),
+        ({"page": 1}, {"Accept-Language": "de"}),
+        ({"page": 1}, {"Accept-Language": "de"}),
+    )
+
+    assert len(seen) == 3
+
+
+def test_freshness_from_expires_and_heuristic():
+    date = "Tue, 14 Nov 2023 22:13:20 GMT"
+
+    assert entry(Date=date, Expires="Tue, 14 Nov 2023 22:14:20 GMT").freshness_lifetime() == 60
+    assert entry(Date=date, Expires="0").freshness_lifetime() == 0
+    # 10% of the 1000s since the last change.
+    assert entry(Date=date, **{"Last-Modified": "Tue, 14 Nov 2023 21:56:40 GMT"}).freshness_lifetime() == 100
+    assert entry(**{"Cache-Control": "max-age=5", "Expires": "0"}).freshness_lifetime() == 5
+
+
+def test_memory_store_evicts_least_recently_used_past_its_cap():
+    store = MemoryCacheStore(max_bytes=10)
+    store.set("a", entry(b"1234"))
+    store.set("b", entry(b"1234"))
+    store.get("a")
+    store.set("c", entry(b"1234"))
+
+    assert store.get("a") is not None
+    assert store.get("b") is None
+    assert store.size <= 10
+
+
+def test_disk_store_round_trips_and_prunes(tmp_path):
+    store = DiskCacheStore(tmp_path, max_bytes=2048)
+    stored = CachedResponse(URL, 200, (("ETag", '"v1"'),), b"x" * 600, stored_at=5.0, vary=(("accept", "*/*"),))
+    store.set("a", stored)
+
+    assert DiskCacheStore(tmp_path).get("a") == stored
+    store.set("b", entry(b"y" * 600))
+    store.set("c", entry(b"z" * 600))
+
+    assert store.get("a") is None
+    assert store.get("c") is not None
+
+
+def test_disk_store_tracks_its_size_and_rescans_only_past_the_cap(tmp_path, monkeypatch):
+    store = DiskCacheStore(tmp_path, max_bytes=2048)
+    scans = []
+    scan = store._scan
+    monkeypatch.setattr(store, "_scan", lambda: scans.append(1) or scan())
+    store.set("a", entry(b"x" * 600))
+    store.set("b", entry(b"y" * 600))
+    store.set("a", entry(b"x" * 500))
+
+    assert scans == []
+    assert store.size == DiskCacheStore(tmp_path).size
+    store.delete("b")
+    store.set("c", entry(b"z" * 1000))
+    store.set("d", entry(b"w" * 1000))
+
+    assert len(scans) == 1
+    assert store.get("a") is None
+    assert store.size == DiskCacheStore(tmp_path).size <= 2048
+
+
+def test_disk_cache_io_runs_off_the_event_loop(tmp_path, clock):
+    store = DiskCacheStore(tmp_path)
+    threads = []
+    get, set_ = store.get, store.set
+    store.get = lambda key: threads.append(threading.current_thread()) or get(key)
+    store.set = lambda key, value: threads.append(threading.current_thread()) or set_(key, value)
+    client = make_client(clock, store)
+
+    def handler(request):
+        return httpx.Response(200, headers={"Cache-Control": "max-age=60"}, json={"page": 1})
+
+    responses, seen = run(client, handler, None, None)
+
+    assert len(seen) == 1
+    assert responses[1].json() == {"page": 1}
+    assert len(threads) == 3 and threading.main_thread() not in threads
+
+
+def test_planner_shares_one_cache_across_connectors(planner):
+    assert planner.http_cache is not None
+    for connector in (planner.vendor_a, planner.vendor_b, planner.dining, planner.fx):
+        assert connector._client.cache is planner.http_cache
@@ -0,0 +1,148 @@
+"""Tests for incremental JSON array parsing and streamed vendor pages."""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+
+from app.config import ConnectorSettings
+from app.connectors.ticket_vendor_a import TicketVendorAConnector
+from app.utils.http import HttpClient
+from app.utils.jsonstream import JsonArrayStream, ResponseTooLarge
+from app.utils.retry import RetryBudget
+
+PAYLOAD = {
+    "page": 1,
+    "events": [
+        {"title": "Fado night – Alfama", "price": {"amount": 25.5}},
+        {"title": "Jazz", "tags": ["live", "late"], "seats": -12},
+        [1, 2.5e3, None, True],
+        17,
+    ],
+    "total": 4,
+    "meta": {"cursor": "abc"},
+}
+
+
+def parse(body: bytes, chunk_size: int, **kwargs):
+    parser = JsonArrayStream(**kwargs)
+    items = []
+    for offset in range(0, len(body), chunk_size):
+        items.extend(parser.feed(body[offset : offset + chunk_size]))
+    items.extend(parser.close())
+    return items, parser
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 10_000])
+def test_items_match_a_full_parse_at_any_chunking(chunk_size):
+    body = json.dumps(PAYLOAD, ensure_ascii=False, indent=1).encode()
+
+    items, parser = parse(body, chunk_size)
+
+    assert items == PAYLOAD["events"]
+    assert parser.fields == {"page": 1, "total": 4, "meta": {"cursor": "abc"}}
+
+
+def test_items_are_released_as_soon_as_they_complete():
+    parser = JsonArrayStream()
+
+    assert parser.feed(b'{"results": [{"id": 1}, {"id"') == [{"id": 1}]
+    assert parser.feed(b': 2}, 3') == [{"id": 2}]
+    assert parser.feed(b"0]}") == [30]
+    assert parser.close() == []
+
+
+def test_bare_array_and_empty_documents():
+    assert parse(b"[1, 2]", 1)[0] == [1, 2]
+    assert parse(b"[]", 1)[0] == []
+    assert parse(b"{}", 1)[0] == []
+    assert parse(b'{"events": []}', 1)[0] == []
+
+
+@pytest.mark.parametrize("body", [b'{"events": [1, 2', b'{"events": [1 2]}', b'{"events"', b"nope", b"[1]]"])
+def test_truncated_or_malformed_documents_raise(body):
+    with pytest.raises(json.JSONDecodeError):
+        parse(body, 4)
+
+
+def test_max_bytes_guard():
+    body = json.dumps({"events": [{"x": "y" * 100}] * 10}).encode()
+
+    with pytest.raises(ResponseTooLarge):
+        parse(body, 64, max_bytes=500)
+
+
+def stream_client(handler) -> HttpClient:
+    client = HttpClient(retries=1, backoff_factor=0, retry_budget=RetryBudget())
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_streamed_gzip_page_after_a_retry():
+    calls = []
+    body = gzip.compress(json.dumps(PAYLOAD).encode())
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, headers={"Content-Encoding": "gzip", "Link": '<p2>; rel="next"'}, content=body)
+
+    client = stream_client(handler)
+
+    async def run():
+        try:
+            return await client.get_json_items("https://vendor.test/events", key="events", stream=True)
+        finally:
+            await client._client.aclose()
+
+    items, fields, headers = asyncio.run(run())
+
+    assert len(calls) == 2
+    assert "gzip" in calls[1].headers["accept-encoding"]
+    assert items == PAYLOAD["events"]
+    assert fields["total"] == 4
+    assert headers["link"] == '<p2>; rel="next"'
+
+
+def test_oversized_compressed_page_is_refused():
+    body = gzip.compress(json.dumps({"events": ["z" * 1000] * 100}).encode())
+    assert len(body) < 1000
+    client = stream_client(lambda request: httpx.Response(200, headers={"Content-Encoding": "gzip"}, content=body))
+
+    async def run():
+        try:
+            await client.get_json_items(
+                "https://vendor.test/events", key="events", stream=True, max_bytes=10_000
+            )
+        finally:
+            await client._client.aclose()
+
+    with pytest.raises(ResponseTooLarge):
+        asyncio.run(run())
+
+
+def test_vendor_streams_pages_when_enabled():
+    pages = {
+        "1": {"events": [{"title": "A", "start": "2025-11-09T20:00:00+00:00", "city": "Lisbon"}], "total": 2},
+        "2": {"events": [{"title": "B", "start": "2025-11-09T21:00:00+00:00", "city": "Lisbon"}], "total": 2},
+    }
+    settings = ConnectorSettings(base_url="https://vendor.test/events", page_size=1, retries=0, stream_pages=True)
+    connector = TicketVendorAConnector(settings)
+
+    def handler(request):
+        return httpx.Response(200, json=pages[request.url.params["page"]])
+
+    async def run():
+        connector._client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await connector.fetch(date="2025-11-09")
+        finally:
+            await connector._client._client.aclose()
+
+    events = asyncio.run(run())
+
+    assert [event.title for event in events] == ["A", "B"]
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import random
 from datetime import datetime, timezone
 
 import pytest
 
-from app.connectors.fx import FXConnector
+from app.connectors.fx import FXConnector, FXSnapshot
 from app.config import FXSettings
-from app.normalizers.price import calculate_price
+from app.normalizers.price import calculate_price, price_events
 from app.ranking.scorer import score_itinerary
 
 
@@ -103,3 +104,67 @@ def test_scoring_edges(monkeypatch, tmp_path):
     assert score_with_bonus > score_no_bonus
     score_under_budget = score_itinerary(price=price, budget_pp=80, buy_now=False, days_to_event=30)
     assert score_under_budget >= score_no_bonus
+
+
+def test_price_events_matches_calculate_price(monkeypatch, tmp_path):
+    """Batch pricing agrees with the per-event reference to the cent"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    rates = {"EUR": 1.0, "USD": 1.08, "GBP": 0.86}
+    fx = make_fx(rates)
+    rng = random.Random(3)
+    events = []
+    for _ in range(300):
+        currency = rng.choice(["EUR", "USD", "GBP", "CHF"])
+        events.append(
+            {
+                "price": {"amount": round(rng.uniform(0, 150), 2), "currency": currency, "includes_vat": rng.random() < 0.5},
+                "fees": [
+                    {"label": "Fee", "amount": round(rng.uniform(-3, 6), 2), "currency": rng.choice([currency, "EUR"])}
+                    for _ in range(rng.randint(0, 3))
+                ],
+                "vat_rate": rng.choice([0.0, 0.1, 0.2, None]),
+                "promos": [
+                    rng.choice(
+                        [
+                            {"code": "PCT", "type": "percent", "value": rng.choice([5, 10, 25])},
+                            {"code": "FIX", "type": "fixed", "value": rng.uniform(1, 8), "currency": "GBP"},
+                            {"code": "BOGUS", "type": "bogo", "value": 50},
+                        ]
+                    )
+                    for _ in range(rng.randint(0, 2))
+                ],
+            }
+        )
+
+    table = price_events(events, fx=FXSnapshot.from_rates(rates), target_currency="EUR")
+
+    assert len(table) == len(events)
+    for index, event in enumerate(events):
+        reference = asyncio.run(calculate_price(event, fx=fx, target_currency="EUR"))
+        view = table.breakdown(index)
+        assert view.to_dict() == reference.to_dict()
+
+
+def test_price_events_columns_in_cents():
+    """Components are integer cents and the view reports major units"""
+    events = [
+        {"price": {"amount": 50, "currency": "EUR", "includes_vat": False}, "fees": [], "vat_rate": 0.2},
+        {
+            "price": {"amount": 40, "currency": "EUR", "includes_vat": True},
+            "fees": [{"label": "Service", "amount": 2.5, "currency": "EUR"}],
+            "promos": [
+                {"code": "TENPCT", "type": "percent", "value": 10},
+                {"code": "FOUR_FIXED", "type": "fixed", "value": 4.25, "currency": "EUR"},
+            ],
+            "vat_rate": 0.2,
+        },
+    ]
+
+    table = price_events(events, fx=FXSnapshot.from_rates({"EUR": 1.0}), target_currency="EUR")
+
+    assert table.total.tolist() == [6000, 3825]
+    assert table.promos.tolist() == [0, 425]
+    assert table.totals().tolist() == [60.0, 38.25]
+    view = table.breakdown(1)
+    assert view.components == {"base": 40.0, "vat": 0.0, "fees": 2.5, "promo": 4.25}
+    assert view.promo_applied["code"] == "TENPCT"
@@ -0,0 +1,181 @@
+"""Tests for the adaptive per-host concurrency limiter."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.utils.deadline import Deadline, DeadlineExceeded
+from app.utils.http import HttpClient
+from app.utils.limiter import AdaptiveLimiter
+from app.utils.metrics import get_metrics_collector
+from app.utils.transport import get_transport_pool
+
+
+def saturate(limiter: AdaptiveLimiter, latency: float = 0.01) -> None:
+    """Run one full round of requests at the current limit."""
+    async def run():
+        slots = int(limiter.limit)
+        for _ in range(slots):
+            await limiter.acquire()
+        for _ in range(slots):
+            limiter.release(latency, ok=True)
+
+    asyncio.run(run())
+
+
+def test_limit_grows_additively_while_in_use():
+    limiter = AdaptiveLimiter("vendor", initial=2, max_limit=10)
+
+    saturate(limiter)
+    saturate(limiter)
+
+    assert int(limiter.limit) == 3
+
+
+def test_limit_does_not_grow_when_idle():
+    limiter = AdaptiveLimiter("vendor", initial=4, max_limit=10)
+
+    async def run():
+        for _ in range(20):
+            await limiter.acquire()
+            limiter.release(0.01, ok=True)
+
+    asyncio.run(run())
+
+    assert limiter.limit == 4
+
+
+def test_errors_cut_the_limit_once_per_round_trip():
+    limiter = AdaptiveLimiter("vendor", initial=8, min_limit=2)
+
+    async def run():
+        for _ in range(3):
+            await limiter.acquire()
+        for _ in range(3):
+            limiter.release(0.5, ok=False)
+
+    asyncio.run(run())
+
+    assert limiter.limit == 4
+    assert get_metrics_collector().get_counters()[("http_limiter_decreases_total", (("limiter", "vendor"),))] == 1
+
+
+def test_latency_spike_cuts_the_limit_but_not_below_minimum():
+    limiter = AdaptiveLimiter("vendor", initial=2, min_limit=2, latency_tolerance=2.0)
+    saturate(limiter, latency=0.01)
+    before = limiter.limit
+
+    async def run():
+        await limiter.acquire()
+        limiter.release(0.05, ok=True)
+
+    asyncio.run(run())
+
+    assert before > 2
+    assert limiter.limit == 2
+
+
+def test_abandoned_requests_leave_the_limit_alone():
+    limiter = AdaptiveLimiter("vendor", initial=4)
+
+    async def run():
+        await limiter.acquire()
+        limiter.release(None, ok=False)
+
+    asyncio.run(run())
+
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+
+def test_queue_is_fifo_and_wait_is_recorded():
+    limiter = AdaptiveLimiter("vendor", initial=1, max_limit=1)
+    order = []
+
+    async def call(n):
+        await limiter.acquire()
+        order.append(n)
+        await asyncio.sleep(0.01)
+        limiter.release(0.01, ok=True)
+
+    async def run():
+        await asyncio.gather(*(call(n) for n in range(4)))
+
+    asyncio.run(run())
+
+    assert order == [0, 1, 2, 3]
+    assert get_metrics_collector().get_metrics()["http_queue_wait_ms"] >= 10
+
+
+def test_cancelled_waiters_do_not_leak_slots():
+    limiter = AdaptiveLimiter("vendor", initial=1, max_limit=1)
+
+    async def run():
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        limiter.release(0.01, ok=True)
+        await asyncio.wait_for(limiter.acquire(), timeout=0.1)
+
+    asyncio.run(run())
+
+    assert limiter.in_flight == 1
+
+
+def test_http_client_backs_off_only_its_own_bulkhead():
+    """Throttling from one connector's upstream doesn't shrink another's limit"""
+
+    def handler(request):
+        return httpx.Response(429 if request.url.path == "/slow" else 200, json={})
+
+    async def run():
+        pool = get_transport_pool()
+        dining = HttpClient(bulkhead="dining", retries=0)
+        vendor = HttpClient(bulkhead="vendor_a", retries=0)
+        dining._client = vendor._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with pytest.raises(httpx.HTTPStatusError):
+            await dining.request("GET", "https://api.test/slow")
+        await vendor.request("GET", "https://api.test/fast")
+        limits = pool.limiter("api.test", "dining").limit, pool.limiter("api.test", "vendor_a").limit
+        await dining._client.aclose()
+        await pool.aclose()
+        return limits
+
+    dining_limit, vendor_limit = asyncio.run(run())
+
+    assert dining_limit < vendor_limit
+
+
+def test_queue_wait_is_bounded_by_the_request_deadline():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={})
+
+    async def run():
+        pool = get_transport_pool()
+        limiter = pool.limiter("api.test", "queued")
+        limiter.limit = 1.0
+        await limiter.acquire()
+        client = HttpClient(bulkhead="queued", retries=0, coalesce=False)
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        started = time.monotonic()
+        try:
+            with pytest.raises(DeadlineExceeded):
+                await client.request("GET", "https://api.test/events", deadline=Deadline(0.05))
+            return time.monotonic() - started, limiter.in_flight
+        finally:
+            await client._client.aclose()
+            await pool.aclose()
+
+    elapsed, in_flight = asyncio.run(run())
+
+    assert elapsed < 1.0
+    assert in_flight == 1
+    assert seen == []
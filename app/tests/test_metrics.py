@@ -99,3 +99,25 @@ def test_multiple_latency_recordings():
     
     metrics = collector.get_metrics()
     assert metrics["test_metric"] == 45.0  # Average of 0, 10, 20, ..., 90
+
+
+def test_counters_with_labels():
+    """Test counters are exported with Prometheus counter type and labels."""
+    collector = MetricsCollector()
+    
+    collector.record_counter("requests_total")
+    collector.record_counter("requests_total", 2)
+    collector.record_counter("hedges_total", labels={"host": "api.example"})
+    
+    metrics = collector.get_metrics()
+    assert metrics["requests_total"] == 3
+    assert metrics['hedges_total{host="api.example"}'] == 1
+    
+    prometheus_text = collector.export_prometheus()
+    assert "# TYPE requests_total counter" in prometheus_text
+    assert "requests_total 3.000000" in prometheus_text
+    assert 'hedges_total{host="api.example"} 1.000000' in prometheus_text
+    assert "# TYPE requests_total gauge" not in prometheus_text
+    
+    collector.reset()
+    assert "requests_total" not in collector.get_metrics()
@@ -0,0 +1,119 @@
+"""Tests for sequential and prefetching pagination."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+
+from app.config import ConnectorSettings
+from app.connectors.ticket_vendor_a import TicketVendorAConnector
+from app.utils.http import Page, aggregate_paginated, iterate_paginated, parse_link_header
+from app.utils.metrics import get_metrics_collector
+
+
+def make_loader(total_items: int, *, delay: float = 0.0, wrap=None):
+    """Page loader over ``total_items`` numbered items that records each request."""
+    calls = []
+
+    async def load(page: int, page_size: int):
+        calls.append(page)
+        await asyncio.sleep(delay)
+        items = [{"n": n} for n in range((page - 1) * page_size, min(page * page_size, total_items))]
+        return wrap(items, page, page_size) if wrap else items
+
+    return load, calls
+
+
+def test_sequential_pagination_is_unchanged():
+    load, calls = make_loader(25)
+
+    items = asyncio.run(aggregate_paginated(load, 10))
+
+    assert [item["n"] for item in items] == list(range(25))
+    assert calls == [1, 2, 3]
+
+
+def test_prefetch_overlaps_round_trips():
+    """A window of pages is fetched concurrently, still yielded in order"""
+    load, calls = make_loader(95, delay=0.05)
+
+    start = time.monotonic()
+    items = asyncio.run(aggregate_paginated(load, 10, prefetch=4))
+    elapsed = time.monotonic() - start
+
+    assert [item["n"] for item in items] == list(range(95))
+    assert sorted(calls)[:10] == list(range(1, 11))
+    assert elapsed < 10 * 0.05 * 0.6
+
+
+def test_speculative_pages_are_cancelled_after_short_page():
+    """Pages requested past the end are discarded and counted"""
+    load, calls = make_loader(15, delay=0.05)
+
+    items = asyncio.run(aggregate_paginated(load, 10, prefetch=4))
+
+    assert len(items) == 15
+    assert get_metrics_collector().get_counters()[("pagination_prefetch_wasted_total", ())] == 3
+
+
+def test_total_count_bounds_prefetch():
+    """With a total count no page past the last one is requested"""
+    load, calls = make_loader(
+        30, wrap=lambda items, page, size: Page.from_response(items, payload={"total": 30}, headers={}, page_size=size)
+    )
+
+    items = asyncio.run(aggregate_paginated(load, 10, prefetch=8))
+
+    assert len(items) == 30
+    assert sorted(calls) == [1, 2, 3]
+
+
+def test_link_header_without_next_stops():
+    def wrap(items, page, size):
+        link = '<https://vendor.test/events?page=1>; rel="prev"' if page == 2 else '<https://vendor.test/events?page=2>; rel="next"'
+        return Page.from_response(items, payload={}, headers={"link": link}, page_size=size)
+
+    load, calls = make_loader(40, wrap=wrap)
+
+    async def collect():
+        return [page async for page in iterate_paginated(load, 10)]
+
+    assert len(asyncio.run(collect())) == 2
+    assert calls == [1, 2]
+
+
+def test_parse_link_header():
+    header = '<https://a.test/?page=3>; rel="next", <https://a.test/?page=9>; rel="last"'
+
+    assert parse_link_header(header) == {"next": "https://a.test/?page=3", "last": "https://a.test/?page=9"}
+
+
+def test_vendor_prefetches_using_total_count(tmp_path, monkeypatch):
+    """Vendor A opts in via ConnectorSettings and honours the vendor's total"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    requested = []
+
+    def handler(request):
+        page = int(request.url.params["page"])
+        requested.append(page)
+        events = [
+            {"title": f"Show {page}-{n}", "start": "2030-01-01T20:00:00Z", "price": {"amount": 10, "currency": "EUR"}}
+            for n in range(2)
+        ]
+        return httpx.Response(200, json={"events": events, "total": 5})
+
+    connector = TicketVendorAConnector(
+        ConnectorSettings(base_url="https://vendor.test/events", page_size=2, prefetch_pages=3)
+    )
+
+    async def run():
+        connector._client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        events = await connector.fetch(date="2030-01-01")
+        await connector._client._client.aclose()
+        return events
+
+    events = asyncio.run(run())
+
+    assert [event.title for event in events] == [f"Show {page}-{n}" for page in (1, 2, 3) for n in range(2)]
+    assert sorted(requested) == [1, 2, 3]
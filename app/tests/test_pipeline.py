@@ -0,0 +1,123 @@
+"""Tests for the planner stage graph."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.pipeline import StageGraph
+from app.utils.metrics import get_metrics_collector
+
+
+def test_independent_stages_run_concurrently():
+    """Stages without shared dependencies overlap in time"""
+    graph = StageGraph("test")
+
+    async def slow(value):
+        await asyncio.sleep(0.1)
+        return value
+
+    graph.add("left", lambda: slow(2))
+    graph.add("right", lambda: slow(3))
+    graph.add("combine", lambda left, right: left * right, depends_on=("left", "right"))
+
+    start = time.monotonic()
+    results = asyncio.run(graph.run())
+    elapsed = time.monotonic() - start
+
+    assert results == {"left": 2, "right": 3, "combine": 6}
+    assert elapsed < 0.18
+
+
+def test_stage_starts_when_its_own_inputs_are_ready():
+    """A dependant of a fast stage does not wait for unrelated slow stages"""
+    graph = StageGraph("test")
+    finished = {}
+
+    async def sleeper(name, delay):
+        await asyncio.sleep(delay)
+        finished[name] = time.monotonic()
+
+    graph.add("fast", lambda: sleeper("fast", 0.01))
+    graph.add("slow", lambda: sleeper("slow", 0.15))
+    graph.add("after_fast", lambda fast: sleeper("after_fast", 0.01), depends_on=("fast",))
+
+    asyncio.run(graph.run())
+
+    assert finished["after_fast"] < finished["slow"]
+
+
+def test_stage_timings_are_recorded():
+    """Every stage gets its own duration, also exported as a latency metric"""
+    collector = get_metrics_collector()
+    collector.reset()
+    graph = StageGraph("test")
+    graph.add("nap", lambda: asyncio.sleep(0.02))
+
+    asyncio.run(graph.run())
+
+    assert graph.timings_ms["nap"] >= 15
+    assert "test_stage_nap_ms" in collector.get_metrics()
+    collector.reset()
+
+
+def test_graph_rejects_unknown_and_duplicate_stages():
+    """Dependencies must exist before they are referenced"""
+    graph = StageGraph("test")
+    graph.add("a", lambda: 1)
+
+    with pytest.raises(ValueError):
+        graph.add("b", lambda missing: missing, depends_on=("missing",))
+    with pytest.raises(ValueError):
+        graph.add("a", lambda: 2)
+
+
+def test_stage_failure_propagates():
+    """A failing stage fails the run and cancels the rest"""
+    graph = StageGraph("test")
+    cancelled = []
+
+    async def boom():
+        raise RuntimeError("vendor exploded")
+
+    async def long():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    graph.add("boom", boom)
+    graph.add("long", long)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(graph.run())
+    assert cancelled == [True]
+
+
+def test_planner_fetches_dining_alongside_vendors(monkeypatch, planner):
+    """Dining latency overlaps the vendor fetch instead of adding to it"""
+    original_vendor = planner.vendor_a.fetch
+    original_dining = planner.dining.fetch
+
+    async def slow_vendor(*, date, deadline=None):
+        await asyncio.sleep(0.15)
+        return await original_vendor(date=date)
+
+    async def slow_dining(*, date, location=None, deadline=None):
+        await asyncio.sleep(0.15)
+        return await original_dining(date=date)
+
+    monkeypatch.setattr(planner.vendor_a, "fetch", slow_vendor)
+    monkeypatch.setattr(planner.dining, "fetch", slow_dining)
+
+    start = time.monotonic()
+    result = asyncio.run(planner.plan(date="2025-11-09", budget_pp=30, with_dining=True))
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.28
+    assert result.dining
+    assert {"vendor_a", "vendor_b", "fx", "dining", "normalize", "travel", "enrich", "rank"} <= set(
+        result.stage_timings_ms
+    )
@@ -0,0 +1,124 @@
+"""Tests for the in-process plan cache."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.planner import Planner
+from app.utils.cache import LRUCache
+from app.utils.metrics import export_prometheus, get_metrics_collector
+
+
+@pytest.fixture
+def planner(planner, monkeypatch):
+    """Offline planner that counts vendor fetches."""
+    planner.fetches = []
+    original = planner.vendor_a.fetch
+
+    async def counting_fetch(*, date, deadline=None):
+        planner.fetches.append(date)
+        return await original(date=date)
+
+    monkeypatch.setattr(planner.vendor_a, "fetch", counting_fetch)
+    return planner
+
+
+def test_lru_cache_ttl_expiry(clock):
+    """Entries expire after their own TTL"""
+    cache = LRUCache("test", max_weight=10, clock=clock)
+    cache.set("short", 1, ttl_seconds=5)
+    cache.set("long", 2, ttl_seconds=60)
+
+    clock.now += 10
+
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert len(cache) == 1
+
+
+def test_lru_cache_evicts_least_recently_used_by_weight(clock):
+    """The weight cap evicts the least recently used entries first"""
+    cache = LRUCache("test", max_weight=10, clock=clock)
+    cache.set("a", "A", ttl_seconds=60, weight=4)
+    cache.set("b", "B", ttl_seconds=60, weight=4)
+    assert cache.get("a") == "A"  # "b" is now least recently used
+
+    cache.set("c", "C", ttl_seconds=60, weight=4)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.weight == 8
+
+
+def test_lru_cache_skips_oversized_and_ttl_free_entries(clock):
+    """Entries heavier than the cap or without a TTL are not stored"""
+    cache = LRUCache("test", max_weight=10, clock=clock)
+    cache.set("huge", "X", ttl_seconds=60, weight=11)
+    cache.set("no_ttl", "Y", ttl_seconds=0)
+
+    assert len(cache) == 0
+
+
+def test_lru_cache_reports_hit_ratio_per_cache(clock):
+    """Each named cache gets its own hit ratio series"""
+    cache = LRUCache("test", max_weight=10, clock=clock)
+    cache.set("a", 1, ttl_seconds=60)
+    cache.get("a")
+    cache.get("a")
+    cache.get("a")
+    cache.get("missing")
+
+    metrics = get_metrics_collector().get_metrics()
+    assert metrics['cache_hit_ratio{cache="test"}'] == 0.75
+    assert metrics["cache_hit_ratio"] == 0.0
+    assert 'cache_hit_ratio{cache="test"} 0.750000' in export_prometheus()
+
+
+def test_repeat_plan_is_served_from_cache(planner):
+    """The same query within the TTL reuses the cached result"""
+    first = asyncio.run(planner.plan(date="2025-11-09", budget_pp=30.0))
+    second = asyncio.run(planner.plan(date="2025-11-09", budget_pp=30.001))
+
+    assert second is first
+    assert planner.fetches == ["2025-11-09"]
+
+
+def test_close_budgets_are_scored_for_their_own_budget(planner):
+    """Budgets a few cents apart are re-scored, not served each other's ranking"""
+    first = asyncio.run(planner.plan(date="2025-11-09", budget_pp=30.0))
+    second = asyncio.run(planner.plan(date="2025-11-09", budget_pp=30.4))
+    fresh = asyncio.run(Planner(offline_mode=True).plan(date="2025-11-09", budget_pp=30.4))
+
+    assert second is not first
+    assert planner.fetches == ["2025-11-09"]
+    assert [i["score"] for i in second.itineraries] != [i["score"] for i in first.itineraries]
+    assert [(i["title"], i["score"]) for i in second.itineraries] == [
+        (i["title"], i["score"]) for i in fresh.itineraries
+    ]
+
+
+def test_new_budget_rescores_cached_events(planner):
+    """A different budget re-scores without fetching again"""
+    cheap = asyncio.run(planner.plan(date="2025-11-09", budget_pp=20.0))
+    rich = asyncio.run(planner.plan(date="2025-11-09", budget_pp=90.0))
+    metrics = get_metrics_collector().get_metrics()
+    fresh = asyncio.run(Planner(offline_mode=True).plan(date="2025-11-09", budget_pp=90.0))
+
+    assert planner.fetches == ["2025-11-09"]
+    assert metrics['cache_hit_ratio{cache="priced_events"}'] == 0.5
+    assert [i["score"] for i in rich.itineraries] != [i["score"] for i in cheap.itineraries]
+    assert [(i["title"], i["score"]) for i in rich.itineraries] == [
+        (i["title"], i["score"]) for i in fresh.itineraries
+    ]
+
+
+def test_cache_disabled_without_vendor_ttl(planner):
+    """Connectors without cache_ttl_seconds disable plan caching"""
+    planner.settings.connector("ticket_vendor_a").cache_ttl_seconds = None
+
+    asyncio.run(planner.plan(date="2025-11-09", budget_pp=30.0))
+    asyncio.run(planner.plan(date="2025-11-09", budget_pp=30.0))
+
+    assert planner.fetches == ["2025-11-09", "2025-11-09"]
@@ -0,0 +1,98 @@
+"""Tests for batch planning via Planner.plan_many."""
+from __future__ import annotations
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app import server
+from app.services.planner import PlanQuery
+
+
+def _count_calls(monkeypatch, connector) -> list:
+    calls = []
+    original = connector.fetch
+
+    async def counting_fetch(**kwargs):
+        calls.append(kwargs["date"])
+        return await original(**kwargs)
+
+    monkeypatch.setattr(connector, "fetch", counting_fetch)
+    return calls
+
+
+def test_plan_many_matches_plan(planner):
+    """Each batch result is identical to planning the query on its own"""
+    queries = [
+        PlanQuery(date="2025-11-09", budget_pp=20.0),
+        PlanQuery(date="2025-11-09", budget_pp=60.0, with_dining=True),
+        PlanQuery(date="2025-11-10", budget_pp=35.0),
+    ]
+    batch = asyncio.run(planner.plan_many(queries))
+
+    assert len(batch) == len(queries)
+    for query, result in zip(queries, batch):
+        single = asyncio.run(
+            planner.plan(date=query.date, budget_pp=query.budget_pp, with_dining=query.with_dining)
+        )
+        assert [(i["title"], i["score"]) for i in result.itineraries] == [
+            (i["title"], i["score"]) for i in single.itineraries
+        ]
+        assert result.dining == single.dining
+
+
+def test_plan_many_fetches_each_date_once(planner, monkeypatch):
+    """Upstream fetches scale with distinct dates, not with query count"""
+    vendor_a_calls = _count_calls(monkeypatch, planner.vendor_a)
+    vendor_b_calls = _count_calls(monkeypatch, planner.vendor_b)
+    dining_calls = _count_calls(monkeypatch, planner.dining)
+
+    queries = [
+        PlanQuery(date=date, budget_pp=float(budget), with_dining=budget == 50)
+        for date in ("2025-11-08", "2025-11-09")
+        for budget in range(10, 110, 10)
+    ]
+    asyncio.run(planner.plan_many(queries))
+
+    assert sorted(vendor_a_calls) == ["2025-11-08", "2025-11-09"]
+    assert sorted(vendor_b_calls) == ["2025-11-08", "2025-11-09"]
+    assert sorted(dining_calls) == ["2025-11-08", "2025-11-09"]
+
+
+def test_plan_many_only_returns_dining_when_requested(planner):
+    """Dining fetched for one query is not leaked into the others"""
+    results = asyncio.run(
+        planner.plan_many(
+            [
+                PlanQuery(date="2025-11-09", budget_pp=30.0, with_dining=True),
+                PlanQuery(date="2025-11-09", budget_pp=30.0),
+            ]
+        )
+    )
+    assert results[0].dining
+    assert results[1].dining == []
+
+
+def test_plan_batch_endpoint(planner, monkeypatch):
+    """POST /plan/batch returns one result per query, in order"""
+    monkeypatch.setattr(server, "planner", planner)
+    client = TestClient(server.app)
+
+    response = client.post(
+        "/plan/batch",
+        json={"queries": [{"date": "2025-11-09", "budget": 25}, {"date": "2025-11-09", "budget": 80}]},
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["budget"] for r in results] == [25, 80]
+    assert all("total_pp" in i for r in results for i in r["itineraries"])
+
+
+def test_plan_batch_endpoint_validation():
+    """Malformed batches are rejected before planning"""
+    client = TestClient(server.app)
+
+    assert client.post("/plan/batch", json={"queries": []}).status_code == 400
+    assert client.post("/plan/batch", json={"queries": [{"date": "2025-11-09"}]}).status_code == 400
+    assert client.post("/plan/batch", json={"queries": [{"date": "2025-11-09", "budget": 0}]}).status_code == 400
@@ -0,0 +1,75 @@
+"""Tests for the streaming planner and its SSE endpoint."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from app import server
+
+
+async def _collect(agen):
+    return [item async for item in agen]
+
+
+def test_stream_final_snapshot_matches_plan(planner):
+    """The complete snapshot equals the top-N of a regular plan"""
+    snapshots = asyncio.run(
+        _collect(planner.plan_stream(date="2025-11-09", budget_pp=40.0, with_dining=True, top_n=2))
+    )
+    result = asyncio.run(planner.plan(date="2025-11-09", budget_pp=40.0, with_dining=True))
+
+    final = snapshots[-1]
+    assert final.complete
+    assert all(not snapshot.complete for snapshot in snapshots[:-1])
+    assert [(i["title"], i["score"]) for i in final.itineraries] == [
+        (i["title"], i["score"]) for i in result.itineraries[:2]
+    ]
+    assert final.dining == result.dining
+    assert final.events_seen == len(result.itineraries)
+
+
+def test_stream_first_snapshot_does_not_wait_for_slow_vendor(planner, monkeypatch):
+    """A fast vendor page is ranked while the slow vendor is still pending"""
+    original_pages = planner.vendor_b.fetch_pages
+
+    async def slow_pages(*, date):
+        await asyncio.sleep(0.5)
+        async for page in original_pages(date=date):
+            yield page
+
+    monkeypatch.setattr(planner.vendor_b, "fetch_pages", slow_pages)
+
+    async def first_snapshot():
+        start = time.monotonic()
+        stream = planner.plan_stream(date="2025-11-09", budget_pp=40.0)
+        snapshot = await stream.__anext__()
+        elapsed = time.monotonic() - start
+        await stream.aclose()
+        return snapshot, elapsed
+
+    snapshot, elapsed = asyncio.run(first_snapshot())
+
+    assert elapsed < 0.4
+    assert snapshot.pending_sources == ["vendor_b"]
+    assert snapshot.itineraries
+    assert all(i["provider"] == "vendor_a" for i in snapshot.itineraries)
+
+
+def test_plan_stream_endpoint(planner, monkeypatch):
+    """GET /plan/stream emits SSE snapshots followed by a complete event"""
+    monkeypatch.setattr(server, "planner", planner)
+    client = TestClient(server.app)
+
+    response = client.get("/plan/stream", params={"date": "2025-11-09", "budget": 40, "top_n": 1})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block for block in response.text.split("\n\n") if block]
+    assert events[-1].startswith("event: complete")
+    assert all(block.startswith("event: snapshot") for block in events[:-1])
+    final = json.loads(events[-1].split("data: ", 1)[1])
+    assert len(final["itineraries"]) == 1
+    assert "total_pp" in final["itineraries"][0]
@@ -0,0 +1,85 @@
+"""Tests for top-K ranking."""
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pytest
+
+from app.normalizers.price import PriceTable
+
+RATES = {"EUR": 1.0, "USD": 1.08, "GBP": 0.86}
+
+
+def make_events(count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    events = []
+    for index in range(count):
+        currency = rng.choice(list(RATES))
+        promos = []
+        if rng.random() < 0.3:
+            promos.append({"code": "PCT", "type": "percent", "value": rng.choice([5, 10, 25])})
+        if rng.random() < 0.2:
+            promos.append({"code": "FIX", "type": "fixed", "value": rng.uniform(1, 8), "currency": rng.choice(list(RATES))})
+        events.append(
+            {
+                "provider": "vendor_a",
+                "title": f"Event {index}",
+                "start_ts": f"2030-06-{rng.randint(1, 28):02d}T20:00:00Z",
+                "venue": "Hall",
+                "city": rng.choice(["Berlin", "Paris", "Lisbon", "Atlantis"]),
+                "url": f"https://example.com/{index}",
+                "price": {"amount": round(rng.uniform(5, 120), 2), "currency": currency, "includes_vat": rng.random() < 0.5},
+                "fees": [{"label": "Service", "amount": round(rng.uniform(0, 6), 2), "currency": currency}],
+                "vat_rate": rng.choice([0.0, 0.1, 0.2]),
+                "promos": promos,
+                "inventory_hint": rng.choice(["low", "medium", "high", "unknown"]),
+            }
+        )
+    return events
+
+
+@pytest.fixture
+def planner(planner, monkeypatch):
+    """Offline planner whose vendors return a large synthetic catalogue."""
+    planner.fx._memory_cache = dict(RATES)
+    events = make_events(400)
+
+    async def vendor_a_fetch(*, date, deadline=None):
+        return events[:250]
+
+    async def vendor_b_fetch(*, date, deadline=None):
+        return events[250:]
+
+    monkeypatch.setattr(planner.vendor_a, "fetch", vendor_a_fetch)
+    monkeypatch.setattr(planner.vendor_b, "fetch", vendor_b_fetch)
+    return planner
+
+
+@pytest.mark.parametrize("budget", [10.0, 35.0, 80.0, 500.0])
+@pytest.mark.parametrize("limit", [1, 3, 10])
+def test_limit_matches_full_ranking(planner, budget, limit):
+    """Top-K results equal the head of the fully sorted ranking"""
+    full = asyncio.run(planner.plan(date="2030-06-01", budget_pp=budget))
+    top = asyncio.run(planner.plan(date="2030-06-01", budget_pp=budget, limit=limit))
+
+    assert [(i["title"], i["score"]) for i in top.itineraries] == [
+        (i["title"], i["score"]) for i in full.itineraries[:limit]
+    ]
+
+
+def test_limit_builds_breakdowns_only_for_results(planner, monkeypatch):
+    """Events outside the top K never get a PriceBreakdown view"""
+    calls = []
+    original = PriceTable.breakdown
+
+    def counting_breakdown(self, index):
+        calls.append(index)
+        return original(self, index)
+
+    monkeypatch.setattr(PriceTable, "breakdown", counting_breakdown)
+
+    result = asyncio.run(planner.plan(date="2030-06-01", budget_pp=200.0, limit=3))
+
+    assert len(result.itineraries) == 3
+    assert len(calls) == 3
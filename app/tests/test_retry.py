@@ -0,0 +1,121 @@
+"""Tests for retry budgets, jittered backoff and Retry-After handling."""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+import httpx
+import pytest
+
+from app.utils.http import HttpClient
+from app.utils.metrics import get_metrics_collector
+from app.utils.retry import RetryBudget, decorrelated_jitter, retry_after_seconds
+
+HOST = "vendor.test"
+URL = f"https://{HOST}/events"
+
+
+def retries(outcome: str) -> float:
+    return get_metrics_collector().get_counters().get(
+        ("http_retries_total", (("host", HOST), ("outcome", outcome))), 0
+    )
+
+
+def run(client: HttpClient, handler):
+    calls = []
+
+    def counting(request):
+        calls.append(time.monotonic())
+        return handler(len(calls))
+
+    async def go():
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(counting))
+        try:
+            return await client.request("GET", URL)
+        finally:
+            await client._client.aclose()
+
+    return asyncio.run(go()), calls
+
+
+def test_budget_allows_retries_in_proportion_to_successes():
+    budget = RetryBudget(ratio=0.25, max_tokens=2)
+
+    assert budget.try_spend(HOST) and budget.try_spend(HOST)
+    assert not budget.try_spend(HOST)
+    for _ in range(4):
+        budget.deposit(HOST)
+
+    assert budget.try_spend(HOST)
+    assert not budget.try_spend(HOST)
+
+
+def test_decorrelated_jitter_stays_in_bounds():
+    rng = random.Random(7)
+    delay = 0.0
+    for _ in range(50):
+        previous, delay = delay, decorrelated_jitter(delay, base=0.1, cap=2.0, rng=rng)
+        assert 0.1 <= delay <= min(2.0, max(previous, 0.1) * 3)
+    assert decorrelated_jitter(1.0, base=0, cap=2.0) == 0.0
+
+
+def test_first_retry_delays_are_spread_out():
+    """Callers failing at the same moment don't all retry after exactly ``base``"""
+    delays = [decorrelated_jitter(0.0, base=0.5, cap=10.0, rng=random.Random(seed)) for seed in range(20)]
+
+    assert all(0.5 <= delay <= 1.5 for delay in delays)
+    assert len(set(delays)) == len(delays)
+    assert max(delays) - min(delays) > 0.5
+
+
+def test_retry_after_seconds_and_http_date():
+    request = httpx.Request("GET", URL)
+
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "3"}, request=request)) == 3
+    assert retry_after_seconds(
+        httpx.Response(503, headers={"Retry-After": "Wed, 21 Oct 2037 07:28:10 GMT"}, request=request),
+        now=2139722880.0,
+    ) == pytest.approx(10)
+    assert retry_after_seconds(httpx.Response(500, headers={"Retry-After": "3"}, request=request)) is None
+
+
+def test_retry_after_is_honoured_on_429():
+    client = HttpClient(retries=2, backoff_factor=0, retry_budget=RetryBudget())
+
+    response, calls = run(
+        client, lambda n: httpx.Response(429, headers={"Retry-After": "0"}) if n == 1 else httpx.Response(200)
+    )
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+    assert retries("allowed") == 1
+
+
+def test_long_retry_after_gives_up_without_retrying():
+    client = HttpClient(retries=2, backoff_factor=0, max_retry_after=1, retry_budget=RetryBudget())
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run(client, lambda n: httpx.Response(503, headers={"Retry-After": "120"}))
+
+
+def test_exhausted_budget_denies_retries():
+    budget = RetryBudget(max_tokens=1)
+    client = HttpClient(retries=5, backoff_factor=0, retry_budget=budget)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run(client, lambda n: httpx.Response(502))
+
+    assert retries("allowed") == 1
+    assert retries("denied") == 1
+
+
+def test_successes_refill_the_budget():
+    budget = RetryBudget(ratio=0.5, max_tokens=1)
+    budget.try_spend(HOST)
+    client = HttpClient(retries=0, retry_budget=budget)
+
+    run(client, lambda n: httpx.Response(200))
+    run(client, lambda n: httpx.Response(200))
+
+    assert budget.tokens(HOST) == 1.0
@@ -0,0 +1,158 @@
+"""Tests for the vectorised scoring API against the scalar reference."""
+from __future__ import annotations
+
+import asyncio
+import random
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.normalizers.price import PriceBreakdown
+from app.ranking.scorer import (
+    INVENTORY_CODES,
+    buy_now_batch,
+    buy_now_heuristic,
+    buy_now_reason,
+    days_until,
+    days_until_batch,
+    inventory_codes,
+    score_batch,
+    score_itinerary,
+)
+from app.services.planner import Planner
+from app.utils.timestamps import parse_epoch
+
+SETTINGS = {
+    "price_drop_days_threshold": 5,
+    "price_drop_low_inventory_bonus": 0.25,
+    "price_drop_high_inventory_penalty": -0.1,
+}
+
+
+def _price(total: float) -> PriceBreakdown:
+    return PriceBreakdown(
+        base=total, vat=0.0, fees=0.0, promos=0.0, total=total, currency="EUR", components={}, promo_applied=None
+    )
+
+
+def test_score_batch_matches_scalar_bit_for_bit():
+    """Every vectorised score equals score_itinerary exactly"""
+    rng = random.Random(1234)
+    n = 5000
+    totals = [rng.choice([0.0, 0.5, 1.0]) if i % 50 == 0 else rng.uniform(0, 400) for i in range(n)]
+    budgets = [rng.choice([-5.0, 0.0, 30.0, 80.0, rng.uniform(1, 300)]) for _ in range(n)]
+    buy_now = [rng.random() < 0.5 for _ in range(n)]
+    days = [rng.randint(0, 60) for _ in range(n)]
+    distances = [rng.choice([0.0, rng.uniform(0, 8000)]) for _ in range(n)]
+    co2 = [rng.choice([0.0, rng.uniform(0, 200)]) for _ in range(n)]
+
+    batch = score_batch(
+        totals=np.array(totals),
+        budget_pp=np.array(budgets),
+        buy_now=np.array(buy_now),
+        days_to_event=np.array(days),
+        distance_km=np.array(distances),
+        co2_kg_pp=np.array(co2),
+    )
+    scalar = [
+        score_itinerary(
+            price=_price(totals[i]),
+            budget_pp=budgets[i],
+            buy_now=buy_now[i],
+            days_to_event=days[i],
+            distance_km=distances[i],
+            co2_kg_pp=co2[i],
+        )
+        for i in range(n)
+    ]
+
+    assert batch.tolist() == scalar
+
+
+def test_score_batch_broadcasts_scalar_budget():
+    scores = score_batch(
+        totals=np.array([10.0, 50.0]), budget_pp=30.0, buy_now=np.array([False, True]), days_to_event=np.array([3, 30])
+    )
+    assert scores.tolist() == [
+        score_itinerary(price=_price(10.0), budget_pp=30.0, buy_now=False, days_to_event=3),
+        score_itinerary(price=_price(50.0), budget_pp=30.0, buy_now=True, days_to_event=30),
+    ]
+
+
+def test_buy_now_batch_matches_scalar():
+    """Decisions and reasons match buy_now_heuristic for every branch"""
+    hints = ["unknown", "low", "med", "high", "sold_out"]
+    cases = [(hint, days, variance) for hint in hints for days in (0, 5, 6, 30) for variance in (0.0, 0.1, 0.2)]
+
+    buy_now, reasons = buy_now_batch(
+        inventory_codes=inventory_codes(hint for hint, _, _ in cases),
+        days_to_event=np.array([days for _, days, _ in cases]),
+        price_variance=np.array([variance for _, _, variance in cases]),
+        settings=SETTINGS,
+    )
+
+    expected = [
+        buy_now_heuristic(inventory_hint=hint, days_to_event=days, price_variance=variance, settings=SETTINGS)
+        for hint, days, variance in cases
+    ]
+    assert [
+        (bool(buy), buy_now_reason(int(code), SETTINGS)) for buy, code in zip(buy_now, reasons)
+    ] == expected
+
+
+def test_unknown_inventory_hints_encode_as_unknown():
+    assert inventory_codes(["low", "bogus"]).tolist() == [INVENTORY_CODES["low"], INVENTORY_CODES["unknown"]]
+
+
+def test_planner_batch_path_matches_scalar_scores(planner):
+    """Planner scores from the batch path equal the per-candidate reference"""
+    result = asyncio.run(planner.plan(date="2025-11-09", budget_pp=30))
+
+    assert result.itineraries
+    for itinerary in result.itineraries:
+        days = days_until(itinerary["start_ts"])
+        buy_now, reason = buy_now_heuristic(
+            inventory_hint="unknown", days_to_event=days, price_variance=0.0, settings=planner._buy_now_settings()
+        )
+        assert itinerary["score"] == score_itinerary(
+            price=itinerary["price"],
+            budget_pp=30,
+            buy_now=itinerary["buy_now"],
+            days_to_event=days,
+            distance_km=itinerary["distance_km"],
+            co2_kg_pp=itinerary["co2_kg_pp"],
+        )
+        if days <= 5:
+            assert (itinerary["buy_now"], itinerary["buy_reason"]) == (buy_now, reason)
+
+
+def test_days_until_accepts_epochs_and_strings():
+    """String and epoch timestamps count whole days from the same reference"""
+    reference = datetime(2025, 11, 1, 12, 0, tzinfo=timezone.utc)
+    start = "2025-11-09T19:00:00Z"
+
+    assert days_until(start, reference) == 8
+    assert days_until(parse_epoch(start), reference.timestamp()) == 8
+    assert days_until("2025-10-01T00:00:00Z", reference) == 0
+    assert days_until_batch(np.array([parse_epoch(start), 0]), reference).tolist() == [8, 0]
+
+
+def test_parse_epoch_is_cached():
+    parse_epoch.cache_clear()
+    parse_epoch("2025-11-09T19:00:00Z")
+    parse_epoch("2025-11-09T19:00:00Z")
+
+    assert parse_epoch.cache_info().hits == 1
+
+
+def test_planner_clock_is_injectable(tmp_path, monkeypatch):
+    """A fixed clock makes days-to-event, and so buy-now, deterministic"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    long_before = datetime(2025, 6, 1, tzinfo=timezone.utc).timestamp()
+    day_before = datetime(2025, 11, 8, tzinfo=timezone.utc).timestamp()
+
+    early = asyncio.run(Planner(offline_mode=True, clock=lambda: long_before).plan(date="2025-11-09", budget_pp=30))
+    late = asyncio.run(Planner(offline_mode=True, clock=lambda: day_before).plan(date="2025-11-09", budget_pp=30))
+
+    assert not any(reason.startswith("Event happening soon") for reason in (i["buy_reason"] for i in early.itineraries))
+    assert all(i["buy_reason"].startswith("Event happening soon") for i in late.itineraries)
@@ -0,0 +1,110 @@
+"""Tests for the JSON serialization layer."""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import MappingProxyType
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import server
+from app.normalizers.price import PriceBreakdown
+from app.utils import serialization
+from app.utils.cache import SimpleCache
+from app.utils.share import ShareManager
+
+
+@dataclass
+class Point:
+    x: int
+    y: float
+
+
+def price() -> PriceBreakdown:
+    return PriceBreakdown(base=20.0, vat=4.6, fees=1.5, promos=-2.0, total=24.1, currency="EUR")
+
+
+PAYLOAD = {
+    "price": price(),
+    "point": Point(1, 2.5),
+    "score": np.float64(0.75),
+    "count": np.int64(3),
+    "scores": np.array([1.0, 2.0]),
+    "rates": MappingProxyType({"EUR": 1.0}),
+    "at": datetime(2025, 11, 9, 20, 0, tzinfo=timezone.utc),
+    "title": "Fado – Alfama",
+    "nested": [{"ok": True, "none": None}],
+}
+
+EXPECTED = {
+    "price": price().to_dict(),
+    "point": {"x": 1, "y": 2.5},
+    "score": 0.75,
+    "count": 3,
+    "scores": [1.0, 2.0],
+    "rates": {"EUR": 1.0},
+    "at": "2025-11-09T20:00:00+00:00",
+    "title": "Fado – Alfama",
+    "nested": [{"ok": True, "none": None}],
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        if not serialization.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+
+def test_backends_agree_on_supported_types(backend):
+    encoded = serialization.dumps(PAYLOAD)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == EXPECTED
+    assert serialization.loads(encoded) == EXPECTED
+
+
+def test_compact_pretty_and_sorted_output(backend):
+    assert serialization.dumps({"b": 1, "a": [1, 2]}) == b'{"b":1,"a":[1,2]}'
+    assert serialization.dumps({"b": 1, "a": 2}, sort_keys=True) == b'{"a":2,"b":1}'
+    assert serialization.dumps({"a": 1}, pretty=True) == b'{\n  "a": 1\n}'
+
+
+def test_unsupported_types_and_bad_input_raise(backend):
+    with pytest.raises(TypeError):
+        serialization.dumps({"x": object()})
+    with pytest.raises(ValueError):
+        serialization.loads(b"{not json")
+
+
+def test_cache_and_share_files_round_trip(tmp_path, backend):
+    cache = SimpleCache(cache_dir=str(tmp_path / "cache"))
+    cache.set("weather", {"desc": "Sunny", "temp_c": 22.5})
+    shares = ShareManager(shared_dir=tmp_path / "shared")
+    plan_id = shares.save_plan({"itineraries": [{"title": "Fado – Alfama"}]})
+
+    assert cache.get("weather", ttl_seconds=60) == {"desc": "Sunny", "temp_c": 22.5}
+    assert shares.get_plan(plan_id)["data"] == {"itineraries": [{"title": "Fado – Alfama"}]}
+
+
+def test_plan_endpoint_returns_encoded_bytes(monkeypatch, planner):
+    monkeypatch.setattr(server, "planner", planner)
+    client = TestClient(server.app)
+
+    response = client.get("/plan", params={"date": "2025-11-09", "budget": 60})
+    debug = client.get("/plan/debug", params={"date": "2025-11-09", "budget": 60})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    itineraries = response.json()["itineraries"]
+    assert itineraries
+    for itinerary in itineraries:
+        assert set(itinerary["price"]) == set(price().to_dict())
+        assert itinerary["total_pp"] == itinerary["price"]["total"]
+    assert debug.json()["itineraries"][0]["breakdown"] == itineraries[0]["price"]["components"]
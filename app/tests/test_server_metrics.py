@@ -5,7 +5,6 @@ Tests for metrics endpoint in the server.
 import pytest
 from fastapi.testclient import TestClient
 from app.server import app
-from app.utils.metrics import get_metrics_collector
 
 
 @pytest.fixture
@@ -14,15 +13,6 @@ def client():
     return TestClient(app)
 
 
-@pytest.fixture(autouse=True)
-def reset_metrics():
-    """Reset metrics before each test"""
-    collector = get_metrics_collector()
-    collector.reset()
-    yield
-    collector.reset()
-
-
 def test_metrics_endpoint_exists(client):
     """Test that /metrics endpoint exists and returns 200"""
     response = client.get("/metrics")
@@ -0,0 +1,228 @@
+"""Tests for single-flight request coalescing."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.utils.deadline import Deadline, DeadlineExceeded
+from app.utils.http import HttpClient
+from app.utils.metrics import get_metrics_collector
+from app.utils.singleflight import SingleFlight
+from app.utils.transport import get_transport_pool
+
+
+def test_concurrent_callers_share_one_call():
+    """Callers with the same key await a single computation"""
+    flight = SingleFlight("test")
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"value": 42}
+
+    async def run():
+        return await asyncio.gather(*(flight.do("k", compute) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.inflight() == 0
+    metrics = get_metrics_collector().get_metrics()
+    assert metrics["test_singleflight_leaders_total"] == 1
+    assert metrics["test_singleflight_coalesced_total"] == 4
+
+
+def test_different_keys_do_not_coalesce():
+    """Distinct keys run independently"""
+    flight = SingleFlight("test")
+    calls = []
+
+    async def compute(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    async def run():
+        return await asyncio.gather(*(flight.do(key, lambda key=key: compute(key)) for key in "abc"))
+
+    assert asyncio.run(run()) == ["a", "b", "c"]
+    assert sorted(calls) == ["a", "b", "c"]
+
+
+def test_exception_is_shared_and_key_released():
+    """Every waiter sees the failure and the next call starts afresh"""
+    flight = SingleFlight("test")
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    async def run():
+        results = await asyncio.gather(flight.do("k", boom), flight.do("k", boom), return_exceptions=True)
+        again = await flight.do("k", lambda: asyncio.sleep(0, result="ok"))
+        return results, again
+
+    results, again = asyncio.run(run())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert again == "ok"
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    """The shared computation survives one waiter being cancelled"""
+    flight = SingleFlight("test")
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("k", compute))
+        second = asyncio.ensure_future(flight.do("k", compute))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "done"
+
+
+def test_planner_coalesces_identical_plans(monkeypatch, planner):
+    """Concurrent identical plan() calls fetch vendors once"""
+    fetches = []
+    original = planner.vendor_a.fetch
+
+    async def slow_fetch(*, date, deadline=None):
+        fetches.append(date)
+        await asyncio.sleep(0.05)
+        return await original(date=date)
+
+    monkeypatch.setattr(planner.vendor_a, "fetch", slow_fetch)
+
+    async def run():
+        return await asyncio.gather(
+            *(planner.plan(date="2025-11-09", budget_pp=30) for _ in range(8)),
+            planner.plan(date="2025-11-09", budget_pp=45),
+        )
+
+    results = asyncio.run(run())
+
+    assert len(fetches) == 2
+    assert all(result is results[0] for result in results[:8])
+    assert results[8] is not results[0]
+    assert get_metrics_collector().get_metrics()["plan_singleflight_coalesced_total"] == 7
+
+
+def http_client(handler, **kwargs) -> HttpClient:
+    async def slow(request):
+        await asyncio.sleep(0.05)
+        return handler(request)
+
+    client = HttpClient(retries=0, **kwargs)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(slow))
+    return client
+
+
+def test_http_client_coalesces_identical_gets():
+    """Concurrent GETs for the same URL and params share one request"""
+    seen = []
+    client = http_client(lambda request: seen.append(request) or httpx.Response(200, json={"rate": 1.1}))
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *(client.get_json("https://fx.test/latest", params={"base": "EUR"}) for _ in range(4)),
+                client.get_json("https://fx.test/latest", params={"base": "USD"}),
+                client.request("POST", "https://fx.test/latest"),
+            )
+        finally:
+            await client._client.aclose()
+
+    results = asyncio.run(run())
+
+    assert [request.method for request in seen].count("GET") == 2
+    assert results[:4] == [{"rate": 1.1}] * 4
+    counters = get_metrics_collector().get_counters()
+    assert counters[("http_singleflight_coalesced_total", (("host", "fx.test"),))] == 3
+    assert counters[("http_singleflight_leaders_total", (("host", "fx.test"),))] == 2
+
+
+def test_http_client_keeps_differently_authorised_gets_apart():
+    """Headers are part of the key, so credentials never leak between callers"""
+    seen = []
+    client = http_client(lambda request: seen.append(request) or httpx.Response(200))
+
+    async def run():
+        try:
+            await asyncio.gather(
+                client.request("GET", "https://vendor.test/events", headers={"Authorization": "Bearer a"}),
+                client.request("GET", "https://vendor.test/events", headers={"Authorization": "Bearer b"}),
+            )
+        finally:
+            await client._client.aclose()
+
+    asyncio.run(run())
+
+    assert len(seen) == 2
+
+
+def test_http_client_coalescing_can_be_disabled():
+    seen = []
+    client = http_client(lambda request: seen.append(request) or httpx.Response(200), coalesce=False)
+
+    async def run():
+        try:
+            await asyncio.gather(*(client.request("GET", "https://vendor.test/events") for _ in range(3)))
+        finally:
+            await client._client.aclose()
+
+    asyncio.run(run())
+
+    assert len(seen) == 3
+
+
+def test_follower_without_deadline_outlives_a_cut_off_leader():
+    """A leader cut off by its deadline does not fail a follower that has none"""
+    client = http_client(lambda request: httpx.Response(200, json={"ok": True}))
+
+    async def run():
+        try:
+            leader = asyncio.ensure_future(client.get_json("https://fx.test/latest", deadline=Deadline(0.02)))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(client.get_json("https://fx.test/latest"))
+            return await asyncio.gather(leader, follower, return_exceptions=True)
+        finally:
+            await client._client.aclose()
+
+    leader, follower = asyncio.run(run())
+
+    assert isinstance(leader, DeadlineExceeded)
+    assert follower == {"ok": True}
+
+
+def test_follower_with_short_deadline_stops_waiting_on_time():
+    """A follower gives up at its own deadline while the leader carries on"""
+    client = http_client(lambda request: httpx.Response(200, json={"ok": True}))
+
+    async def run():
+        # Build the shared transport up front; its first use blocks the loop.
+        get_transport_pool().limiter("fx.test", client.bulkhead)
+        try:
+            leader = asyncio.ensure_future(client.get_json("https://fx.test/latest"))
+            await asyncio.sleep(0)
+            started = time.monotonic()
+            with pytest.raises(DeadlineExceeded):
+                await client.get_json("https://fx.test/latest", deadline=Deadline(0.01))
+            waited = time.monotonic() - started
+            return await leader, waited
+        finally:
+            await client._client.aclose()
+
+    result, waited = asyncio.run(run())
+
+    assert result == {"ok": True}
+    assert waited < 0.04
@@ -0,0 +1,101 @@
+"""Tests for the shared HTTP transport pool."""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from app.config import TransportSettings
+from app.utils.http import HttpClient
+from app.utils.transport import TransportPool, get_transport_pool
+
+
+def test_one_client_per_loop_shared_by_all_callers():
+    pool = TransportPool()
+
+    async def clients():
+        first, second = pool.client(), pool.client()
+        await pool.aclose()
+        return first, second
+
+    first, second = asyncio.run(clients())
+    third, _ = asyncio.run(clients())
+
+    assert first is second
+    assert third is not first
+    assert first.is_closed and third.is_closed
+
+
+def test_closed_client_is_replaced():
+    pool = TransportPool()
+
+    async def run():
+        first = pool.client()
+        await pool.aclose()
+        second = pool.client()
+        await pool.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is not second
+
+
+def test_pool_limits_come_from_settings():
+    pool = TransportPool(TransportSettings(max_connections=7, max_keepalive_connections=3, http2=True))
+
+    async def run():
+        client = pool.client()
+        transport = client._transport
+        await pool.aclose()
+        return transport
+
+    transport = asyncio.run(run())
+
+    assert transport._pool._max_connections == 7
+    assert transport._pool._max_keepalive_connections == 3
+
+
+def test_limiters_cap_concurrency_per_bulkhead_and_host():
+    pool = TransportPool(TransportSettings(max_connections_per_host=2))
+    keys = [("vendor_a", "vendor.test")] * 5 + [("dining", "vendor.test")] * 5
+    active = {key: 0 for key in keys}
+    peak = {key: 0 for key in keys}
+
+    async def call(key):
+        bulkhead, host = key
+        limiter = pool.limiter(host, bulkhead)
+        await limiter.acquire()
+        active[key] += 1
+        peak[key] = max(peak[key], active[key])
+        await asyncio.sleep(0.01)
+        active[key] -= 1
+        limiter.release(0.01, ok=True)
+
+    async def run():
+        await asyncio.gather(*(call(key) for key in keys))
+        await pool.aclose()
+
+    asyncio.run(run())
+
+    assert peak == {("vendor_a", "vendor.test"): 2, ("dining", "vendor.test"): 2}
+
+
+def test_http_clients_share_the_pooled_client(monkeypatch):
+    """Separate connectors' HttpClients send through one pooled client"""
+    seen = []
+    transport = httpx.MockTransport(lambda request: seen.append(request.url.host) or httpx.Response(200, json={}))
+    pool = get_transport_pool()
+    monkeypatch.setattr(pool, "_build_client", lambda: httpx.AsyncClient(transport=transport))
+
+    async def run():
+        await HttpClient().get_json("https://vendor-a.test/events")
+        await HttpClient().get_json("https://vendor-b.test/events")
+        client = pool.client()
+        await pool.aclose()
+        return client
+
+    client = asyncio.run(run())
+
+    assert seen == ["vendor-a.test", "vendor-b.test"]
+    assert client.is_closed
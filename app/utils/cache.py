@@ -2,10 +2,14 @@
 import json
 import sys
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Any, Callable
+from typing import Optional, Any, Callable, Hashable
 from datetime import datetime, timezone
 
+from app.utils.metrics import record_cache_hit, record_cache_miss
+from app.utils.serialization import dumps, loads
+
 class SimpleCache:
     """Simple file-based cache with TTL support"""
     
@@ -36,7 +40,7 @@ class SimpleCache:
             return None
         
         try:
-            data = json.loads(cache_file.read_text())
+            data = loads(cache_file.read_bytes())
             cached_time = datetime.fromisoformat(data["timestamp"])
             age = (datetime.now(timezone.utc) - cached_time).total_seconds()
             
@@ -68,7 +72,7 @@ class SimpleCache:
             "value": value,
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
-        cache_file.write_text(json.dumps(data))
+        cache_file.write_bytes(dumps(data))
         print(f"[CACHE] SET: {key}", file=sys.stderr)
     
     def clear(self, key: Optional[str] = None) -> None:
@@ -87,6 +91,82 @@ class SimpleCache:
                 cache_file.unlink()
 
 
+class LRUCache:
+    """In-memory cache with per-entry TTL and LRU eviction under a weight cap"""
+    
+    def __init__(self, name: str, max_weight: int, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize an in-memory cache.
+        
+        Args:
+            name: Cache name used for the per-cache hit ratio in /metrics
+            max_weight: Upper bound on the summed weight of all entries
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.name = name
+        self.max_weight = max_weight
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple[float, int, Any]]" = OrderedDict()
+        self._weight = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a fresh value and mark it as most recently used.
+        
+        Returns:
+            Cached value or None if expired/missing
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            record_cache_miss(self.name)
+            return None
+        expires_at, weight, value = entry
+        if expires_at <= self._clock():
+            self._remove(key)
+            record_cache_miss(self.name)
+            return None
+        self._entries.move_to_end(key)
+        record_cache_hit(self.name)
+        return value
+    
+    def set(self, key: Hashable, value: Any, *, ttl_seconds: float, weight: int = 1) -> None:
+        """
+        Store a value, evicting least recently used entries beyond the cap.
+        
+        Args:
+            key: Cache key
+            value: Value to cache (kept by reference)
+            ttl_seconds: Time to live; non-positive values skip caching
+            weight: Cost of the entry against max_weight (e.g. number of events)
+        """
+        if ttl_seconds <= 0 or weight > self.max_weight:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (self._clock() + ttl_seconds, weight, value)
+        self._weight += weight
+        while self._weight > self.max_weight:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self._weight = 0
+    
+    @property
+    def weight(self) -> int:
+        """Summed weight of the cached entries."""
+        return self._weight
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _remove(self, key: Hashable) -> None:
+        _, weight, _ = self._entries.pop(key)
+        self._weight -= weight
+
+
 # Global cache instance
 _cache = SimpleCache()
 
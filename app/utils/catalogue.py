@@ -0,0 +1,201 @@
+"""Persistent local catalogue of vendor events backed by SQLite."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import time
+from collections import OrderedDict
+from datetime import date as date_cls, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.utils.metrics import record_counter
+from app.utils.timestamps import try_parse_epoch
+
+LOGGER = logging.getLogger(__name__)
+
+CATALOGUE_FILENAME = "events.sqlite3"
+
+# Pages whose last stored content is remembered, so refetching one is free.
+_PAGE_DIGESTS = 4096
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    provider TEXT NOT NULL,
+    event_key TEXT NOT NULL,
+    date TEXT NOT NULL,
+    city TEXT,
+    start_epoch INTEGER,
+    payload TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (provider, event_key)
+);
+CREATE INDEX IF NOT EXISTS events_date_city_provider ON events (date, city, provider);
+"""
+
+# Without statistics SQLite prefers the primary key's provider prefix, which
+# scans every date a provider has ever had; reads are always date ranges.
+_BY_DATE = "INDEXED BY events_date_city_provider"
+
+_UPSERT = """
+INSERT INTO events (provider, event_key, date, city, start_epoch, payload, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (provider, event_key) DO UPDATE SET
+    date = excluded.date,
+    city = excluded.city,
+    start_epoch = excluded.start_epoch,
+    payload = excluded.payload,
+    updated_at = excluded.updated_at
+"""
+
+
+class EventCatalogue:
+    """
+    Raw vendor events keyed by provider and vendor id, indexed on
+    ``(date, city, provider)``.
+
+    Connectors store every changed page they fetch live and read it back in offline
+    or degraded mode, so those modes reflect the latest real data rather than
+    the bundled samples. Records are stored as the vendor sent them and are
+    normalised by the connector on the way out, exactly like live pages.
+
+    The database runs in WAL mode so readers in other processes are never
+    blocked by a connector writing a page.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._page_digests: "OrderedDict[Tuple[str, str, int], str]" = OrderedDict()
+
+    def upsert(self, provider: str, events: Iterable[Mapping[str, Any]], *, date: str) -> int:
+        """Insert or refresh ``events`` fetched for ``date``; returns the row count.
+
+        Each event is filed under the date of its own ``start`` timestamp,
+        falling back to the requested ``date``.
+        """
+        return self._write(provider, self._rows(provider, events, date))
+
+    def upsert_page(self, provider: str, events: Iterable[Mapping[str, Any]], *, date: str, page: int) -> int:
+        """Like :meth:`upsert` for one vendor page, but skip the write if the page is unchanged.
+
+        Pages served again from the HTTP cache, or revalidated unchanged,
+        then cost no write. Returns the number of rows written.
+        """
+        rows = self._rows(provider, events, date)
+        digest = hashlib.sha256("\n".join(row[5] for row in rows).encode("utf-8")).hexdigest()
+        key = (provider, date[:10], page)
+        with self._lock:
+            if self._page_digests.get(key) == digest:
+                self._page_digests.move_to_end(key)
+                return 0
+        written = self._write(provider, rows)
+        with self._lock:
+            self._page_digests[key] = digest
+            self._page_digests.move_to_end(key)
+            while len(self._page_digests) > _PAGE_DIGESTS:
+                self._page_digests.popitem(last=False)
+        return written
+
+    def _rows(self, provider: str, events: Iterable[Mapping[str, Any]], date: str) -> List[tuple]:
+        now = time.time()
+        rows = [self._row(provider, event, date, now) for event in events]
+        return [row for row in rows if row is not None]
+
+    def _write(self, provider: str, rows: List[tuple]) -> int:
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(_UPSERT, rows)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        record_counter("catalogue_upserts_total", len(rows), labels={"provider": provider})
+        return len(rows)
+
+    def count(self, provider: str, *, date_from: str, date_to: str | None = None, city: str | None = None) -> int:
+        where, params = self._where(provider, date_from, date_to, city)
+        sql = f"SELECT COUNT(*) FROM events {_BY_DATE} WHERE {where}"
+        with self._lock:
+            (total,) = self._conn.execute(sql, params).fetchone()
+        return total
+
+    def query(
+        self,
+        provider: str,
+        *,
+        date_from: str,
+        date_to: str | None = None,
+        city: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Raw events for ``provider`` between two dates (inclusive), by start time."""
+        where, params = self._where(provider, date_from, date_to, city)
+        sql = f"SELECT payload FROM events {_BY_DATE} WHERE {where} ORDER BY date, start_epoch, event_key"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += (limit, offset)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def page(self, provider: str, *, date: str, page: int, page_size: int) -> Tuple[List[Dict[str, Any]], int]:
+        """One page of events for ``date`` and the number of pages in total."""
+        total = self.count(provider, date_from=date)
+        if not total:
+            return [], 0
+        events = self.query(provider, date_from=date, limit=page_size, offset=(page - 1) * page_size)
+        return events, math.ceil(total / page_size)
+
+    def compact(self, *, keep_days: int, today: date_cls | None = None) -> int:
+        """Drop events dated more than ``keep_days`` before ``today`` and reclaim space."""
+        cutoff = ((today or date_cls.today()) - timedelta(days=keep_days)).isoformat()
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM events WHERE date < ?", (cutoff,)).rowcount
+            if removed:
+                self._page_digests.clear()
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.execute("VACUUM")
+        if removed:
+            LOGGER.info("Catalogue compacted: removed %s events dated before %s", removed, cutoff)
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _where(provider: str, date_from: str, date_to: str | None, city: str | None) -> Tuple[str, tuple]:
+        clauses = ["date BETWEEN ? AND ?", "provider = ?"]
+        params: tuple = (date_from[:10], (date_to or date_from)[:10], provider)
+        if city is not None:
+            clauses.insert(1, "city = ?")
+            params = params[:2] + (city,) + params[2:]
+        return " AND ".join(clauses), params
+
+    @staticmethod
+    def _row(provider: str, event: Mapping[str, Any], date: str, now: float) -> Optional[tuple]:
+        start = event.get("start")
+        key = event.get("id") or event.get("event_id") or event.get("url")
+        if key is None:
+            key = f"{event.get('title') or event.get('name')}@{start}"
+        event_date = start[:10] if isinstance(start, str) and len(start) >= 10 else date[:10]
+        try:
+            payload = json.dumps(event, separators=(",", ":"))
+        except (TypeError, ValueError):
+            LOGGER.debug("Skipping unserialisable %s event %s", provider, key)
+            return None
+        return (provider, str(key), event_date, event.get("city"), try_parse_epoch(start), payload, now)
@@ -0,0 +1,127 @@
+"""Load-once store for the bundled ``app/data`` datasets used as connector fallbacks."""
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from app.utils.metrics import record_counter
+
+LOGGER = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+Record = Dict[str, Any]
+
+
+@dataclass(eq=False)
+class Dataset:
+    """One parsed dataset file, indexed by event date and city.
+
+    Records are held in tuples and page slices are cut once per selection and
+    page size, so repeated page calls hand out the same objects instead of
+    copying. Callers must treat records as read-only.
+    """
+
+    records: Tuple[Record, ...]
+    mtime_ns: int
+    by_date: Dict[str, Tuple[Record, ...]]
+    by_city: Dict[str, Tuple[Record, ...]]
+    _pages: Dict[Tuple[Optional[str], Optional[str], int], Tuple[Tuple[Record, ...], ...]] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def build(cls, records: Sequence[Record], *, mtime_ns: int) -> "Dataset":
+        by_date: Dict[str, list] = {}
+        by_city: Dict[str, list] = {}
+        for record in records:
+            start = record.get("start")
+            if isinstance(start, str) and len(start) >= 10:
+                by_date.setdefault(start[:10], []).append(record)
+            city = record.get("city")
+            if isinstance(city, str):
+                by_city.setdefault(city.casefold(), []).append(record)
+        return cls(
+            records=tuple(records),
+            mtime_ns=mtime_ns,
+            by_date={key: tuple(value) for key, value in by_date.items()},
+            by_city={key: tuple(value) for key, value in by_city.items()},
+        )
+
+    def select(self, *, date: str | None = None, city: str | None = None) -> Tuple[Record, ...]:
+        """Records on ``date`` and/or in ``city``.
+
+        A filter that matches nothing is ignored rather than returning an
+        empty selection: the bundled data stands in for whatever the vendor
+        would have returned, so unknown dates still get the full dataset.
+        """
+        records = self.records
+        if date is not None and date[:10] in self.by_date:
+            records = self.by_date[date[:10]]
+        if city is not None and city.casefold() in self.by_city:
+            in_city = self.by_city[city.casefold()]
+            if records is self.records:
+                records = in_city
+            else:
+                wanted = {id(record) for record in in_city}
+                records = tuple(record for record in records if id(record) in wanted)
+        return records
+
+    def pages(
+        self, page_size: int, *, date: str | None = None, city: str | None = None
+    ) -> Tuple[Tuple[Record, ...], ...]:
+        """The selection cut into ``page_size`` chunks, cached per selection."""
+        date = date[:10] if date is not None and date[:10] in self.by_date else None
+        city = city.casefold() if city is not None and city.casefold() in self.by_city else None
+        key = (date, city, page_size)
+        pages = self._pages.get(key)
+        if pages is None:
+            records = self.select(date=date, city=city)
+            pages = tuple(records[start : start + page_size] for start in range(0, len(records), page_size))
+            self._pages[key] = pages
+        return pages
+
+
+class DatasetStore:
+    """Parses each bundled file once and re-parses only when its mtime changes."""
+
+    def __init__(self, data_dir: Path = DATA_DIR) -> None:
+        self.data_dir = Path(data_dir)
+        self._datasets: Dict[Tuple[str, str], Dataset] = {}
+        self._lock = Lock()
+
+    def get(self, name: str, key: str) -> Dataset:
+        """The records under ``key`` in ``<data_dir>/<name>.json``.
+
+        Costs one ``stat`` per call once loaded.
+        """
+        path = self.data_dir / f"{name}.json"
+        mtime_ns = path.stat().st_mtime_ns
+        dataset = self._datasets.get((name, key))
+        if dataset is not None and dataset.mtime_ns == mtime_ns:
+            return dataset
+        with self._lock:
+            dataset = self._datasets.get((name, key))
+            if dataset is None or dataset.mtime_ns != mtime_ns:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+                dataset = Dataset.build(payload.get(key, []), mtime_ns=mtime_ns)
+                self._datasets[(name, key)] = dataset
+                record_counter("dataset_loads_total", labels={"dataset": name})
+                LOGGER.debug("Loaded %s bundled %s records from %s", len(dataset.records), key, path)
+        return dataset
+
+    def clear(self) -> None:
+        with self._lock:
+            self._datasets.clear()
+
+
+_store = DatasetStore()
+
+
+def get_dataset_store() -> DatasetStore:
+    """Get the process-wide dataset store."""
+    return _store
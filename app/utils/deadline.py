@@ -0,0 +1,53 @@
+"""Request-scoped deadlines shared by the planner, connectors and HTTP client."""
+from __future__ import annotations
+
+import time
+from typing import Callable, List, Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work is abandoned because the request deadline has passed."""
+
+
+class Deadline:
+    """
+    Absolute point in time by which a request must answer.
+
+    Components ask for :meth:`timeout` to bound their own waits and record the
+    sources they had to abandon with :meth:`mark_cut_off`, so the planner can
+    report a partial result.
+    """
+
+    def __init__(self, timeout_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._expires_at = clock() + max(timeout_seconds, 0.0)
+        self.cut_off: List[str] = []
+
+    @classmethod
+    def from_ms(cls, deadline_ms: Optional[float]) -> Optional["Deadline"]:
+        """Build a deadline from a millisecond budget; None means no deadline."""
+        if deadline_ms is None:
+            return None
+        return cls(deadline_ms / 1000.0)
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative."""
+        return max(self._expires_at - self._clock(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self._expires_at
+
+    def timeout(self, default: float) -> float:
+        """The smaller of a component's own timeout and the time left."""
+        return min(default, self.remaining())
+
+    def check(self) -> None:
+        """Raise DeadlineExceeded once the deadline has passed."""
+        if self.expired:
+            raise DeadlineExceeded("request deadline exceeded")
+
+    def mark_cut_off(self, source: str) -> None:
+        """Record that ``source`` was truncated or skipped because time ran out."""
+        if source not in self.cut_off:
+            self.cut_off.append(source)
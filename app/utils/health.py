@@ -0,0 +1,98 @@
+"""Upstream health shared between worker processes on one host."""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+HEALTH_FILENAME = "health.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS upstreams (
+    name TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    opened_at REAL NOT NULL,
+    latency_ms REAL,
+    updated_at REAL NOT NULL
+)
+"""
+
+_PUBLISH_STATE = """
+INSERT INTO upstreams (name, state, opened_at, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+    state = excluded.state, opened_at = excluded.opened_at, updated_at = excluded.updated_at
+"""
+
+_PUBLISH_LATENCY = """
+INSERT INTO upstreams (name, state, opened_at, latency_ms, updated_at) VALUES (?, 'closed', 0, ?, ?)
+ON CONFLICT (name) DO UPDATE SET latency_ms = excluded.latency_ms
+"""
+
+
+@dataclass(frozen=True)
+class UpstreamHealth:
+    """What the workers on this host last agreed about one upstream.
+
+    Times are wall-clock epoch seconds, since monotonic clocks are not
+    comparable between processes.
+    """
+
+    name: str
+    state: str
+    opened_at: float
+    latency_ms: Optional[float]
+    updated_at: float
+
+
+class HealthRegistry:
+    """
+    Circuit-breaker state and recent latency per upstream, in a small SQLite
+    file every worker process opens.
+
+    A breaker publishes its transitions here and periodically picks up those
+    made by other workers, so a vendor outage seen by one worker opens the
+    circuit in all of them, and a freshly (re)started worker starts from the
+    current state instead of re-learning it with failing requests. WAL mode
+    keeps readers from blocking on a worker writing.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=1.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+
+    def get(self, name: str) -> Optional[UpstreamHealth]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT name, state, opened_at, latency_ms, updated_at FROM upstreams WHERE name = ?", (name,)
+            ).fetchone()
+        return UpstreamHealth(*row) if row else None
+
+    def all(self) -> Dict[str, UpstreamHealth]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, state, opened_at, latency_ms, updated_at FROM upstreams ORDER BY name"
+            ).fetchall()
+        return {row[0]: UpstreamHealth(*row) for row in rows}
+
+    def publish_state(self, name: str, state: str, *, opened_at: float = 0.0) -> None:
+        with self._lock:
+            self._conn.execute(_PUBLISH_STATE, (name, state, opened_at, time.time()))
+
+    def publish_latency(self, name: str, latency_ms: float) -> None:
+        with self._lock:
+            self._conn.execute(_PUBLISH_LATENCY, (name, latency_ms, time.time()))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,71 @@
+"""Hedged-request policy: per-host latency tracking and a hedge budget."""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional
+
+
+@dataclass
+class _HostStats:
+    latencies: Deque[float]
+    tokens: float
+
+
+@dataclass
+class HedgePolicy:
+    """
+    Decides when an idempotent GET should be duplicated.
+
+    A hedge fires once a request has been outstanding for longer than the
+    ``percentile`` of that host's recent latencies. Each request earns
+    ``budget`` hedge tokens and each hedge spends one, so hedges stay
+    below ``budget`` of the traffic (with a small ``burst`` for quiet
+    periods). No hedging happens until ``min_samples`` latencies are known.
+    """
+
+    percentile: float = 0.95
+    budget: float = 0.05
+    burst: float = 2.0
+    min_samples: int = 20
+    window: int = 200
+    min_delay_seconds: float = 0.005
+    _hosts: Dict[str, _HostStats] = field(default_factory=dict, init=False, repr=False)
+
+    def delay(self, host: str) -> Optional[float]:
+        """Seconds to wait before hedging a request to ``host``; None when not hedging.
+
+        Also credits the host's hedge budget for the request being sent.
+        """
+        stats = self._stats(host)
+        stats.tokens = min(stats.tokens + self.budget, self.burst)
+        if len(stats.latencies) < self.min_samples:
+            return None
+        ordered = sorted(stats.latencies)
+        index = min(int(self.percentile * len(ordered)), len(ordered) - 1)
+        return max(ordered[index], self.min_delay_seconds)
+
+    def try_acquire(self, host: str) -> bool:
+        """Spend one hedge token for ``host`` if the budget allows it."""
+        stats = self._stats(host)
+        if stats.tokens < 1.0:
+            return False
+        stats.tokens -= 1.0
+        return True
+
+    def observe(self, host: str, seconds: float) -> None:
+        """Record the latency of a completed request."""
+        self._stats(host).latencies.append(seconds)
+
+    def _stats(self, host: str) -> _HostStats:
+        stats = self._hosts.get(host)
+        if stats is None:
+            stats = self._hosts[host] = _HostStats(latencies=deque(maxlen=self.window), tokens=0.0)
+        return stats
+
+
+def hedge_policy(percentile: float | None, budget: float) -> Optional[HedgePolicy]:
+    """A policy for connector settings; None when ``percentile`` is unset (hedging off)."""
+    if percentile is None:
+        return None
+    return HedgePolicy(percentile=percentile, budget=budget)
@@ -2,64 +2,299 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
 import logging
+import math
+import sqlite3
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from threading import Lock
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 import httpx
 
+from app.utils.deadline import Deadline, DeadlineExceeded
+from app.utils.health import HealthRegistry, UpstreamHealth
+from app.utils.hedging import HedgePolicy
+from app.utils.http_cache import HttpCache
+from app.utils.jsonstream import JsonArrayStream
+from app.utils.metrics import record_counter
+from app.utils.retry import (
+    RETRYABLE_STATUSES,
+    RetryBudget,
+    decorrelated_jitter,
+    get_retry_budget,
+    retry_after_seconds,
+)
+from app.utils.singleflight import SingleFlight
+from app.utils.transport import get_transport_pool
+
 LOGGER = logging.getLogger(__name__)
 
 
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
 @dataclass
 class CircuitBreaker:
-    """Circuit breaker that trips after consecutive failures."""
+    """Circuit breaker that trips on the error rate over a sliding window.
+
+    Closed, it keeps the outcomes of the last ``window_size`` calls made
+    within ``window_seconds`` and opens once at least ``minimum_calls`` of
+    them are known and ``failure_rate_threshold`` of those failed. Open, it
+    rejects calls for ``reset_timeout`` seconds, then turns half-open and
+    admits at most ``half_open_probes`` concurrent probes: that many
+    successes close it, any failure reopens it.
+
+    State only changes between awaits, so it needs no lock inside the event
+    loop; a breaker must not be shared across threads. Transitions are
+    counted in ``circuit_breaker_transitions_total`` and rejected calls in
+    ``circuit_breaker_rejected_total``.
+
+    With a ``registry``, transitions and a latency average are shared with
+    the other workers on this host. The breaker adopts circuits they opened
+    or closed, checking at most every ``sync_interval`` seconds and once on
+    creation. Inside an event loop the periodic check reads the registry in
+    a worker thread and applies the result on the loop, and transitions are
+    written from a worker thread too, so no call waits on SQLite.
+    """
+
+    name: str = "default"
+    failure_rate_threshold: float = 0.5
+    minimum_calls: int = 10
+    window_size: int = 50
+    window_seconds: float = 30.0
+    reset_timeout: float = 30.0
+    half_open_probes: int = 2
+    clock: Callable[[], float] = time.monotonic
+    registry: Optional[HealthRegistry] = None
+    sync_interval: float = 1.0
+    _outcomes: Deque[Tuple[float, bool]] = field(default_factory=deque, init=False, repr=False)
+    _failures: int = field(default=0, init=False)
+    _state: str = field(default=CLOSED, init=False)
+    _opened_at: float = field(default=0.0, init=False)
+    _probes: int = field(default=0, init=False)
+    _probe_successes: int = field(default=0, init=False)
+    _last_sync: float = field(default=-math.inf, init=False)
+    _seen_at: float = field(default=0.0, init=False)
+    _latency_ms: Optional[float] = field(default=None, init=False)
+    _latency_dirty: bool = field(default=False, init=False)
+    _sync_task: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+    _publish_task: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+    _pending_state: Optional[Tuple[str, float]] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.registry is not None:
+            self._sync()
 
-    failure_threshold: int = 3
-    reset_timeout: float = 60.0
-    _failures: int = 0
-    _state: str = "closed"
-    _opened_at: float = 0.0
-    _lock: Lock = field(default_factory=Lock)
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def latency_ms(self) -> Optional[float]:
+        """Moving average of successful call latency."""
+        return self._latency_ms
 
     def allow_request(self) -> bool:
-        with self._lock:
-            if self._state == "open":
-                if time.monotonic() - self._opened_at >= self.reset_timeout:
-                    self._state = "half-open"
-                    LOGGER.debug("Circuit breaker moving to half-open state")
-                    return True
-                LOGGER.debug("Circuit breaker open; rejecting request")
+        if self.registry is not None and self.clock() - self._last_sync >= self.sync_interval:
+            self._sync_soon()
+        if self._state == OPEN:
+            if self.clock() - self._opened_at < self.reset_timeout:
+                record_counter("circuit_breaker_rejected_total", labels={"breaker": self.name})
+                return False
+            self._transition(HALF_OPEN)
+        if self._state == HALF_OPEN:
+            if self._probes >= self.half_open_probes:
+                record_counter("circuit_breaker_rejected_total", labels={"breaker": self.name})
                 return False
-            return True
+            self._probes += 1
+        return True
 
-    def on_success(self) -> None:
-        with self._lock:
-            self._failures = 0
-            self._state = "closed"
-            LOGGER.debug("Circuit breaker reset to closed state")
+    def on_success(self, latency: Optional[float] = None) -> None:
+        if latency is not None:
+            latency_ms = latency * 1000
+            previous = self._latency_ms
+            self._latency_ms = latency_ms if previous is None else 0.8 * previous + 0.2 * latency_ms
+            self._latency_dirty = True
+        if self._state == HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                self._transition(CLOSED)
+            return
+        self._record(True)
 
     def on_failure(self) -> None:
-        with self._lock:
-            self._failures += 1
-            LOGGER.debug("Circuit breaker recorded failure %s", self._failures)
-            if self._failures >= self.failure_threshold:
-                self._state = "open"
-                self._opened_at = time.monotonic()
-                LOGGER.warning("Circuit breaker opened after %s failures", self._failures)
+        if self._state == HALF_OPEN:
+            self._transition(OPEN)
+            return
+        if self._state == CLOSED:
+            self._record(False)
+            if self._tripped():
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """Give back an admitted call that ended without an upstream verdict (cancelled, our deadline)."""
+        if self._state == HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+
+    def _record(self, ok: bool) -> None:
+        now = self.clock()
+        self._outcomes.append((now, ok))
+        self._failures += not ok
+        while self._outcomes and (
+            len(self._outcomes) > self.window_size or now - self._outcomes[0][0] > self.window_seconds
+        ):
+            _, was_ok = self._outcomes.popleft()
+            self._failures -= not was_ok
+
+    def _tripped(self) -> bool:
+        calls = len(self._outcomes)
+        return calls >= self.minimum_calls and self._failures / calls >= self.failure_rate_threshold
+
+    def _sync(self) -> None:
+        """Publish our latency and adopt a newer open/closed decision from another worker."""
+        self._last_sync = self.clock()
+        self._adopt(self._exchange(self._take_latency()))
+
+    def _sync_soon(self) -> None:
+        """Like :meth:`_sync`, but in the background when called from the event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._sync()
+            return
+        self._last_sync = self.clock()
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = loop.create_task(self._sync_in_thread(self._take_latency()))
+
+    async def _sync_in_thread(self, latency_ms: Optional[float]) -> None:
+        self._adopt(await asyncio.to_thread(self._exchange, latency_ms))
+
+    def _take_latency(self) -> Optional[float]:
+        """The latency average to publish, if it changed since the last sync."""
+        if not self._latency_dirty:
+            return None
+        self._latency_dirty = False
+        return self._latency_ms
+
+    def _exchange(self, latency_ms: Optional[float]) -> Optional[UpstreamHealth]:
+        """Registry I/O only, so it can run off the loop; None if the registry is unavailable."""
+        assert self.registry is not None
+        try:
+            if latency_ms is not None:
+                self.registry.publish_latency(self.name, latency_ms)
+            return self.registry.get(self.name)
+        except sqlite3.Error as exc:
+            LOGGER.debug("Health registry unavailable for %s (%s)", self.name, exc)
+            return None
+
+    def _adopt(self, shared: Optional[UpstreamHealth]) -> None:
+        if shared is None or shared.updated_at <= self._seen_at:
+            return
+        self._seen_at = shared.updated_at
+        if shared.state == OPEN and self._state != OPEN:
+            elapsed = max(time.time() - shared.opened_at, 0.0)
+            if elapsed < self.reset_timeout:
+                LOGGER.info("Circuit breaker %s opened by another worker", self.name)
+                self._transition(OPEN, publish=False)
+                self._opened_at = self.clock() - elapsed
+        elif shared.state == CLOSED and self._state != CLOSED:
+            LOGGER.info("Circuit breaker %s closed by another worker", self.name)
+            self._transition(CLOSED, publish=False)
+
+    def _transition(self, state: str, *, publish: bool = True) -> None:
+        if state == OPEN:
+            self._opened_at = self.clock()
+            LOGGER.warning(
+                "Circuit breaker %s opened (%s/%s recent calls failed)", self.name, self._failures, len(self._outcomes)
+            )
+        else:
+            LOGGER.debug("Circuit breaker %s moving to %s state", self.name, state)
+        if state == CLOSED:
+            self._outcomes.clear()
+            self._failures = 0
+        self._probes = 0
+        self._probe_successes = 0
+        self._state = state
+        record_counter("circuit_breaker_transitions_total", labels={"breaker": self.name, "state": state})
+        if publish and self.registry is not None and state != HALF_OPEN:
+            self._publish_soon(state, time.time() if state == OPEN else 0.0)
+
+    def _publish_soon(self, state: str, opened_at: float) -> None:
+        """Share a transition, in the background when called from the event loop.
+
+        Only the latest pending state is written, so transitions can't be
+        published out of order.
+        """
+        self._pending_state = (state, opened_at)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._publish(*self._pending_state)
+            self._pending_state = None
+            return
+        if self._publish_task is None or self._publish_task.done():
+            self._publish_task = loop.create_task(self._publish_in_thread())
+
+    async def _publish_in_thread(self) -> None:
+        while self._pending_state is not None:
+            state, opened_at = self._pending_state
+            self._pending_state = None
+            await asyncio.to_thread(self._publish, state, opened_at)
+
+    def _publish(self, state: str, opened_at: float) -> None:
+        assert self.registry is not None
+        try:
+            self.registry.publish_state(self.name, state, opened_at=opened_at)
+        except sqlite3.Error as exc:
+            LOGGER.debug("Could not publish %s breaker state (%s)", self.name, exc)
 
 
 @dataclass
 class HttpClient:
-    """Async HTTP client with retries and exponential backoff."""
+    """Async HTTP client with budgeted, jittered retries.
+
+    Requests go through the process-wide transport pool unless a private
+    client was opened with ``async with`` (or assigned to ``_client``).
+    With a ``hedge`` policy, slow GETs are duplicated once and the first
+    good response wins. Concurrency per upstream host is limited adaptively,
+    separately for each ``bulkhead`` (normally the connector's name).
+
+    Retries back off with decorrelated jitter (the first delay falls between
+    one and three times ``backoff_factor``), wait at least as long as a
+    429/503 ``Retry-After`` asks (giving up when it asks for more than
+    ``max_retry_after``), and draw on a per-host ``retry_budget`` so a
+    browned-out upstream isn't hit with retry storms.
+
+    With a ``cache``, GETs honour the upstream's freshness headers: fresh
+    responses are served locally and stale ones revalidated with
+    ``If-None-Match``/``If-Modified-Since``, a ``304`` re-serving the
+    stored body.
+
+    With ``coalesce`` (the default), identical GETs (same URL, params and
+    headers) issued while one is already in flight wait for that one
+    instead of going to the network, and all receive the same response.
+    Each waiter still waits only as long as its own deadline allows, and a
+    waiter whose budget outlives a leader cut off by its deadline sends the
+    request itself.
+    """
 
     timeout: float = 5.0
     retries: int = 2
     backoff_factor: float = 0.5
     circuit_breaker: Optional[CircuitBreaker] = None
+    hedge: Optional[HedgePolicy] = None
+    bulkhead: str = "default"
+    max_backoff: float = 10.0
+    max_retry_after: float = 30.0
+    retry_budget: RetryBudget = field(default_factory=get_retry_budget)
+    cache: Optional[HttpCache] = None
+    coalesce: bool = True
     _client: Optional[httpx.AsyncClient] = field(default=None, init=False)
+    _flight: SingleFlight = field(default_factory=lambda: SingleFlight("http"), init=False, repr=False)
 
     def __post_init__(self) -> None:
         self._client = None
@@ -72,60 +307,433 @@ class HttpClient:
         if self._client:
             await self._client.aclose()
 
-    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
-        response = await self.request("GET", url, params=params, headers=headers)
+    async def get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Dict[str, Any]:
+        response = await self.request("GET", url, params=params, headers=headers, deadline=deadline)
         return response.json()
 
-    async def request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
-        if self.circuit_breaker and not self.circuit_breaker.allow_request():
-            raise RuntimeError("Circuit breaker open")
+    @contextlib.asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """Like ``request`` but hands over the response before its body is read.
+
+        Retries and the circuit breaker cover getting the response headers;
+        the body is the caller's to iterate. Streamed requests are not
+        cached, coalesced or hedged, since their body can only be read once.
+        """
+        response = await self._request(method, url, params=params, headers=headers, deadline=deadline, stream=True)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    async def get_json_items(
+        self,
+        url: str,
+        *,
+        key: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        deadline: Optional[Deadline] = None,
+        stream: bool = False,
+        max_bytes: Optional[int] = None,
+    ) -> Tuple[List[Any], Mapping[str, Any], httpx.Headers]:
+        """GET a JSON object and return its ``key`` array, its other members and the response headers.
 
-        # Create client if not in context manager
-        if self._client is None:
-            self._client = httpx.AsyncClient(timeout=self.timeout)
+        With ``stream`` the array is parsed item by item as the (possibly
+        compressed) body arrives, and bodies over ``max_bytes`` are refused.
+        """
+        if not stream:
+            response = await self.request("GET", url, params=params, headers=headers, deadline=deadline)
+            payload = response.json()
+            return payload.get(key, []), payload, response.headers
+        parser = JsonArrayStream((key,), max_bytes=max_bytes)
+        async with self.stream("GET", url, params=params, headers=headers, deadline=deadline) as response:
+            items = [item async for item in parser.aiter(response)]
+        return items, parser.fields, response.headers
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> httpx.Response:
+        if method != "GET":
+            return await self._request(method, url, params=params, headers=headers, deadline=deadline)
+        get = functools.partial(self._get, url, params=params, headers=headers, deadline=deadline)
+        if not self.coalesce:
+            return await get()
+        request = httpx.Request("GET", url, params=params, headers=headers)
+        key = (str(request.url), tuple(sorted(request.headers.multi_items())))
+        if deadline is not None:
+            deadline.check()
+        try:
+            return await self._flight.do(
+                key,
+                get,
+                labels={"host": request.url.host},
+                timeout=deadline.remaining() if deadline is not None else None,
+            )
+        except asyncio.TimeoutError as exc:
+            raise DeadlineExceeded(f"request deadline exceeded waiting for GET {url}") from exc
+        except DeadlineExceeded:
+            if deadline is not None and deadline.expired:
+                raise
+            # The shared request ran out of the leader's budget, not ours.
+            return await get()
+
+    async def _get(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        deadline: Optional[Deadline],
+    ) -> httpx.Response:
+        if self.cache is not None:
+            return await self._cached_get(url, params=params, headers=headers, deadline=deadline)
+        return await self._request("GET", url, params=params, headers=headers, deadline=deadline)
+
+    async def _cached_get(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        deadline: Optional[Deadline],
+    ) -> httpx.Response:
+        cache = self.cache
+        assert cache is not None
+        request = httpx.Request("GET", url, params=params, headers=headers)
+        entry = await self._cache_call(cache.lookup, request)
+        if entry is not None and cache.is_fresh(entry):
+            return entry.to_response(request)
+        conditional = dict(headers or {})
+        if entry is not None:
+            conditional.update(entry.validators())
+        requested_at = cache.clock()
+        response = await self._request("GET", url, params=params, headers=conditional, deadline=deadline)
+        if response.status_code == 304 and entry is not None:
+            return await self._cache_call(cache.revalidated, request, entry, response, requested_at=requested_at)
+        await self._cache_call(cache.store_response, request, response, requested_at=requested_at)
+        return response
+
+    async def _cache_call(self, method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Call an ``HttpCache`` method, in a worker thread when its store does file I/O."""
+        assert self.cache is not None
+        if self.cache.blocking:
+            return await asyncio.to_thread(method, *args, **kwargs)
+        return method(*args, **kwargs)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        deadline: Optional[Deadline],
+        stream: bool = False,
+    ) -> httpx.Response:
+        breaker = self.circuit_breaker
+        client = self._client if self._client is not None else get_transport_pool().client()
+        host = httpx.URL(url).host
 
         attempt = 0
+        sleep_time = 0.0
         last_error: Exception | None = None
         while attempt <= self.retries:
+            if deadline is not None:
+                deadline.check()
+            # Checked per attempt so retries stop as soon as the breaker opens.
+            if breaker and not breaker.allow_request():
+                raise RuntimeError("Circuit breaker open")
+            attempt_timeout = deadline.timeout(self.timeout) if deadline is not None else self.timeout
+            started = time.monotonic()
             try:
-                response = await self._client.request(method, url, params=params, headers=headers)
-                if response.status_code >= 500:
-                    raise httpx.HTTPStatusError(
-                        f"Server error: {response.status_code}",
-                        request=response.request,
-                        response=response
-                    )
-                if self.circuit_breaker:
-                    self.circuit_breaker.on_success()
+                send = functools.partial(
+                    self._send,
+                    client,
+                    method,
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=attempt_timeout,
+                    deadline=deadline,
+                    stream=stream,
+                )
+                if self.hedge is not None and method == "GET" and not stream:
+                    response = await self._hedged(send, host)
+                else:
+                    response = await send()
+                if breaker:
+                    breaker.on_success(time.monotonic() - started)
+                self.retry_budget.deposit(host)
                 return response
+            except (asyncio.CancelledError, DeadlineExceeded):
+                if breaker:
+                    breaker.release()
+                raise
             except (httpx.HTTPError, RuntimeError) as exc:
                 last_error = exc
-                if self.circuit_breaker:
-                    self.circuit_breaker.on_failure()
+                if deadline is not None and deadline.expired:
+                    # Our own deadline cut the attempt short; not the upstream's fault.
+                    if breaker:
+                        breaker.release()
+                    raise DeadlineExceeded(f"request deadline exceeded during {method} {url}") from exc
+                if breaker:
+                    breaker.on_failure()
                 if attempt == self.retries:
                     LOGGER.error("Request failed after %s attempts: %s", attempt + 1, exc)
                     raise
-                sleep_time = self.backoff_factor * (2**attempt)
+                retry_after = retry_after_seconds(getattr(exc, "response", None))
+                if retry_after is not None and retry_after > self.max_retry_after:
+                    LOGGER.warning("%s asked to retry after %.0fs; giving up (%s)", host, retry_after, exc)
+                    raise
+                sleep_time = decorrelated_jitter(sleep_time, base=self.backoff_factor, cap=self.max_backoff)
+                if retry_after is not None:
+                    sleep_time = max(sleep_time, retry_after)
+                if deadline is not None and sleep_time >= deadline.remaining():
+                    raise DeadlineExceeded(f"no time left to retry {method} {url}") from exc
+                if not self.retry_budget.try_spend(host):
+                    record_counter("http_retries_total", labels={"host": host, "outcome": "denied"})
+                    LOGGER.warning("Retry budget for %s exhausted; not retrying (%s)", host, exc)
+                    raise
+                record_counter("http_retries_total", labels={"host": host, "outcome": "allowed"})
                 LOGGER.warning("Request attempt %s failed (%s); retrying in %.2fs", attempt + 1, exc, sleep_time)
                 await asyncio.sleep(sleep_time)
                 attempt += 1
         assert last_error is not None
         raise last_error
 
+    async def _send(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        timeout: float,
+        deadline: Optional[Deadline] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """One request within the host's concurrency limit; 429 and 5xx responses raise.
+
+        Waiting for a limiter slot counts against ``deadline`` and raises
+        ``DeadlineExceeded`` once it runs out. With ``stream`` the response is
+        returned once its headers arrive and the caller reads (and closes) the
+        body; the limiter slot covers the time to first byte only.
+        """
+        host = httpx.URL(url).host
+        limiter = get_transport_pool().limiter(host, self.bulkhead)
+        if deadline is None:
+            await limiter.acquire()
+        else:
+            try:
+                await asyncio.wait_for(limiter.acquire(), deadline.remaining())
+            except asyncio.TimeoutError as exc:
+                raise DeadlineExceeded(f"request deadline exceeded queueing for {method} {url}") from exc
+            # The queue wait came out of the attempt's budget.
+            timeout = deadline.timeout(timeout)
+        sent = time.monotonic()
+        latency: Optional[float] = None
+        ok = False
+        try:
+            if stream:
+                request = client.build_request(method, url, params=params, headers=headers, timeout=timeout)
+                response = await client.send(request, stream=True)
+            else:
+                response = await client.request(method, url, params=params, headers=headers, timeout=timeout)
+            ok = response.status_code != 429 and response.status_code < 500
+            latency = time.monotonic() - sent
+        except httpx.HTTPError:
+            latency = time.monotonic() - sent
+            raise
+        finally:
+            limiter.release(latency, ok=ok)
+        if response.status_code >= 500 or response.status_code in RETRYABLE_STATUSES:
+            if stream:
+                await response.aread()
+            raise httpx.HTTPStatusError(
+                f"Server error: {response.status_code}" if response.status_code >= 500 else "Rate limited: 429",
+                request=response.request,
+                response=response
+            )
+        if self.hedge is not None and not stream:
+            self.hedge.observe(host, time.monotonic() - sent)
+        return response
+
+    async def _hedged(self, send: Callable[[], Any], host: str) -> httpx.Response:
+        """Run ``send`` and, if it is slower than the host's hedge delay, race a duplicate.
+
+        The first successful response wins and the other request is
+        cancelled; if both fail, the primary's error is raised.
+        """
+        assert self.hedge is not None
+        delay = self.hedge.delay(host)
+        primary = asyncio.ensure_future(send())
+        tasks = [primary]
+        try:
+            if delay is None:
+                return await primary
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self.hedge.try_acquire(host):
+                return await primary
+
+            record_counter("http_hedges_fired_total", labels={"host": host})
+            backup = asyncio.ensure_future(send())
+            tasks.append(backup)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            record_counter("http_hedges_won_total", labels={"host": host})
+                        return task.result()
+            return primary.result()
+        finally:
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+
+@dataclass
+class Page:
+    """One page of results plus whatever the vendor said about the rest.
+
+    Page loaders may return a plain list instead when they know nothing
+    beyond the items themselves.
+    """
+
+    items: Sequence[Dict[str, Any]]
+    total_pages: Optional[int] = None
+    has_next: Optional[bool] = None
+
+    @classmethod
+    def from_response(
+        cls,
+        items: Sequence[Dict[str, Any]],
+        *,
+        payload: Mapping[str, Any],
+        headers: Mapping[str, str],
+        page_size: int,
+    ) -> "Page":
+        """Read a total count from the payload and ``rel="next"`` from a Link header."""
+        total_pages = None
+        for key in ("total", "total_count", "total_results"):
+            total = payload.get(key)
+            if isinstance(total, int) and total >= 0:
+                total_pages = math.ceil(total / page_size)
+                break
+        link = headers.get("link")
+        has_next = "next" in parse_link_header(link) if link is not None else None
+        return cls(items=items, total_pages=total_pages, has_next=has_next)
+
+
+def parse_link_header(value: str) -> Dict[str, str]:
+    """Map each ``rel`` of an RFC 8288 Link header to its URL."""
+    links: Dict[str, str] = {}
+    for part in value.split(","):
+        url, _, params = part.partition(";")
+        url = url.strip().strip("<>")
+        for param in params.split(";"):
+            name, _, rel = param.strip().partition("=")
+            if name.strip().lower() == "rel":
+                for rel_value in rel.strip().strip('"').split():
+                    links[rel_value.lower()] = url
+    return links
+
+
+def _as_page(result: Any) -> Page:
+    return result if isinstance(result, Page) else Page(items=list(result or []))
+
+
+async def iterate_paginated(
+    fetch_page: Callable[[int, int], Any],
+    page_size: int,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = 0,
+) -> AsyncIterator[Sequence[Dict[str, Any]]]:
+    """Yield each non-empty page, in order, as soon as it has been fetched.
+
+    With ``prefetch`` > 0 up to that many following pages are requested
+    while the current one is being consumed. A total count or Link header on
+    a page stops prefetching past the last page; otherwise pages are fetched
+    speculatively and the surplus is cancelled once a short page arrives.
+
+    Raises DeadlineExceeded instead of requesting another page once the
+    deadline has passed; pages already yielded stay valid.
+    """
+    window = max(prefetch, 0)
+    tasks: Dict[int, asyncio.Future] = {}
+    last_page: Optional[int] = None
+    next_to_schedule = 1
+
+    def schedule(up_to: int) -> None:
+        nonlocal next_to_schedule
+        if last_page is not None:
+            up_to = min(up_to, last_page)
+        while next_to_schedule <= up_to:
+            if deadline is not None:
+                deadline.check()
+            tasks[next_to_schedule] = asyncio.ensure_future(fetch_page(page=next_to_schedule, page_size=page_size))
+            next_to_schedule += 1
+
+    page = 1
+    try:
+        while True:
+            schedule(page)
+            if page not in tasks:
+                break
+            result = _as_page(await tasks.pop(page))
+            if not result.items:
+                break
+            if result.total_pages is not None:
+                last_page = result.total_pages
+            elif result.has_next is False:
+                last_page = page
+            if len(result.items) < page_size:
+                last_page = page
+            # Keep the next pages in flight while the caller works on this one.
+            schedule(page + window)
+            yield result.items
+            if last_page is not None and page >= last_page:
+                break
+            page += 1
+    finally:
+        if tasks:
+            # Speculative pages past the end, whether still in flight or not.
+            record_counter("pagination_prefetch_wasted_total", len(tasks))
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
 
 async def aggregate_paginated(
     fetch_page: Callable[[int, int], Any],
     page_size: int,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = 0,
 ) -> List[Dict[str, Any]]:
     """Helper to fetch and aggregate paginated responses."""
     results = []
-    page = 1
-    while True:
-        payload = await fetch_page(page=page, page_size=page_size)
-        if not payload:
-            break
+    async for payload in iterate_paginated(fetch_page, page_size, deadline=deadline, prefetch=prefetch):
         results.extend(payload)
-        if len(payload) < page_size:
-            break
-        page += 1
     return results
@@ -0,0 +1,451 @@
+"""Private HTTP response cache with freshness and conditional revalidation."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, List, Mapping, Optional, Protocol, Tuple
+
+import httpx
+
+from app.utils.metrics import record_cache_hit, record_cache_miss, record_counter
+
+LOGGER = logging.getLogger(__name__)
+
+CACHE_NAME = "http"
+HTTP_CACHE_DIRNAME = "http"
+
+# Statuses stored by default (RFC 9110 §15.1 "heuristically cacheable" subset we can use).
+CACHEABLE_STATUSES = frozenset({200, 203, 300, 301, 404, 410})
+
+# Headers a 304 must not overwrite on the stored response.
+_BODY_HEADERS = frozenset({"content-length", "content-encoding", "transfer-encoding", "content-range"})
+
+# RFC 9111 §4.2.2 suggests 10% of the time since Last-Modified; capped so a
+# page untouched for months is not trusted for weeks.
+HEURISTIC_FRACTION = 0.1
+MAX_HEURISTIC_SECONDS = 24 * 3600.0
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Directives of a ``Cache-Control`` header, lower-cased, with unquoted arguments."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip().strip('"') if argument else None
+    return directives
+
+
+def _seconds(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(float(int(value)), 0.0) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A stored response plus what is needed to judge and revalidate it.
+
+    ``stored_at`` and ``corrected_age`` follow RFC 9111 §4.2.3: the age
+    the response already had when it arrived, and the wall-clock time it did.
+    """
+
+    url: str
+    status_code: int
+    headers: Tuple[Tuple[str, str], ...]
+    content: bytes
+    stored_at: float
+    corrected_age: float = 0.0
+    vary: Tuple[Tuple[str, str], ...] = ()
+
+    @property
+    def size(self) -> int:
+        return len(self.content) + sum(len(name) + len(value) for name, value in self.headers)
+
+    @property
+    def header_map(self) -> httpx.Headers:
+        return httpx.Headers(list(self.headers))
+
+    def age(self, now: float) -> float:
+        return self.corrected_age + max(now - self.stored_at, 0.0)
+
+    def freshness_lifetime(self) -> float:
+        """Seconds the response stays fresh for a private cache (RFC 9111 §4.2.1)."""
+        headers = self.header_map
+        directives = parse_cache_control(headers.get("cache-control"))
+        if "no-cache" in directives:
+            return 0.0
+        max_age = _seconds(directives.get("max-age"))
+        if max_age is not None:
+            return max_age
+        date = _http_date(headers.get("date")) or self.stored_at
+        if "expires" in headers:
+            expires = _http_date(headers.get("expires"))
+            return max(expires - date, 0.0) if expires is not None else 0.0
+        last_modified = _http_date(headers.get("last-modified"))
+        if last_modified is not None and self.status_code in CACHEABLE_STATUSES:
+            return min(max(date - last_modified, 0.0) * HEURISTIC_FRACTION, MAX_HEURISTIC_SECONDS)
+        return 0.0
+
+    def is_fresh(self, now: float) -> bool:
+        return self.age(now) < self.freshness_lifetime()
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers to revalidate this entry, if it has validators."""
+        headers = self.header_map
+        conditional = {}
+        if "etag" in headers:
+            conditional["If-None-Match"] = headers["etag"]
+        if "last-modified" in headers:
+            conditional["If-Modified-Since"] = headers["last-modified"]
+        return conditional
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        headers = [(name, value) for name, value in self.headers if name.lower() not in _BODY_HEADERS]
+        return httpx.Response(self.status_code, headers=headers, content=self.content, request=request)
+
+
+class CacheStore(Protocol):
+    """Where cached responses live; keys are opaque strings.
+
+    A ``blocking`` store does file or network I/O, and ``HttpClient`` calls
+    it from a worker thread rather than on the event loop.
+    """
+
+    blocking: bool
+
+    def get(self, key: str) -> Optional[CachedResponse]: ...
+
+    def set(self, key: str, entry: CachedResponse) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryCacheStore:
+    """In-process LRU store bounded by the summed size of the stored responses."""
+
+    blocking = False
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        self.delete(key)
+        if entry.size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes:
+            self.delete(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    @property
+    def size(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCacheStore:
+    """
+    Store that keeps one body file and one JSON metadata file per entry
+    under ``directory``, so cached responses survive restarts and are shared
+    by the workers on one host. Once the directory grows past ``max_bytes``
+    the least recently read entries are removed.
+
+    The size of the directory is tracked as entries are written and removed;
+    it is only rescanned (to order entries for eviction and to pick up other
+    workers' writes) when that total goes over the cap.
+    """
+
+    blocking = True
+
+    def __init__(self, directory: str | Path, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        with self._lock:
+            self._scan()
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        digest = self._digest(key)
+        return self.directory / f"{digest}.json", self.directory / f"{digest}.body"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        meta_path, body_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            content = body_path.read_bytes()
+            meta_path.touch()
+        except (OSError, ValueError):
+            return None
+        if meta.get("key") != key:
+            return None
+        return CachedResponse(
+            url=meta["url"],
+            status_code=meta["status_code"],
+            headers=tuple((name, value) for name, value in meta["headers"]),
+            content=content,
+            stored_at=meta["stored_at"],
+            corrected_age=meta.get("corrected_age", 0.0),
+            vary=tuple((name, value) for name, value in meta.get("vary", ())),
+        )
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        if entry.size > self.max_bytes:
+            return
+        meta_path, body_path = self._paths(key)
+        meta = {
+            "key": key,
+            "url": entry.url,
+            "status_code": entry.status_code,
+            "headers": [list(header) for header in entry.headers],
+            "stored_at": entry.stored_at,
+            "corrected_age": entry.corrected_age,
+            "vary": [list(header) for header in entry.vary],
+        }
+        text = json.dumps(meta).encode("utf-8")
+        digest = meta_path.stem
+        with self._lock:
+            try:
+                # Body first: a reader that finds the metadata also finds its body.
+                tmp = body_path.with_suffix(".body.tmp")
+                tmp.write_bytes(entry.content)
+                tmp.replace(body_path)
+                tmp = meta_path.with_suffix(".json.tmp")
+                tmp.write_bytes(text)
+                tmp.replace(meta_path)
+            except OSError as exc:
+                LOGGER.warning("Could not write HTTP cache entry for %s: %s", entry.url, exc)
+                return
+            size = len(entry.content) + len(text)
+            self._bytes += size - self._sizes.get(digest, 0)
+            self._sizes[digest] = size
+            if self._bytes > self.max_bytes:
+                self._prune()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(self._digest(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+            for path in self.directory.glob("*.body"):
+                path.unlink(missing_ok=True)
+            self._sizes.clear()
+            self._bytes = 0
+
+    @property
+    def size(self) -> int:
+        """Bytes used by the entries, metadata included, as last counted."""
+        return self._bytes
+
+    def _remove(self, digest: str) -> None:
+        (self.directory / f"{digest}.json").unlink(missing_ok=True)
+        (self.directory / f"{digest}.body").unlink(missing_ok=True)
+        self._bytes -= self._sizes.pop(digest, 0)
+
+    def _scan(self) -> List[Tuple[float, str]]:
+        """Recount the entries on disk; returns ``(last read, digest)`` pairs."""
+        entries: List[Tuple[float, str]] = []
+        self._sizes = {}
+        for meta_path in self.directory.glob("*.json"):
+            try:
+                meta_stat = meta_path.stat()
+                size = meta_stat.st_size + meta_path.with_suffix(".body").stat().st_size
+            except OSError:
+                continue
+            self._sizes[meta_path.stem] = size
+            entries.append((meta_stat.st_mtime, meta_path.stem))
+        self._bytes = sum(self._sizes.values())
+        return entries
+
+    def _prune(self) -> None:
+        for _, digest in sorted(self._scan()):
+            if self._bytes <= self.max_bytes:
+                break
+            self._remove(digest)
+
+
+@dataclass
+class HttpCache:
+    """
+    Private (single-user) HTTP cache for GET responses, after RFC 9111.
+
+    A fresh entry is served without touching the network. A stale entry that
+    carries an ``ETag`` or ``Last-Modified`` is revalidated with
+    ``If-None-Match``/``If-Modified-Since``; a ``304`` refreshes its headers
+    and the stored body is served again. Responses marked ``no-store`` are
+    never kept, ``no-cache`` ones are always revalidated, and ``Vary``
+    keeps one variant per URL. A request sent with ``Cache-Control: no-cache``
+    or ``no-store`` skips the cache for lookup.
+    """
+
+    store: CacheStore = field(default_factory=MemoryCacheStore)
+    clock: Callable[[], float] = time.time
+
+    @property
+    def blocking(self) -> bool:
+        """Whether lookups and stores do I/O and belong off the event loop."""
+        return self.store.blocking
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        return f"{request.method} {request.url}"
+
+    def lookup(self, request: httpx.Request) -> Optional[CachedResponse]:
+        """The stored response matching ``request``, fresh or not; None on a miss."""
+        if request.method != "GET" or self._bypass(request.headers):
+            return None
+        entry = self.store.get(self.key(request))
+        if entry is None or not self._vary_matches(entry, request.headers):
+            record_cache_miss(CACHE_NAME)
+            return None
+        # The hit ratio counts responses served without a round trip;
+        # revalidations have their own counter.
+        if entry.is_fresh(self.clock()):
+            record_cache_hit(CACHE_NAME)
+        else:
+            record_cache_miss(CACHE_NAME)
+        return entry
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return entry.is_fresh(self.clock())
+
+    def store_response(self, request: httpx.Request, response: httpx.Response, *, requested_at: float) -> None:
+        """Keep ``response`` if it is cacheable; drop any stale variant otherwise."""
+        if request.method != "GET":
+            return
+        key = self.key(request)
+        if not self._cacheable(request, response):
+            self.store.delete(key)
+            return
+        entry = self._entry(request, response, requested_at=requested_at)
+        if entry is not None:
+            self.store.set(key, entry)
+
+    def revalidated(
+        self, request: httpx.Request, entry: CachedResponse, response: httpx.Response, *, requested_at: float
+    ) -> httpx.Response:
+        """Merge a ``304`` into the stored entry and return the stored body."""
+        record_counter("http_cache_revalidated_total", labels={"host": request.url.host})
+        headers = httpx.Headers(list(entry.headers))
+        for name, value in response.headers.multi_items():
+            if name.lower() not in _BODY_HEADERS:
+                headers[name] = value
+        refreshed = replace(
+            entry,
+            headers=tuple(headers.multi_items()),
+            stored_at=self.clock(),
+            corrected_age=self._corrected_age(response, requested_at),
+        )
+        if "no-store" not in parse_cache_control(response.headers.get("cache-control")):
+            self.store.set(self.key(request), refreshed)
+        return refreshed.to_response(request)
+
+    def _entry(
+        self, request: httpx.Request, response: httpx.Response, *, requested_at: float
+    ) -> Optional[CachedResponse]:
+        vary = response.headers.get("vary", "")
+        names = [name.strip().lower() for name in vary.split(",") if name.strip()]
+        if "*" in names:
+            return None
+        return CachedResponse(
+            url=str(request.url),
+            status_code=response.status_code,
+            headers=tuple(response.headers.multi_items()),
+            content=response.content,
+            stored_at=self.clock(),
+            corrected_age=self._corrected_age(response, requested_at),
+            vary=tuple((name, request.headers.get(name, "")) for name in names),
+        )
+
+    def _corrected_age(self, response: httpx.Response, requested_at: float) -> float:
+        now = self.clock()
+        date = _http_date(response.headers.get("date"))
+        apparent_age = max(now - date, 0.0) if date is not None else 0.0
+        age = _seconds(response.headers.get("age")) or 0.0
+        return max(apparent_age, age + max(now - requested_at, 0.0))
+
+    @staticmethod
+    def _bypass(headers: Mapping[str, str]) -> bool:
+        directives = parse_cache_control(headers.get("cache-control"))
+        return "no-store" in directives or "no-cache" in directives
+
+    @staticmethod
+    def _vary_matches(entry: CachedResponse, headers: httpx.Headers) -> bool:
+        return all(headers.get(name, "") == value for name, value in entry.vary)
+
+    @staticmethod
+    def _cacheable(request: httpx.Request, response: httpx.Response) -> bool:
+        if response.status_code not in CACHEABLE_STATUSES:
+            return False
+        if "no-store" in parse_cache_control(request.headers.get("cache-control")):
+            return False
+        directives = parse_cache_control(response.headers.get("cache-control"))
+        if "no-store" in directives:
+            return False
+        # Explicit freshness or a validator; otherwise there is nothing to gain.
+        return bool(
+            "max-age" in directives
+            or "no-cache" in directives
+            or "expires" in response.headers
+            or "etag" in response.headers
+            or "last-modified" in response.headers
+        )
+
+
+def build_http_cache(backend: str, *, directory: str | Path, max_bytes: int) -> Optional[HttpCache]:
+    """The cache configured by ``app.http_cache``: ``memory``, ``disk`` or ``off``."""
+    if backend == "off":
+        return None
+    if backend == "disk":
+        return HttpCache(DiskCacheStore(directory, max_bytes=max_bytes))
+    if backend == "memory":
+        return HttpCache(MemoryCacheStore(max_bytes=max_bytes))
+    raise ValueError(f"Unknown HTTP cache backend: {backend!r}")
@@ -0,0 +1,172 @@
+"""Incremental parsing of the item array in a JSON response body."""
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+import httpx
+
+_WHITESPACE = " \t\n\r"
+_MORE = object()
+
+# Parser states.
+_START = "start"
+_FIRST_KEY = "first-key"
+_KEY = "key"
+_COLON = "colon"
+_VALUE = "value"
+_MEMBER_END = "member-end"
+_FIRST_ITEM = "first-item"
+_ITEM = "item"
+_ITEM_END = "item-end"
+_END = "end"
+
+
+class ResponseTooLarge(ValueError):
+    """A response body grew past the configured maximum size."""
+
+
+class JsonArrayStream:
+    """
+    Push parser that yields the items of one array in a JSON document as
+    the bytes arrive.
+
+    The document is either an object whose member named in ``keys`` (for
+    example ``"events"``) holds the array, or a bare top-level array. Items
+    are decoded one at a time with the stdlib decoder, so the raw body, its
+    text and the whole object tree are never held at once. The other
+    top-level members are collected in ``fields`` and are complete once
+    ``close`` returns. They are expected to be small (totals, cursors).
+    Exceeding ``max_bytes`` of decoded body raises ``ResponseTooLarge``.
+    """
+
+    def __init__(self, keys: Iterable[str] = ("events", "results"), *, max_bytes: Optional[int] = None) -> None:
+        self.keys = frozenset(keys)
+        self.max_bytes = max_bytes
+        self.fields: Dict[str, Any] = {}
+        self.received = 0
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._state = _START
+        self._key = ""
+        self._root_array = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Consume the next chunk of the body; returns the items it completed."""
+        self.received += len(chunk)
+        if self.max_bytes is not None and self.received > self.max_bytes:
+            raise ResponseTooLarge(f"response body exceeds {self.max_bytes} bytes")
+        self._buf += self._text.decode(chunk)
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """Signal the end of the body; raises ``json.JSONDecodeError`` if it was incomplete."""
+        self._buf += self._text.decode(b"", final=True)
+        items = self._parse(final=True)
+        if self._state != _END:
+            raise json.JSONDecodeError("Unexpected end of JSON document", self._buf, self._pos)
+        return items
+
+    async def aiter(self, response: httpx.Response) -> AsyncIterator[Any]:
+        """Yield the items of a streamed ``response``, decompressing as httpx receives it."""
+        length = response.headers.get("content-length", "")
+        if self.max_bytes is not None and length.isdigit() and int(length) > self.max_bytes:
+            raise ResponseTooLarge(f"response body of {length} bytes exceeds {self.max_bytes}")
+        async for chunk in response.aiter_bytes():
+            for item in self.feed(chunk):
+                yield item
+        for item in self.close():
+            yield item
+
+    def _parse(self, *, final: bool) -> List[Any]:
+        items: List[Any] = []
+        buf = self._buf
+        while True:
+            while self._pos < len(buf) and buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos >= len(buf):
+                break
+            char = buf[self._pos]
+            state = self._state
+            if state == _START:
+                if char not in "{[":
+                    self._fail("Expecting '{' or '['")
+                self._pos += 1
+                self._root_array = char == "["
+                self._state = _FIRST_ITEM if self._root_array else _FIRST_KEY
+            elif state in (_FIRST_KEY, _KEY):
+                if char == "}" and state == _FIRST_KEY:
+                    self._pos += 1
+                    self._state = _END
+                    continue
+                if char != '"':
+                    self._fail("Expecting property name enclosed in double quotes")
+                key = self._decode(final)
+                if key is _MORE:
+                    break
+                self._key = key
+                self._state = _COLON
+            elif state == _COLON:
+                if char != ":":
+                    self._fail("Expecting ':' delimiter")
+                self._pos += 1
+                self._state = _VALUE
+            elif state == _VALUE:
+                if char == "[" and self._key in self.keys:
+                    self._pos += 1
+                    self._state = _FIRST_ITEM
+                    continue
+                value = self._decode(final)
+                if value is _MORE:
+                    break
+                self.fields[self._key] = value
+                self._state = _MEMBER_END
+            elif state == _MEMBER_END:
+                if char not in ",}":
+                    self._fail("Expecting ',' delimiter")
+                self._pos += 1
+                self._state = _KEY if char == "," else _END
+            elif state in (_FIRST_ITEM, _ITEM):
+                if char == "]" and state == _FIRST_ITEM:
+                    self._pos += 1
+                    self._state = _END if self._root_array else _MEMBER_END
+                    continue
+                item = self._decode(final)
+                if item is _MORE:
+                    break
+                items.append(item)
+                self._state = _ITEM_END
+            elif state == _ITEM_END:
+                if char not in ",]":
+                    self._fail("Expecting ',' delimiter")
+                self._pos += 1
+                if char == ",":
+                    self._state = _ITEM
+                else:
+                    self._state = _END if self._root_array else _MEMBER_END
+            else:
+                self._fail("Extra data")
+        # Keep only the unparsed tail so the buffer never holds more than one value.
+        self._buf = buf[self._pos:]
+        self._pos = 0
+        return items
+
+    def _decode(self, final: bool) -> Any:
+        """Decode one complete value at the cursor, or ``_MORE`` if it has not fully arrived."""
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return _MORE
+        # A number at the very end of the buffer may continue in the next chunk.
+        if end == len(self._buf) and not final and self._buf[self._pos] in "-0123456789":
+            return _MORE
+        self._pos = end
+        return value
+
+    def _fail(self, message: str) -> None:
+        raise json.JSONDecodeError(message, self._buf, self._pos)
@@ -0,0 +1,104 @@
+"""Adaptive (AIMD) concurrency limiting for outbound requests."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Optional
+
+from app.utils.metrics import record_counter, record_latency
+
+
+class AdaptiveLimiter:
+    """
+    Caps concurrent requests to one upstream, adapting the cap to how it copes.
+
+    Additive increase, multiplicative decrease: every successful request
+    that was made while the limit was in use grows the limit by ``1/limit``
+    (about one slot per round of requests). An error, a 429, or a latency
+    above ``latency_tolerance`` times the best recent latency shrinks it by
+    ``backoff``, at most once per observed round trip. Requests over the
+    limit queue in FIFO order; the time spent queued goes to the
+    ``http_queue_wait_ms`` latency metric.
+
+    Not thread-safe: a limiter belongs to one event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        window: int = 100,
+    ) -> None:
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.limit = float(min(max(initial, min_limit), self.max_limit))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._last_decrease = 0.0
+
+    async def acquire(self) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            record_latency("http_queue_wait_ms", 0.0)
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        queued_at = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot just as we were cancelled; give it back.
+                self._release_slot()
+            raise
+        record_latency("http_queue_wait_ms", (time.monotonic() - queued_at) * 1000)
+
+    def release(self, latency: Optional[float], *, ok: bool) -> None:
+        """Free a slot and adapt the limit.
+
+        ``latency`` is None for requests that were abandoned (cancelled),
+        which say nothing about the upstream and leave the limit alone.
+        """
+        # Only grow a limit that is actually being used (half of it or more).
+        saturated = self.in_flight * 2 >= int(self.limit)
+        self._release_slot()
+        if latency is None:
+            return
+        if ok:
+            self._latencies.append(latency)
+        if not ok or latency > self.latency_tolerance * min(self._latencies, default=latency):
+            self._decrease(latency)
+        elif saturated:
+            self.limit = min(self.limit + 1.0 / self.limit, float(self.max_limit))
+        self._wake()
+
+    def _decrease(self, latency: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < latency:
+            return
+        self._last_decrease = now
+        limit = max(self.limit * self.backoff, float(self.min_limit))
+        if int(limit) < int(self.limit):
+            record_counter("http_limiter_decreases_total", labels={"limiter": self.name})
+        self.limit = limit
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
@@ -4,7 +4,9 @@ from __future__ import annotations
 import threading
 import time
 from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+LabelSet = Tuple[Tuple[str, str], ...]
 
 
 class MetricsCollector:
@@ -15,21 +17,40 @@ class MetricsCollector:
         self._latencies: Dict[str, List[float]] = defaultdict(list)
         self._cache_hits = 0
         self._cache_misses = 0
+        self._named_cache_ops: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        self._counters: Dict[Tuple[str, LabelSet], float] = defaultdict(float)
     
     def record_latency(self, metric_name: str, duration_ms: float) -> None:
         """Record a latency measurement in milliseconds."""
         with self._lock:
             self._latencies[metric_name].append(duration_ms)
     
-    def record_cache_hit(self) -> None:
-        """Record a cache hit."""
+    def record_cache_hit(self, cache: Optional[str] = None) -> None:
+        """Record a cache hit, optionally against a named cache."""
+        with self._lock:
+            if cache is None:
+                self._cache_hits += 1
+            else:
+                self._named_cache_ops[cache][0] += 1
+    
+    def record_cache_miss(self, cache: Optional[str] = None) -> None:
+        """Record a cache miss, optionally against a named cache."""
+        with self._lock:
+            if cache is None:
+                self._cache_misses += 1
+            else:
+                self._named_cache_ops[cache][1] += 1
+    
+    def record_counter(self, metric_name: str, amount: float = 1.0, labels: Optional[Dict[str, str]] = None) -> None:
+        """Increment a monotonically increasing counter, optionally labelled."""
+        label_set: LabelSet = tuple(sorted((labels or {}).items()))
         with self._lock:
-            self._cache_hits += 1
+            self._counters[(metric_name, label_set)] += amount
     
-    def record_cache_miss(self) -> None:
-        """Record a cache miss."""
+    def get_counters(self) -> Dict[Tuple[str, LabelSet], float]:
+        """Get a snapshot of all counters keyed by (name, labels)."""
         with self._lock:
-            self._cache_misses += 1
+            return dict(self._counters)
     
     def get_metrics(self) -> Dict[str, float]:
         """Get current metrics as a dictionary."""
@@ -50,18 +71,41 @@ class MetricsCollector:
             else:
                 metrics["cache_hit_ratio"] = 0.0
             
+            # Per-cache hit ratio for named caches
+            for cache, (hits, misses) in self._named_cache_ops.items():
+                total = hits + misses
+                ratio = hits / total if total else 0.0
+                metrics[_series_name("cache_hit_ratio", (("cache", cache),))] = ratio
+            
+            for (metric_name, label_set), value in self._counters.items():
+                metrics[_series_name(metric_name, label_set)] = value
+            
             return metrics
     
     def export_prometheus(self) -> str:
         """Export metrics in Prometheus text format."""
         metrics = self.get_metrics()
+        counters = self.get_counters()
+        counter_series = {_series_name(name, label_set) for name, label_set in counters}
         lines = []
+        typed = set()
         
         for metric_name, value in sorted(metrics.items()):
-            # Add metric type hint (gauge for all our metrics)
-            lines.append(f"# TYPE {metric_name} gauge")
+            if metric_name in counter_series:
+                continue
+            # Add metric type hint (gauge for all non-counter metrics)
+            base_name = metric_name.split("{", 1)[0]
+            if base_name not in typed:
+                lines.append(f"# TYPE {base_name} gauge")
+                typed.add(base_name)
             lines.append(f"{metric_name} {value:.6f}")
         
+        for (metric_name, label_set), value in sorted(counters.items()):
+            if metric_name not in typed:
+                lines.append(f"# TYPE {metric_name} counter")
+                typed.add(metric_name)
+            lines.append(f"{_series_name(metric_name, label_set)} {value:.6f}")
+        
         return "\n".join(lines) + "\n"
     
     def reset(self) -> None:
@@ -70,6 +114,15 @@ class MetricsCollector:
             self._latencies.clear()
             self._cache_hits = 0
             self._cache_misses = 0
+            self._named_cache_ops.clear()
+            self._counters.clear()
+
+
+def _series_name(metric_name: str, label_set: LabelSet) -> str:
+    if not label_set:
+        return metric_name
+    labels = ",".join(f'{key}="{value}"' for key, value in label_set)
+    return f"{metric_name}{{{labels}}}"
 
 
 # Global metrics collector instance
@@ -86,14 +139,19 @@ def record_latency(metric_name: str, duration_ms: float) -> None:
     _metrics_collector.record_latency(metric_name, duration_ms)
 
 
-def record_cache_hit() -> None:
+def record_cache_hit(cache: Optional[str] = None) -> None:
     """Record a cache hit to the global collector."""
-    _metrics_collector.record_cache_hit()
+    _metrics_collector.record_cache_hit(cache)
 
 
-def record_cache_miss() -> None:
+def record_cache_miss(cache: Optional[str] = None) -> None:
     """Record a cache miss to the global collector."""
-    _metrics_collector.record_cache_miss()
+    _metrics_collector.record_cache_miss(cache)
+
+
+def record_counter(metric_name: str, amount: float = 1.0, labels: Optional[Dict[str, str]] = None) -> None:
+    """Increment a counter on the global collector."""
+    _metrics_collector.record_counter(metric_name, amount, labels)
 
 
 def get_metrics() -> Dict[str, float]:
@@ -0,0 +1,81 @@
+"""Retry budgeting and backoff for outbound requests."""
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import httpx
+
+# Statuses worth retrying even though the upstream answered.
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class RetryBudget:
+    """
+    Per-host token bucket that keeps retries to a share of the traffic.
+
+    Every successful request deposits ``ratio`` tokens, up to
+    ``max_tokens``, and every retry spends one. So over time retries stay
+    below ``ratio`` of successful requests. Buckets start full, so a cold
+    process can still retry a few isolated failures. When an upstream browns
+    out, the bucket drains quickly and callers stop piling retries onto it.
+    """
+
+    ratio: float = 0.1
+    max_tokens: float = 10.0
+    _tokens: Dict[str, float] = field(default_factory=dict, init=False, repr=False)
+
+    def deposit(self, host: str) -> None:
+        self._tokens[host] = min(self._tokens.get(host, self.max_tokens) + self.ratio, self.max_tokens)
+
+    def try_spend(self, host: str) -> bool:
+        tokens = self._tokens.get(host, self.max_tokens)
+        if tokens < 1.0:
+            return False
+        self._tokens[host] = tokens - 1.0
+        return True
+
+    def tokens(self, host: str) -> float:
+        return self._tokens.get(host, self.max_tokens)
+
+
+def decorrelated_jitter(previous: float, *, base: float, cap: float, rng: random.Random | None = None) -> float:
+    """Next backoff delay: uniform between ``base`` and three times the previous delay, capped.
+
+    The first delay (``previous`` of 0) is drawn from ``base`` to three times
+    ``base``. Unlike fixed exponential steps, concurrent callers spread out
+    instead of retrying in lockstep, starting with their first retry.
+    """
+    if base <= 0:
+        return 0.0
+    upper = max(previous, base) * 3
+    return min(cap, (rng or random).uniform(base, upper))
+
+
+def retry_after_seconds(response: Optional[httpx.Response], *, now: float | None = None) -> Optional[float]:
+    """Seconds requested by a ``Retry-After`` header on a 429/503, if any."""
+    if response is None or response.status_code not in (429, 503):
+        return None
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(moment.timestamp() - (time.time() if now is None else now), 0.0)
+
+
+_budget = RetryBudget()
+
+
+def get_retry_budget() -> RetryBudget:
+    """Get the process-wide retry budget shared by all HttpClients."""
+    return _budget
@@ -0,0 +1,73 @@
+"""JSON encoding for API responses, caches and share files.
+
+Uses orjson when it is installed and the standard library otherwise. Both
+backends produce compact UTF-8 bytes and understand the same extra types.
+"""
+from __future__ import annotations
+
+import dataclasses
+import json
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Any
+
+import numpy as np
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+if orjson is not None:
+    # Dataclasses are routed through ``_default`` so types with a ``to_dict``
+    # (e.g. PriceBreakdown, which adds derived ``components``) keep their wire form.
+    _OPTIONS = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Encode the non-JSON types that appear in plans and cached payloads."""
+    to_dict = getattr(obj, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, *, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialise ``obj`` to UTF-8 JSON bytes; ``pretty`` indents by two spaces."""
+    if orjson is not None:
+        options = _OPTIONS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=options)
+    text = json.dumps(
+        obj,
+        default=_default,
+        ensure_ascii=False,
+        sort_keys=sort_keys,
+        indent=2 if pretty else None,
+        separators=None if pretty else (",", ":"),
+    )
+    return text.encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or text; raises ``ValueError`` on malformed input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -11,6 +11,8 @@ from typing import Optional
 from datetime import datetime, timezone
 from html import escape
 
+from app.utils.serialization import dumps, loads
+
 
 class ShareManager:
     """Manages sharing of itineraries"""
@@ -49,7 +51,7 @@ class ShareManager:
         
         # Save to file
         plan_file = self.shared_dir / f"{plan_id}.json"
-        plan_file.write_text(json.dumps(plan_with_metadata, indent=2))
+        plan_file.write_bytes(dumps(plan_with_metadata))
         
         return plan_id
     
@@ -69,7 +71,7 @@ class ShareManager:
             return None
         
         try:
-            data = json.loads(plan_file.read_text())
+            data = loads(plan_file.read_bytes())
             return data
         except (json.JSONDecodeError, KeyError):
             return None
@@ -84,7 +86,7 @@ class ShareManager:
         plans = []
         for plan_file in self.shared_dir.glob("*.json"):
             try:
-                data = json.loads(plan_file.read_text())
+                data = loads(plan_file.read_bytes())
                 plans.append({
                     "plan_id": data.get("plan_id"),
                     "created_at": data.get("created_at")
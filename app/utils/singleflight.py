@@ -0,0 +1,60 @@
+"""Single-flight coalescing of concurrent identical async calls."""
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from app.utils.metrics import record_counter
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Share one in-flight computation between concurrent callers with the same key.
+
+    The first caller for a key starts the computation; callers arriving while it
+    is still running await the same task and receive the same result (or
+    exception). A cancelled caller never cancels the shared computation.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[T]],
+        *,
+        labels: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> T:
+        """Run ``fn`` for ``key`` unless an identical call is already in flight.
+
+        ``labels`` are attached to the leader/coalesced counters. ``timeout``
+        bounds this caller's wait only (raising ``asyncio.TimeoutError``);
+        the shared computation keeps running for the others.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            record_counter(f"{self.name}_singleflight_leaders_total", labels=labels)
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            record_counter(f"{self.name}_singleflight_coalesced_total", labels=labels)
+        if timeout is None:
+            return await asyncio.shield(task)
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+    def inflight(self) -> int:
+        """Number of distinct keys currently being computed."""
+        return len(self._inflight)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away.
+            task.exception()
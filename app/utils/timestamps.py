@@ -0,0 +1,33 @@
+"""ISO-8601 timestamp parsing shared by connectors and scoring."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from functools import lru_cache
+
+SECONDS_PER_DAY = 86400
+
+
+def parse_iso8601(value: str) -> datetime:
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value).astimezone(timezone.utc)
+
+
+@lru_cache(maxsize=8192)
+def parse_epoch(value: str) -> int:
+    """Whole UTC epoch seconds for an ISO-8601 timestamp.
+
+    Vendors repeat the same start times across events and pages, so parses
+    are memoised in a bounded cache.
+    """
+    return int(parse_iso8601(value).timestamp())
+
+
+def try_parse_epoch(value: str | None) -> int | None:
+    """Like :func:`parse_epoch` but None for missing or malformed timestamps."""
+    if not value:
+        return None
+    try:
+        return parse_epoch(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,110 @@
+"""Process-wide pooled HTTP transport shared by every connector."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+import httpx
+
+from app.config import TransportSettings
+from app.utils.limiter import AdaptiveLimiter
+
+try:  # pragma: no cover - optional dependency
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - HTTP/2 needs httpx[http2]
+    HTTP2_AVAILABLE = False
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _LoopState:
+    client: httpx.AsyncClient
+    limiters: Dict[Tuple[str, str], AdaptiveLimiter] = field(default_factory=dict)
+
+
+class TransportPool:
+    """
+    One keep-alive ``httpx.AsyncClient`` per event loop, shared by all connectors.
+
+    Connections (and their TLS sessions) are reused across connectors and
+    requests instead of each ``HttpClient`` opening its own pool. httpx only
+    caps connections globally, so each (bulkhead, host) pair also gets an
+    adaptive limiter capped at ``max_connections_per_host``; bulkheads keep
+    a slow connector from queueing another connector's requests. Clients are
+    bound to the loop that created them, hence one per loop; the CLI and
+    test runs each get a fresh loop.
+    """
+
+    def __init__(self, settings: TransportSettings | None = None) -> None:
+        self.settings = settings or TransportSettings()
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def configure(self, settings: TransportSettings) -> None:
+        """Apply new settings to clients created from now on."""
+        self.settings = settings
+
+    def client(self) -> httpx.AsyncClient:
+        """The shared client for the running event loop, created on first use."""
+        return self._state().client
+
+    def limiter(self, host: str, bulkhead: str = "default") -> AdaptiveLimiter:
+        """The running loop's concurrency limiter for ``host`` within ``bulkhead``."""
+        state = self._state()
+        limiter = state.limiters.get((bulkhead, host))
+        if limiter is None:
+            settings = self.settings
+            limiter = state.limiters[(bulkhead, host)] = AdaptiveLimiter(
+                f"{bulkhead}:{host}",
+                initial=settings.limiter_initial,
+                min_limit=settings.limiter_min,
+                max_limit=settings.max_connections_per_host,
+                backoff=settings.limiter_backoff,
+                latency_tolerance=settings.limiter_latency_tolerance,
+            )
+        return limiter
+
+    async def aclose(self) -> None:
+        """Close the running loop's client; the next request opens a new one."""
+        state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is not None and not state.client.is_closed:
+            await state.client.aclose()
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None or state.client.is_closed:
+            state = self._states[loop] = _LoopState(client=self._build_client())
+        return state
+
+    def _build_client(self) -> httpx.AsyncClient:
+        settings = self.settings
+        http2 = settings.http2 and HTTP2_AVAILABLE
+        if settings.http2 and not HTTP2_AVAILABLE:
+            LOGGER.warning("HTTP/2 requested but the h2 package is missing; using HTTP/1.1")
+        limits = httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry_seconds,
+        )
+        return httpx.AsyncClient(limits=limits, http2=http2, timeout=settings.timeout_seconds)
+
+
+_pool = TransportPool()
+
+
+def get_transport_pool() -> TransportPool:
+    """Get the process-wide transport pool."""
+    return _pool
+
+
+async def close_transport_pool() -> None:
+    """Close the shared client for the running loop (app shutdown, CLI exit)."""
+    await _pool.aclose()